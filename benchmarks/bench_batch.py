@@ -0,0 +1,81 @@
+"""
+Benchmark POST /analyze/batch against N sequential /analyze calls
+
+Runs offline against SyntheticProvider and FakeLLM with a simulated provider
+round trip, starting each mode from an empty price store and model registry.
+
+    python -m benchmarks.bench_batch --tickers 8 --latency 0.3
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from src.core.batch_analysis import BatchAnalysisService
+from src.core.financial_analysis import FinancialAnalysisSystem
+from src.core.insights import MarketInsightsService
+from src.core.llm_cache import LLMCache
+from src.core.model_registry import ModelRegistry
+from src.core.price_store import PriceStore
+from src.core.providers import SyntheticProvider
+from src.utils.fake_llm import FakeLLM
+
+
+def run_sequential(tickers, start_date, end_date, latency, llm_latency):
+    provider = SyntheticProvider(latency=latency)
+    with tempfile.TemporaryDirectory() as root:
+        store = PriceStore(root, provider=provider)
+        registry = ModelRegistry()
+        insights = MarketInsightsService(llm=FakeLLM(latency=llm_latency), cache=LLMCache(':memory:'))
+
+        began = time.perf_counter()
+        for ticker in tickers:
+            # /analyze builds a fresh system per request
+            FinancialAnalysisSystem(store=store, registry=registry, insights_service=insights).run_analysis(
+                ticker, start_date, end_date
+            )
+        return time.perf_counter() - began, len(provider.calls)
+
+
+def run_batch(tickers, start_date, end_date, latency, llm_latency, max_workers):
+    provider = SyntheticProvider(latency=latency)
+    with tempfile.TemporaryDirectory() as root:
+        service = BatchAnalysisService(
+            store=PriceStore(root, provider=provider),
+            registry=ModelRegistry(),
+            insights_service=MarketInsightsService(llm=FakeLLM(latency=llm_latency), cache=LLMCache(':memory:'))
+        )
+
+        began = time.perf_counter()
+        batch = service.run_batch(tickers, start_date, end_date, max_workers=max_workers)
+        assert not batch['errors'], batch['errors']
+        return time.perf_counter() - began, len(provider.calls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', type=int, default=8, help='Number of tickers in the watchlist')
+    parser.add_argument('--start-date', default='2023-01-01')
+    parser.add_argument('--end-date', default='2024-01-01')
+    parser.add_argument('--latency', type=float, default=0.3, help='Simulated provider round trip in seconds')
+    parser.add_argument('--llm-latency', type=float, default=0.5, help='Simulated LLM call in seconds')
+    parser.add_argument('--max-workers', type=int, default=None)
+    args = parser.parse_args()
+
+    tickers = [f"SYN{i:03d}" for i in range(args.tickers)]
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)  # charts are written to the CWD
+
+    seq_time, seq_calls = run_sequential(tickers, args.start_date, args.end_date, args.latency, args.llm_latency)
+    batch_time, batch_calls = run_batch(
+        tickers, args.start_date, args.end_date, args.latency, args.llm_latency, args.max_workers
+    )
+
+    print(f"tickers={len(tickers)} provider_latency={args.latency}s llm_latency={args.llm_latency}s")
+    print(f"sequential /analyze : {seq_time:8.2f}s  provider calls={seq_calls}")
+    print(f"/analyze/batch      : {batch_time:8.2f}s  provider calls={batch_calls}")
+    print(f"speedup             : {seq_time / batch_time:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Chart rendering throughput under parallel requests
+
+Renders the two analysis charts for --requests distinct tickers from a
+thread pool, comparing the previous pyplot renderer (a global lock and PNG
+files in the working directory) against VisualizationService on Agg figures
+with the in-memory chart store, cold and with every chart already cached.
+
+    python -m benchmarks.bench_charts --requests 48 --threads 1 4 8
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from src.core.data_ingestion import DataIngestionService
+from src.core.providers import SyntheticProvider
+from src.core.result_store import ResultStore
+from src.utils.visualization import VisualizationService
+
+_PYPLOT_LOCK = threading.Lock()
+
+
+def legacy_render(preprocessed_data, prediction_results, ticker):
+    """The pyplot renderer VisualizationService used before, for comparison"""
+    with _PYPLOT_LOCK:
+        paths = []
+        for kind in ('price_trend', 'confidence_interval'):
+            plt.figure(figsize=(12, 6))
+            forecast_index = pd.date_range(start=preprocessed_data.index[-1], periods=8, freq='D')[1:]
+            if kind == 'price_trend':
+                plt.plot(preprocessed_data['Close'], label='Historical Price')
+                plt.plot(forecast_index, prediction_results['forecast'], color='red', label='Predicted Price')
+            else:
+                conf_int = prediction_results['confidence_interval']
+                plt.fill_between(
+                    forecast_index, [ci[0] for ci in conf_int], [ci[1] for ci in conf_int],
+                    alpha=0.3, label='Confidence Interval'
+                )
+            plt.legend()
+            plt.tight_layout()
+            path = f"{ticker}_{kind}.png"
+            plt.savefig(path)
+            plt.close()
+            paths.append(path)
+        return paths
+
+
+def make_inputs(count):
+    provider = SyntheticProvider()
+    inputs = []
+    for i in range(count):
+        ticker = f"SYN{i:03d}"
+        data = DataIngestionService._preprocess_data(provider.download(ticker, '2023-01-01', '2024-01-01'))
+        last = data['Close'].iloc[-1]
+        prediction = {
+            'forecast': [last * (1 + 0.002 * h) for h in range(1, 8)],
+            'confidence_interval': [[last * (1 - 0.01 * h), last * (1 + 0.01 * h)] for h in range(1, 8)],
+        }
+        inputs.append((data, prediction, ticker))
+    return inputs
+
+
+def throughput(render, inputs, threads):
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda args: render(*args), inputs))
+    return len(inputs) / (time.perf_counter() - began)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=48)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 8])
+    args = parser.parse_args()
+
+    inputs = make_inputs(args.requests)
+    print(f"requests={args.requests} cpus={os.cpu_count()} (requests/s, two charts per request)")
+    print(f"{'threads':>8}{'pyplot+files':>14}{'agg cold':>10}{'agg cached':>12}")
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as root:
+        os.chdir(root)
+        try:
+            for threads in args.threads:
+                legacy = throughput(legacy_render, inputs, threads)
+                service = VisualizationService(store=ResultStore(max_entries=4 * args.requests))
+                cold = throughput(service.create_visualizations, inputs, threads)
+                cached = throughput(service.create_visualizations, inputs, threads)
+                print(f"{threads:>8}{legacy:>14.1f}{cold:>10.1f}{cached:>12.0f}")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark the batched feature engine against the per-ticker preprocessing path
+
+Builds synthetic Close panels of 1, 100 and 5000 tickers and times
+PreprocessingService.engineer_financial_features plus normalize_data looped
+over tickers against one FeatureEngine.compute call with normalization.
+The per-ticker loop is sampled on at most --baseline-sample tickers and
+scaled up so the 5000 ticker case finishes quickly.
+
+    python -m benchmarks.bench_feature_engine --sizes 1 100 5000 --days 504
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from src.core.feature_engine import FeatureEngine
+from src.core.preprocessing import PreprocessingService
+
+
+def make_panel(tickers, days, seed=0):
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.0003, 0.02, size=(days, tickers))
+    close = 100 * np.exp(np.cumsum(steps, axis=0))
+    index = pd.bdate_range('2020-01-01', periods=days)
+    return pd.DataFrame(close, index=index, columns=[f"SYN{i:04d}" for i in range(tickers)])
+
+
+def time_per_ticker(panel, sample):
+    columns = panel.columns[:sample]
+    began = time.perf_counter()
+    for ticker in columns:
+        features = PreprocessingService.engineer_financial_features(panel[[ticker]].rename(columns={ticker: 'Close'}))
+        PreprocessingService.normalize_data(features)
+    return (time.perf_counter() - began) * len(panel.columns) / len(columns)
+
+
+def time_engine(panel, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        began = time.perf_counter()
+        result = FeatureEngine.compute(panel).normalize()
+        best = min(best, time.perf_counter() - began)
+    nbytes = sum(values.nbytes for values in result.features.values())
+    return best, nbytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 100, 5000], help='Ticker counts to benchmark')
+    parser.add_argument('--days', type=int, default=504, help='Business days per ticker')
+    parser.add_argument('--baseline-sample', type=int, default=200, help='Tickers timed on the per-ticker path')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    print(f"days={args.days}")
+    print(f"{'tickers':>8}{'per-ticker':>13}{'engine':>11}{'speedup':>9}{'features':>11}")
+    for size in args.sizes:
+        panel = make_panel(size, args.days)
+        baseline = time_per_ticker(panel, args.baseline_sample)
+        engine, nbytes = time_engine(panel, args.repeat)
+        print(f"{size:>8}{baseline:>12.3f}s{engine:>10.3f}s{baseline / engine:>8.1f}x{nbytes / 2**20:>9.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
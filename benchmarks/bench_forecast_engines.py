@@ -0,0 +1,77 @@
+"""
+Compare forecasting engines on accuracy and speed
+
+Holds out the last --periods bars of synthetic price series, forecasts them
+with every engine and reports fit time, MAE, MAPE and how often the actual
+prices fall inside the 95% intervals. auto_arima runs on the first
+--arima-sample series only and its time is scaled to the full watchlist;
+accuracy is reported on that sample for every engine so the columns compare
+like with like, and over the full watchlist for the fast engines.
+
+    python -m benchmarks.bench_forecast_engines --tickers 500 --arima-sample 10
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+
+from src.core.data_ingestion import DataIngestionService
+from src.core.forecast_engines import AUTO_ARIMA, ENGINES, forecast_many
+from src.core.prediction import PredictionService
+from src.core.providers import SyntheticProvider
+
+
+def score(forecasts, actuals):
+    forecast = np.stack([forecasts[ticker][0] for ticker in actuals])
+    conf_int = np.stack([forecasts[ticker][1] for ticker in actuals])
+    actual = np.stack(list(actuals.values()))
+
+    errors = np.abs(forecast - actual)
+    inside = (conf_int[..., 0] <= actual) & (actual <= conf_int[..., 1])
+    return errors.mean(), (errors / actual).mean() * 100, inside.mean()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--arima-sample', type=int, default=10, help='Series fitted with auto_arima')
+    parser.add_argument('--periods', type=int, default=7)
+    parser.add_argument('--start-date', default='2022-01-01')
+    parser.add_argument('--end-date', default='2024-01-01')
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    provider = SyntheticProvider()
+    history, actuals = {}, {}
+    for i in range(args.tickers):
+        ticker = f"SYN{i:04d}"
+        close = DataIngestionService._preprocess_data(provider.download(ticker, args.start_date, args.end_date))['Close']
+        history[ticker], actuals[ticker] = close.iloc[:-args.periods], close.iloc[-args.periods:].to_numpy()
+
+    print(f"tickers={args.tickers} bars={len(next(iter(history.values())))} horizon={args.periods}")
+    print(f"{'engine':<12}{'time':>10}{'per series':>12}{'MAE':>8}{'MAPE':>8}{'coverage':>10}{'all MAPE':>10}")
+
+    sample = dict(list(history.items())[:args.arima_sample])
+    began = time.perf_counter()
+    forecasts = {}
+    for ticker, close in sample.items():
+        model = PredictionService.fit_model(close)
+        forecasts[ticker] = model.predict(n_periods=args.periods, return_conf_int=True)
+    per_series = (time.perf_counter() - began) / len(sample)
+    mae, mape, coverage = score(forecasts, {ticker: actuals[ticker] for ticker in sample})
+    print(f"{AUTO_ARIMA:<12}{per_series * args.tickers:>9.2f}s{per_series * 1e3:>10.2f}ms"
+          f"{mae:>8.3f}{mape:>7.2f}%{coverage:>10.1%}")
+
+    for engine in ENGINES:
+        began = time.perf_counter()
+        forecasts = forecast_many(history, engine, args.periods)
+        elapsed = time.perf_counter() - began
+        mae, mape, coverage = score(forecasts, {ticker: actuals[ticker] for ticker in sample})
+        _, all_mape, _ = score(forecasts, actuals)
+        print(f"{engine:<12}{elapsed:>9.2f}s{elapsed / args.tickers * 1e3:>10.2f}ms"
+              f"{mae:>8.3f}{mape:>7.2f}%{coverage:>10.1%}{all_mape:>9.2f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Measure LLM cache hit rate and prompt token reduction offline
+
+Replays a workload of /analyze-style insight requests in which popular
+tickers repeat, using FakeLLM to count calls and estimated prompt tokens,
+once with the legacy to_string prompt and once with the compact one.
+
+    python -m benchmarks.bench_llm_cache --requests 500 --tickers 50
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.core.data_ingestion import DataIngestionService
+from src.core.insights import MarketInsightsService
+from src.core.llm_cache import LLMCache
+from src.core.providers import SyntheticProvider
+from src.utils.fake_llm import FakeLLM
+
+
+def replay(workload, recent, compact, cached):
+    llm = FakeLLM()
+    cache = LLMCache(':memory:')
+    service = MarketInsightsService(llm=llm, cache=cache, compact=compact)
+    if not cached:
+        service.cache = cache = None
+
+    began = time.perf_counter()
+    for ticker in workload:
+        service.generate_insights(*recent[ticker])
+    elapsed = time.perf_counter() - began
+
+    hit_ratio = cache.stats()['hit_ratio'] if cache else 0.0
+    return llm.calls, llm.prompt_tokens, hit_ratio, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--tickers', type=int, default=50)
+    parser.add_argument('--zipf', type=float, default=1.3, help='Popularity skew of the ticker mix')
+    args = parser.parse_args()
+
+    provider = SyntheticProvider()
+    tickers = [f"SYN{i:03d}" for i in range(args.tickers)]
+    recent = {}
+    for ticker in tickers:
+        preprocessed = DataIngestionService._preprocess_data(provider.download(ticker, '2023-01-01', '2024-01-01'))
+        last = preprocessed['Close'].iloc[-1]
+        recent[ticker] = (preprocessed.tail(10), [last * (1 + 0.001 * i) for i in range(1, 8)])
+
+    rng = np.random.default_rng(0)
+    ranks = np.minimum(rng.zipf(args.zipf, args.requests), args.tickers) - 1
+    workload = [tickers[r] for r in ranks]
+
+    print(f"requests={args.requests} tickers={args.tickers} distinct requested={len(set(workload))}")
+    print(f"{'mode':<22}{'llm calls':>10}{'prompt tokens':>15}{'hit ratio':>11}{'time':>10}")
+    for label, compact, cached in (
+        ('legacy, no cache', False, False),
+        ('compact, no cache', True, False),
+        ('compact + cache', True, True),
+    ):
+        calls, tokens, hit_ratio, elapsed = replay(workload, recent, compact, cached)
+        print(f"{label:<22}{calls:>10}{tokens:>15}{hit_ratio:>11.2%}{elapsed:>9.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Latency of a logging call on the request path against disk speed
+
+Logs --records messages through a handler whose writes take --disk-delay
+seconds each, once with the handler called synchronously (the previous
+setup) and once behind the bounded queue from src.utils.logger, and reports
+the per-call latency the caller sees. With the queue, latency stays flat
+however slow the disk is; records that arrive faster than the disk drains
+them wait in the queue, or are dropped and counted once it is full.
+
+    python -m benchmarks.bench_logging --records 500 --disk-delay 0 0.0005 0.002
+"""
+import argparse
+import io
+import logging
+import queue
+import time
+
+import numpy as np
+
+from src.utils.logger import DROP, BoundedQueueHandler, BoundedQueueListener
+
+
+class SlowStream(io.StringIO):
+    """In-memory stream whose writes take as long as a slow disk"""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def write(self, text):
+        if self.delay:
+            time.sleep(self.delay)
+        return super().write(text)
+
+
+def measure(logger, records):
+    latencies = np.empty(records)
+    for i in range(records):
+        began = time.perf_counter()
+        logger.info("Completed analysis for %s (cache %s)", f"SYN{i:04d}", "MISS")
+        latencies[i] = time.perf_counter() - began
+    return latencies * 1e6
+
+
+def run(delay, records, queue_size, queued):
+    logger = logging.getLogger(f"bench_logging_{delay}_{queued}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    target = logging.StreamHandler(SlowStream(delay))
+    target.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+    if not queued:
+        logger.addHandler(target)
+        return measure(logger, records), 0
+
+    handler = BoundedQueueHandler(queue.Queue(maxsize=queue_size), DROP)
+    listener = BoundedQueueListener(handler.queue, target)
+    logger.addHandler(handler)
+    listener.start()
+    try:
+        return measure(logger, records), handler.dropped
+    finally:
+        listener.stop()
+        logger.removeHandler(handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=500)
+    parser.add_argument('--disk-delay', type=float, nargs='+', default=[0, 0.0005, 0.002])
+    parser.add_argument('--queue-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"records={args.records} queue_size={args.queue_size} (latency per logging call in us)")
+    print(f"{'disk delay':>11}{'sync p50':>10}{'sync p99':>10}{'queue p50':>11}{'queue p99':>11}{'dropped':>9}")
+    for delay in args.disk_delay:
+        sync, _ = run(delay, args.records, args.queue_size, queued=False)
+        queued, dropped = run(delay, args.records, args.queue_size, queued=True)
+        print(f"{delay * 1e3:>9.1f}ms{np.percentile(sync, 50):>10.1f}{np.percentile(sync, 99):>10.1f}"
+              f"{np.percentile(queued, 50):>11.1f}{np.percentile(queued, 99):>11.1f}{dropped:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Peak memory per concurrent analysis request
+
+Runs --concurrency analyses at once on 10 years of synthetic daily bars,
+holding every result until all have finished the way the job store does,
+and reports the growth in peak RSS and in peak traced allocations divided
+by the number of requests. Each mode runs in a fresh interpreter after one
+warm-up request, so library imports are not counted.
+
+The previous pipeline is reproduced for comparison: it returned a dict of
+DataFrames with the raw download, a preprocessed copy built column by
+column, the fitted model and the forecast as lists. The current one returns
+a FinancialAnalysisState holding views over one preprocessed buffer and the
+forecast as arrays.
+
+    python -m benchmarks.bench_memory --concurrency 1 8 32
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.financial_analysis import FORECAST, INSIGHTS, FinancialAnalysisSystem
+from src.core.insights import MarketInsightsService
+from src.core.llm_cache import LLMCache
+from src.core.model_registry import ModelRegistry
+from src.core.price_store import PriceStore
+from src.core.providers import SyntheticProvider
+from src.utils.fake_llm import FakeLLM
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+START_DATE, END_DATE = '2014-01-01', '2024-01-01'
+MODES = ('dicts (previous)', 'compact')
+
+
+def previous_preprocess(df):
+    df_cleaned = df.dropna()
+    df_cleaned['Returns'] = df_cleaned['Close'].pct_change()
+    df_cleaned['Rolling_Mean'] = df_cleaned['Close'].rolling(window=20).mean()
+    df_cleaned['Rolling_Std'] = df_cleaned['Close'].rolling(window=20).std()
+    return df_cleaned.dropna()
+
+
+def previous_analysis(system, ticker):
+    raw_data = system.store.get(ticker, START_DATE, END_DATE)
+    preprocessed_data = previous_preprocess(raw_data)
+    prediction = system.prediction_service.forecast_prices(
+        preprocessed_data['Close'], ticker=ticker, registry=system.registry, engine='drift'
+    )
+    return {
+        'ticker': ticker,
+        'raw_data': raw_data,
+        'preprocessed_data': preprocessed_data,
+        'prediction_model': prediction['prediction_model'],
+        'prediction_results': prediction['prediction_results'],
+        'market_insights': system.insights_service.generate_insights(
+            preprocessed_data.tail(10), prediction['prediction_results']['forecast']
+        )['market_insights'],
+    }
+
+
+def compact_analysis(system, ticker):
+    return system.run_analysis(ticker, START_DATE, END_DATE, engine='drift', stages=[FORECAST, INSIGHTS])
+
+
+def child(mode, concurrency):
+    """Measure one mode in this process and print the results as JSON"""
+    analysis = previous_analysis if mode == MODES[0] else compact_analysis
+    with tempfile.TemporaryDirectory() as root:
+        system = FinancialAnalysisSystem(
+            store=PriceStore(root, provider=SyntheticProvider()),
+            registry=ModelRegistry(),
+            insights_service=MarketInsightsService(llm=FakeLLM(response='Sideways.'), cache=LLMCache(':memory:'))
+        )
+        tickers = [f"MEM{i:03d}" for i in range(concurrency)]
+        # Fill the price store first so both modes read the same cached bars
+        for ticker in ['WARM'] + tickers:
+            system.store.get(ticker, START_DATE, END_DATE)
+        analysis(system, 'WARM')
+
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        tracemalloc.start()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(lambda ticker: analysis(system, ticker), tickers))
+        _, traced = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    assert len(results) == concurrency
+    # ru_maxrss is in KiB on Linux
+    print(json.dumps({'rss': (peak - baseline) * 1024 / concurrency, 'traced': traced / concurrency}))
+
+
+def measure(mode, concurrency):
+    out = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_memory', '--child', mode, '--concurrency', str(concurrency)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.concurrency[0])
+        return
+
+    print(f"{START_DATE}..{END_DATE} daily bars, drift engine (KiB per concurrent request)")
+    print(f"{'concurrency':>11}  {'mode':<18}{'peak RSS':>10}{'traced':>10}")
+    for concurrency in args.concurrency:
+        for mode in MODES:
+            result = measure(mode, concurrency)
+            print(f"{concurrency:>11}  {mode:<18}{result['rss'] / 1024:>10.0f}{result['traced'] / 1024:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Overhead of the metrics instrumentation
+
+Times the analysis pipeline on the fast drift engine (the cheapest request
+the API serves) with the stage metrics recorded and with them replaced by
+no-ops, then reports the cost of a single histogram observation, of the HTTP
+middleware around an empty ASGI app and of a /metrics scrape.
+
+    python -m benchmarks.bench_metrics --runs 200
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from unittest import mock
+
+from src.core import financial_analysis
+from src.core.financial_analysis import FORECAST, FinancialAnalysisSystem
+from src.core.price_store import PriceStore
+from src.core.providers import SyntheticProvider
+from src.utils import metrics
+
+
+def time_runs(system, runs):
+    began = time.perf_counter()
+    for i in range(runs):
+        system.run_analysis(f"SYN{i % 20:03d}", '2023-01-01', '2024-01-01', engine='drift', stages=[FORECAST])
+    return (time.perf_counter() - began) / runs
+
+
+def time_middleware(runs):
+    async def app(scope, receive, send):
+        await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def receive():
+        return {'type': 'http.request'}
+
+    async def send(message):
+        pass
+
+    async def run(asgi):
+        scope = {'type': 'http', 'method': 'GET', 'path': '/'}
+        began = time.perf_counter()
+        for _ in range(runs):
+            await asgi(scope, receive, send)
+        return (time.perf_counter() - began) / runs
+
+    return asyncio.run(run(app)), asyncio.run(run(metrics.MetricsMiddleware(app)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        store = PriceStore(root=os.path.join(root, 'prices'), provider=SyntheticProvider())
+        system = FinancialAnalysisSystem(store=store)
+        time_runs(system, 20)  # fill the price store
+
+        instrumented = min(time_runs(system, args.runs) for _ in range(3))
+        with mock.patch.object(financial_analysis, 'observe_stage', lambda stage, seconds: None), \
+                mock.patch.object(financial_analysis.INPUT_ROWS, 'observe', lambda value: None):
+            bare = min(time_runs(system, args.runs) for _ in range(3))
+
+    histogram = metrics.Histogram('bench_seconds', 'Benchmark', ('stage',))
+    began = time.perf_counter()
+    for _ in range(100000):
+        histogram.observe(0.01, stage='data')
+    observe = (time.perf_counter() - began) / 100000
+
+    bare_app, wrapped_app = time_middleware(20000)
+
+    began = time.perf_counter()
+    for _ in range(100):
+        metrics.registry.render()
+    render = (time.perf_counter() - began) / 100
+
+    print(f"request (drift, forecast only): {bare * 1e3:.3f}ms bare, {instrumented * 1e3:.3f}ms instrumented, "
+          f"overhead {(instrumented - bare) / bare:+.2%}")
+    print(f"histogram observe: {observe * 1e6:.2f}us, 3 per request = {3 * observe / bare:.2%} of the request")
+    print(f"middleware: {(wrapped_app - bare_app) * 1e6:.2f}us per request = {(wrapped_app - bare_app) / bare:.2%}")
+    print(f"/metrics render: {render * 1e3:.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
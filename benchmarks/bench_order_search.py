@@ -0,0 +1,93 @@
+"""
+Auto ARIMA order search: previous fixed settings against the pruned search
+
+Holds out the last --periods closes of each series and fits the rest three
+ways: the previous `seasonal=True, m=12` stepwise search, the search pruned
+by order_search.plan_search, and the pruned grid fitted with --jobs
+parallel workers. Reports fit time, candidates fitted and holdout MAPE.
+
+Series are synthetic random walks, random walks with a weekly (5-day)
+cycle, and with --fixtures the closes of every CSV in that directory (see
+benchmarks.suite.FixtureProvider).
+
+    python -m benchmarks.bench_order_search --tickers 4 --jobs 4
+"""
+import argparse
+import os
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.suite import FixtureProvider
+from src.core.data_ingestion import DataIngestionService
+from src.core.prediction import PredictionService
+from src.core.providers import SyntheticProvider
+
+
+def previous_fit(close):
+    import pmdarima as pm
+    fits = pm.auto_arima(close, seasonal=True, m=12, suppress_warnings=True, stepwise=True, return_valid_fits=True)
+    return fits[0], len(fits)
+
+
+def pruned_fit(jobs):
+    def fit(close):
+        model = PredictionService.fit_model(close, n_jobs=jobs)
+        return model, model.search_fits_
+    return fit
+
+
+def load_series(tickers, start_date, end_date, fixtures):
+    provider = SyntheticProvider()
+    series = {}
+    for i in range(tickers):
+        series[f"walk-{i}"] = DataIngestionService._preprocess_data(provider.download(f"SYN{i:03d}", start_date, end_date))['Close']
+    for i in range(tickers):
+        walk = DataIngestionService._preprocess_data(provider.download(f"WEEK{i:03d}", start_date, end_date))['Close']
+        cycle = np.tile([0.0, 0.6, 1.0, 0.4, -2.0], len(walk) // 5 + 1)[:len(walk)]
+        series[f"weekly-{i}"] = walk + cycle * walk.std() * 0.05
+    if fixtures:
+        fixture_provider = FixtureProvider(fixtures)
+        for ticker in fixture_provider.tickers():
+            series[f"fixture-{ticker}"] = DataIngestionService._preprocess_data(fixture_provider.load(ticker))['Close']
+    return series
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', type=int, default=4, help='Series of each synthetic kind')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Workers for the parallel pruned search')
+    parser.add_argument('--periods', type=int, default=7)
+    parser.add_argument('--start-date', default='2022-01-01')
+    parser.add_argument('--end-date', default='2024-01-01')
+    parser.add_argument('--fixtures', help='Directory of <TICKER>.csv files to include')
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    series = load_series(args.tickers, args.start_date, args.end_date, args.fixtures)
+    modes = {'previous (m=12)': previous_fit, 'pruned': pruned_fit(1)}
+    if args.jobs > 1:
+        modes[f'pruned, {args.jobs} jobs'] = pruned_fit(args.jobs)
+
+    rows = []
+    for name, close in series.items():
+        history, actual = close.iloc[:-args.periods], close.iloc[-args.periods:].to_numpy()
+        for mode, fit in modes.items():
+            began = time.perf_counter()
+            model, fits = fit(history)
+            elapsed = time.perf_counter() - began
+            mape = np.mean(np.abs(model.predict(n_periods=args.periods) - actual) / actual) * 100
+            rows.append({'kind': name.split('-')[0], 'series': name, 'mode': mode, 'seconds': elapsed, 'fits': fits, 'mape': mape})
+
+    results = pd.DataFrame(rows)
+    print(f"bars={len(next(iter(series.values()))) - args.periods} horizon={args.periods} cpus={os.cpu_count()}")
+    summary = results.groupby(['kind', 'mode'], sort=False).agg(
+        series=('series', 'count'), seconds=('seconds', 'mean'), fits=('fits', 'mean'), mape=('mape', 'mean')
+    )
+    print(summary.to_string(float_format=lambda value: f"{value:.2f}"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Cost of portfolio correlation analytics as the basket grows
+
+For each basket size, times and traces the peak memory of the way clients
+did it (per-ticker preprocessed frames joined on their Returns column, then
+pandas cov, corr and rolling corr against a benchmark) against
+PortfolioService.analyze in float64 and float32, reading from a price store
+filled beforehand. Then times merging one new bar into the running
+covariance against recomputing it over the whole history.
+
+    python -m benchmarks.bench_portfolio --tickers 100 500 1000 --years 5
+"""
+import argparse
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.core.data_ingestion import DataIngestionService
+from src.core.portfolio import PortfolioService, RunningCovariance
+from src.core.price_store import PriceStore
+from src.core.providers import SyntheticProvider
+
+
+def client_join(store, tickers, benchmark, start_date, end_date, window):
+    returns = pd.concat({
+        ticker: DataIngestionService.fetch_stock_data(ticker, start_date, end_date, store=store)['preprocessed_data']['Returns']
+        for ticker in tickers + [benchmark]
+    }, axis=1).dropna()
+    cov = returns[tickers].cov()
+    corr = returns[tickers].corr()
+    rolling = returns[tickers].rolling(window).corr(returns[benchmark])
+    return cov, corr, rolling
+
+
+def measure(fn):
+    tracemalloc.start()
+    began = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - began
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', type=int, nargs='+', default=[100, 500, 1000])
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--window', type=int, default=63)
+    parser.add_argument('--skip-client', type=int, default=2000, help='skip the client-side join from this size on')
+    args = parser.parse_args()
+
+    end_date = '2024-01-01'
+    start_date = f"{2024 - args.years}-01-01"
+    root = tempfile.mkdtemp()
+    try:
+        store = PriceStore(root, provider=SyntheticProvider())
+        universe = [f"T{i:04d}" for i in range(max(args.tickers))]
+        store.get_many(universe + ['SPY'], start_date, end_date)
+
+        print(f"years={args.years} window={args.window}")
+        print(f"{'tickers':>7}  {'mode':<16}{'seconds':>9}{'peak MiB':>10}")
+        for size in args.tickers:
+            tickers = universe[:size]
+            if size < args.skip_client:
+                _, elapsed, peak = measure(lambda: client_join(store, tickers, 'SPY', start_date, end_date, args.window))
+                print(f"{size:>7}  {'client join':<16}{elapsed:>9.2f}{peak / 2**20:>10.1f}")
+            for dtype in ('float64', 'float32'):
+                service = PortfolioService(store)
+                _, elapsed, peak = measure(lambda: service.analyze(
+                    tickers, start_date, end_date, benchmark='SPY', window=args.window, include_matrix=False, dtype=dtype
+                ))
+                print(f"{size:>7}  {dtype:<16}{elapsed:>9.2f}{peak / 2**20:>10.1f}")
+
+            _, returns = PortfolioService(store).returns_matrix(tickers, start_date, end_date)
+            state = RunningCovariance(size).update(returns[:-1])
+            began = time.perf_counter()
+            state.update(returns[-1])
+            update = time.perf_counter() - began
+            began = time.perf_counter()
+            np.cov(returns.T)
+            full = time.perf_counter() - began
+            print(f"{size:>7}  {'new bar':<16}{update * 1000:>8.1f}ms  vs full recompute {full * 1000:.1f}ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Load test of market data access against the local stand-in server
+
+Fires --requests single-ticker downloads from --concurrency threads at a
+MarketDataServer that answers 429 above --server-rate requests per second,
+once the way fetch_stock_data used to (a fresh connection per download, no
+rate limit, no retry) and once through the pooled provider layer (shared
+session, token bucket, jittered retries, coalescing). Reports the upstream
+requests and TCP connections, throttled answers, failed downloads and the
+latency seen by callers.
+
+    python -m benchmarks.bench_providers --requests 200 --concurrency 32 --server-rate 10
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.core.provider_pool import CoalescingProvider, ThrottledProvider, TokenBucket
+from src.core.providers import HTTPProvider
+from src.utils.market_data_server import MarketDataServer
+
+
+class NaiveProvider(HTTPProvider):
+    """A new session, so a new connection, for every download"""
+
+    def download_many(self, tickers, start_date, end_date):
+        with requests.Session() as session:
+            return HTTPProvider(self.base_url, session=session).download_many(tickers, start_date, end_date)
+
+
+def run(provider, tickers, concurrency):
+    def fetch(ticker):
+        began = time.perf_counter()
+        try:
+            provider.download(ticker, '2023-01-01', '2024-01-01')
+            ok = True
+        except Exception:
+            ok = False
+        return ok, time.perf_counter() - began
+
+    began = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(fetch, tickers))
+    return results, time.perf_counter() - began
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--server-rate', type=float, default=10)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--rate', type=float, default=8, help='client-side token bucket rate')
+    parser.add_argument('--window-ms', type=float, default=25)
+    args = parser.parse_args()
+
+    tickers = [f"T{i:04d}" for i in range(args.requests)]
+    print(f"requests={args.requests} concurrency={args.concurrency} "
+          f"server_rate={args.server_rate}/s latency={args.latency * 1000:.0f}ms")
+    print(f"{'mode':<10}{'upstream':>9}{'conns':>7}{'429s':>6}{'failed':>8}{'p50 ms':>8}{'p95 ms':>8}{'wall s':>8}")
+
+    for mode in ('naive', 'pooled'):
+        with MarketDataServer(latency=args.latency, rate=args.server_rate) as server:
+            if mode == 'naive':
+                provider = NaiveProvider(server.url)
+            else:
+                session = requests.Session()
+                session.mount('http://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+                provider = CoalescingProvider(
+                    ThrottledProvider(HTTPProvider(server.url, session=session), TokenBucket(args.rate, 2), retries=5),
+                    window=args.window_ms / 1000,
+                )
+            results, wall = run(provider, tickers, args.concurrency)
+            stats = dict(server.stats)
+
+        latencies = np.array([elapsed for _, elapsed in results]) * 1000
+        failed = sum(not ok for ok, _ in results)
+        print(f"{mode:<10}{stats['requests']:>9}{stats['connections']:>7}{stats['throttled']:>6}{failed:>8}"
+              f"{np.percentile(latencies, 50):>8.0f}{np.percentile(latencies, 95):>8.0f}{wall:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
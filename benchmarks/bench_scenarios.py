@@ -0,0 +1,70 @@
+"""
+Throughput of the Monte Carlo scenario engine in paths per second
+
+Simulates --paths bootstrapped price paths per horizon with float64 and
+float32 and reports paths per second and the peak traced memory, against a
+path-by-path Python loop like the notebooks did (run on --loop-paths paths
+and reported at the same rate). --chunk-size bounds the memory of one block.
+
+    python -m benchmarks.bench_scenarios --paths 200000 --horizons 7 21 252
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.core.data_ingestion import DataIngestionService
+from src.core.providers import SyntheticProvider
+from src.core.scenarios import DEFAULT_CHUNK_SIZE, ScenarioService
+
+
+def loop_paths(last_price, returns, horizon, paths, seed):
+    rng = np.random.default_rng(seed)
+    terminal = []
+    for _ in range(paths):
+        price = last_price
+        for _ in range(horizon):
+            price *= 1 + returns[rng.integers(len(returns))]
+        terminal.append(price)
+    return -np.quantile(np.array(terminal) / last_price - 1, 0.05)
+
+
+def measure(fn):
+    tracemalloc.start()
+    began = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - began
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--paths', type=int, default=200000)
+    parser.add_argument('--horizons', type=int, nargs='+', default=[7, 21, 252])
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--loop-paths', type=int, default=2000)
+    args = parser.parse_args()
+
+    data = DataIngestionService._preprocess_data(SyntheticProvider().download('RISK', '2014-01-01', '2024-01-01'))
+    last_price, returns = data['Close'].iloc[-1], data['Returns'].to_numpy()
+
+    print(f"paths={args.paths} chunk_size={args.chunk_size} history={len(returns)} returns")
+    print(f"{'horizon':>7}  {'mode':<20}{'paths/s':>12}{'peak MiB':>10}{'VaR 95%':>9}")
+    for horizon in args.horizons:
+        var, elapsed, peak = measure(lambda: loop_paths(last_price, returns, horizon, args.loop_paths, 0))
+        print(f"{horizon:>7}  {'python loop':<20}{args.loop_paths / elapsed:>12,.0f}{peak / 2**20:>10.1f}{var:>9.2%}")
+        for dtype in ('float64', 'float32'):
+            for chunk_size in (args.chunk_size, args.paths):
+                result, elapsed, peak = measure(lambda: ScenarioService.simulate(
+                    last_price, returns, horizon=horizon, paths=args.paths, dtype=dtype, seed=0, chunk_size=chunk_size
+                ))
+                mode = f"{dtype}{'' if chunk_size < args.paths else ', one block'}"
+                print(f"{horizon:>7}  {mode:<20}{args.paths / elapsed:>12,.0f}{peak / 2**20:>10.1f}"
+                      f"{result['var']['0.95']:>9.2%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Serialization cost of bulk series exports by format
+
+Builds the /series table (prices, features and a drift forecast) for
+--tickers tickers over --years of synthetic daily bars, then times encoding
+it and decoding it on the client side. The baseline encodes every column as
+a Python list with tolist() and json.dumps, the way prediction_results is
+built for /analyze. Arrow and Parquet are skipped without pyarrow.
+
+    python -m benchmarks.bench_series --tickers 1 20 --years 10
+"""
+import argparse
+import io
+import json
+import statistics
+import tempfile
+import time
+
+import pandas as pd
+
+from src.core.model_registry import ModelRegistry
+from src.core.price_store import PriceStore
+from src.core.providers import SyntheticProvider
+from src.core.series_export import ARROW, JSON, PARQUET, SeriesExportService, arrow_available
+
+
+def encode_lists(frame):
+    body = {col: frame[col].tolist() for col in frame.columns if col != 'Date'}
+    body['Date'] = frame['Date'].dt.strftime('%Y-%m-%d').tolist()
+    return json.dumps(body).encode()
+
+
+def decode_arrow(content):
+    import pyarrow as pa
+    return pa.ipc.open_stream(content).read_all()
+
+
+def decode_parquet(content):
+    import pyarrow.parquet as pq
+    return pq.read_table(io.BytesIO(content))
+
+
+def codecs():
+    yield 'json lists (previous)', encode_lists, json.loads
+    yield 'json', lambda frame: SeriesExportService.serialize(frame, JSON)[0], json.loads
+    if arrow_available():
+        yield 'arrow', lambda frame: SeriesExportService.serialize(frame, ARROW)[0], decode_arrow
+        yield 'parquet', lambda frame: SeriesExportService.serialize(frame, PARQUET)[0], decode_parquet
+
+
+def timed(fn, arg, repeat):
+    times = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        result = fn(arg)
+        times.append(time.perf_counter() - began)
+    return result, statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', type=int, nargs='+', default=[1, 20])
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    end = pd.Timestamp('2024-01-01')
+    start = (end - pd.DateOffset(years=args.years)).strftime('%Y-%m-%d')
+
+    with tempfile.TemporaryDirectory() as root:
+        service = SeriesExportService(PriceStore(root, provider=SyntheticProvider()), ModelRegistry())
+        print(f"{args.years}y daily bars, all columns (median of {args.repeat})")
+        print(f"{'tickers':>7}  {'format':<22}{'rows':>8}{'KiB':>9}{'encode ms':>11}{'decode ms':>11}")
+        for count in args.tickers:
+            frame = service.build_frame(
+                [f"SER{i:03d}" for i in range(count)], start, end.strftime('%Y-%m-%d'), engine='drift'
+            )
+            for name, encode, decode in codecs():
+                content, encode_ms = timed(encode, frame, args.repeat)
+                _, decode_ms = timed(decode, content, args.repeat)
+                print(f"{count:>7}  {name:<22}{len(frame):>8}{len(content) / 1024:>9.0f}{encode_ms:>11.1f}{decode_ms:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
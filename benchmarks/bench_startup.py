@@ -0,0 +1,62 @@
+"""
+Cold import cost of the API process
+
+Imports `main` in fresh interpreters and reports the median wall time,
+against importing it with every stage dependency loaded up front the way
+the modules used to at import time (pmdarima, langchain_groq, matplotlib
+pyplot and scipy.stats), and with ANALYSIS_PRELOAD-style warm-up of all
+stages after the import. Also checks that importing does not create logs/.
+
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    'lazy': "import main",
+    'eager (previous)': "import pmdarima, langchain_groq, matplotlib.pyplot, scipy.stats; import main",
+    'lazy + preload': "import main; from src.core.preload import preload; preload()",
+}
+
+SCRIPT = """
+import time
+began = time.perf_counter()
+{statement}
+print(time.perf_counter() - began)
+"""
+
+
+def measure(statement, runs, cwd):
+    env = {**os.environ, 'PYTHONPATH': ROOT}
+    times = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, '-c', SCRIPT.format(statement=statement)],
+            cwd=cwd, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        times.append(float(out.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cwd:
+        # One untimed run so every mode reads warm bytecode and page cache
+        measure(MODES['eager (previous)'], 1, cwd)
+        print(f"runs={args.runs} (median seconds to import)")
+        for mode, statement in MODES.items():
+            print(f"{mode:<18}{measure(statement, args.runs, cwd):>8.2f}s")
+        print(f"logs/ created by import: {os.path.exists(os.path.join(cwd, 'logs'))}")
+
+
+if __name__ == '__main__':
+    main()
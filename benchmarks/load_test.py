@@ -0,0 +1,127 @@
+"""
+Load test showing /health and /analyze latency under concurrent analyses
+
+Fires `--concurrency` clients that keep posting /analyze requests while a
+probe hits /health every 50ms, then prints latency percentiles for both.
+With --offline the script starts its own server on synthetic market data
+and a fake LLM, so no network access or API key is needed.
+
+    python -m benchmarks.load_test --offline --concurrency 4 --duration 30
+    python -m benchmarks.load_test --url http://localhost:8000
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+
+
+def percentiles(samples):
+    if not samples:
+        return "no samples"
+    ms = np.array(samples) * 1000
+    return f"n={len(ms):5d}  p50={np.percentile(ms, 50):8.1f}ms  p99={np.percentile(ms, 99):8.1f}ms  max={ms.max():8.1f}ms"
+
+
+async def probe_health(client, stop, samples):
+    while not stop.is_set():
+        began = time.perf_counter()
+        await client.get('/health')
+        samples.append(time.perf_counter() - began)
+        await asyncio.sleep(0.05)
+
+
+async def analyze_worker(client, stop, worker_id, samples, errors, distinct):
+    i = 0
+    while not stop.is_set():
+        # Distinct tickers force cold ARIMA searches, repeated ones exercise the caches
+        ticker = f"LOAD{worker_id}{i}" if distinct else f"LOAD{worker_id}"
+        began = time.perf_counter()
+        response = await client.post(
+            '/analyze',
+            json={'ticker': ticker, 'start_date': '2023-01-01', 'end_date': '2024-01-01'},
+            timeout=300
+        )
+        if response.status_code == 200:
+            samples.append(time.perf_counter() - began)
+        else:
+            errors.append(response.status_code)
+        i += 1
+
+
+async def run(url, concurrency, duration, distinct):
+    async with httpx.AsyncClient(base_url=url, timeout=30) as client:
+        idle = []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_health(client, stop, idle))
+        await asyncio.sleep(2)
+        stop.set()
+        await probe
+
+        loaded, analyze, errors = [], [], []
+        stop = asyncio.Event()
+        tasks = [asyncio.create_task(probe_health(client, stop, loaded))]
+        tasks += [
+            asyncio.create_task(analyze_worker(client, stop, n, analyze, errors, distinct))
+            for n in range(concurrency)
+        ]
+        await asyncio.sleep(duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+
+    print(f"/health idle       : {percentiles(idle)}")
+    print(f"/health under load : {percentiles(loaded)}")
+    print(f"/analyze           : {percentiles(analyze)}  errors={len(errors)}")
+
+
+def start_offline_server(port):
+    env = dict(
+        os.environ,
+        PRICE_STORE_DIR=tempfile.mkdtemp(),
+        MARKET_DATA_PROVIDER='synthetic',
+        INSIGHTS_LLM='fake',
+        PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    # Charts are written to the working directory, keep them out of the repo
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port), '--log-level', 'warning'],
+        env=env,
+        cwd=tempfile.mkdtemp(),
+    )
+    for _ in range(300):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health", timeout=1)
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("Server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default=None, help='Base URL of a running server')
+    parser.add_argument('--offline', action='store_true', help='Start a local server on synthetic data')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--repeat-tickers', action='store_true', help='Reuse one ticker per client')
+    args = parser.parse_args()
+
+    server = start_offline_server(args.port) if args.offline else None
+    url = args.url or f"http://127.0.0.1:{args.port}"
+    try:
+        asyncio.run(run(url, args.concurrency, args.duration, not args.repeat_tickers))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
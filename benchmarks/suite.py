@@ -0,0 +1,306 @@
+"""
+Reproducible benchmark suite for the analysis pipeline
+
+Runs every stage of the pipeline (data ingestion, feature engineering,
+forecasting, insights and charts) offline on synthetic daily bars over one
+and ten years, synthetic 5-minute intraday bars and optional OHLCV fixture
+files, for each requested ticker count. Insights use the FakeLLM stub.
+
+Each case runs in a fresh worker process from an empty price store, chart
+store and LLM cache. Wall time is the best of --repeat passes; a separate
+pass under tracemalloc records the peak and retained Python allocations of
+each stage, and the process peak RSS (a high-water mark) is read after each
+stage. Results are written as JSON, and with --baseline the run fails when
+a stage is slower or allocates more than --threshold over the baseline.
+
+    python -m benchmarks.suite --output bench.json
+    python -m benchmarks.suite --engine arima_ls --tickers 1 10 50
+    python -m benchmarks.suite --datasets 1y --tickers 1 --baseline bench.json --threshold 0.2
+    python -m benchmarks.suite --datasets fixture --fixtures path/to/csv_dir
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.core.data_ingestion import DataIngestionService
+from src.core.forecast_engines import AUTO_ARIMA, ENGINE_NAMES
+from src.core.insights import MarketInsightsService
+from src.core.llm_cache import LLMCache
+from src.core.prediction import PredictionService
+from src.core.preprocessing import PreprocessingService
+from src.core.price_store import PriceStore
+from src.core.providers import MarketDataProvider, OHLCV_COLUMNS, SyntheticProvider
+from src.core.result_store import ResultStore
+from src.utils.fake_llm import FakeLLM
+from src.utils.visualization import VisualizationService
+
+STAGES = ('data', 'features', 'forecast', 'insights', 'charts')
+
+# Name -> (start date, end date) of the synthetic datasets
+DATASETS = {
+    '1y': ('2023-01-01', '2024-01-01'),
+    '10y': ('2014-01-01', '2024-01-01'),
+    'intraday': ('2023-11-01', '2024-01-01'),
+}
+FIXTURE = 'fixture'
+
+
+class IntradayProvider(MarketDataProvider):
+    """Deterministic 5-minute bars over regular sessions (09:30-16:00) of business days"""
+
+    def __init__(self, freq: str = '5min', volatility: float = 0.002):
+        self.freq = freq
+        self.volatility = volatility
+
+    def download(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        days = pd.bdate_range(start_date, pd.Timestamp(end_date) - pd.Timedelta(days=1))
+        session = pd.timedelta_range('09:30:00', '15:55:00', freq=self.freq)
+        index = pd.DatetimeIndex((days.values[:, None] + session.values[None, :]).ravel(), name='Date')
+
+        rng = np.random.default_rng(zlib.crc32(f"{ticker}:{start_date}".encode()))
+        steps = rng.normal(0.0, self.volatility, (len(index), 4))
+        close = 100.0 * np.exp(np.cumsum(steps[:, 0]))
+        open_ = close * np.exp(steps[:, 1] / 4)
+        return pd.DataFrame({
+            'Open': open_,
+            'High': np.maximum(open_, close) * (1 + np.abs(steps[:, 2]) / 2),
+            'Low': np.minimum(open_, close) * (1 - np.abs(steps[:, 3]) / 2),
+            'Close': close,
+            'Adj Close': close,
+            'Volume': rng.integers(10_000, 500_000, len(index)),
+        }, index=index)
+
+
+class FixtureProvider(MarketDataProvider):
+    """OHLCV bars read from `<directory>/<TICKER>.csv` files with a Date column"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def tickers(self) -> List[str]:
+        return sorted(os.path.splitext(os.path.basename(p))[0] for p in glob.glob(os.path.join(self.directory, '*.csv')))
+
+    def load(self, ticker: str) -> pd.DataFrame:
+        df = pd.read_csv(os.path.join(self.directory, f"{ticker}.csv"), index_col='Date', parse_dates=True)
+        return df[[col for col in OHLCV_COLUMNS if col in df.columns]].sort_index()
+
+    def download(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        df = self.load(ticker)
+        return df.loc[(df.index >= pd.Timestamp(start_date)) & (df.index < pd.Timestamp(end_date))]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def case_inputs(dataset: str, tickers: int, fixtures: Optional[str]):
+    """Provider, ticker symbols and date range of one case"""
+    if dataset == FIXTURE:
+        provider = FixtureProvider(fixtures)
+        symbols = provider.tickers()[:tickers]
+        frames = [provider.load(symbol) for symbol in symbols]
+        start = min(df.index[0] for df in frames).strftime('%Y-%m-%d')
+        end = (max(df.index[-1] for df in frames) + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+        return provider, symbols, start, end
+
+    provider = IntradayProvider() if dataset == 'intraday' else SyntheticProvider()
+    start, end = DATASETS[dataset]
+    return provider, [f"SYN{i:03d}" for i in range(tickers)], start, end
+
+
+def run_pass(dataset: str, tickers: int, engine: str, fixtures: Optional[str], trace: bool) -> Dict[str, Dict[str, float]]:
+    """Run every stage over every ticker once from cold stores and measure each stage"""
+    provider, symbols, start, end = case_inputs(dataset, tickers, fixtures)
+    insights = MarketInsightsService(llm=FakeLLM(), cache=LLMCache(':memory:'))
+    charts = VisualizationService(store=ResultStore(max_entries=4 * len(symbols)))
+    results: Dict[str, Any] = {}
+
+    stages = {
+        'data': lambda symbol, _: DataIngestionService.fetch_stock_data(symbol, start, end, store=store),
+        'features': lambda symbol, r: PreprocessingService.engineer_financial_features(r['data']['raw_data']),
+        'forecast': lambda symbol, r: PredictionService.forecast_prices(
+            r['data']['preprocessed_data']['Close'], engine=engine
+        ),
+        'insights': lambda symbol, r: insights.generate_insights(
+            r['data']['preprocessed_data'].tail(10), r['forecast']['prediction_results']['forecast']
+        ),
+        'charts': lambda symbol, r: charts.create_visualizations(
+            r['data']['preprocessed_data'], r['forecast']['prediction_results'], symbol
+        ),
+    }
+
+    measured = {}
+    with tempfile.TemporaryDirectory() as root:
+        store = PriceStore(root, provider=provider)
+        for stage in STAGES:
+            if trace:
+                tracemalloc.start()
+            began = time.perf_counter()
+            for symbol in symbols:
+                results.setdefault(symbol, {})[stage] = stages[stage](symbol, results.get(symbol, {}))
+            wall = time.perf_counter() - began
+
+            measured[stage] = {'wall_s': wall, 'rss_peak_mb': peak_rss_mb()}
+            if trace:
+                retained, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                measured[stage].update({'alloc_peak_mb': peak / 2 ** 20, 'alloc_retained_mb': retained / 2 ** 20})
+    return measured
+
+
+def run_case(dataset: str, tickers: int, engine: str, repeat: int, fixtures: Optional[str]) -> Dict[str, Any]:
+    """Best-of-`repeat` wall time plus one traced pass, meant to run in a fresh process"""
+    warnings.simplefilter('ignore')
+    passes = [run_pass(dataset, tickers, engine, fixtures, trace=False) for _ in range(repeat)]
+    traced = run_pass(dataset, tickers, engine, fixtures, trace=True)
+
+    stages = {}
+    for stage in STAGES:
+        stages[stage] = {
+            'wall_s': min(p[stage]['wall_s'] for p in passes),
+            'rss_peak_mb': passes[-1][stage]['rss_peak_mb'],
+            'alloc_peak_mb': traced[stage]['alloc_peak_mb'],
+            'alloc_retained_mb': traced[stage]['alloc_retained_mb'],
+        }
+    return {'case': f"{dataset}/x{tickers}", 'dataset': dataset, 'tickers': tickers, 'engine': engine, 'stages': stages}
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.25,
+    min_delta: float = 0.005
+) -> List[str]:
+    """
+    Find stages that got slower or allocate more than the baseline
+
+    Args:
+        baseline (Dict): Earlier suite output
+        current (Dict): New suite output
+        threshold (float): Allowed relative increase, 0.25 is 25%
+        min_delta (float): Wall time increases below this many seconds are noise
+
+    Returns:
+        List of regression descriptions, empty when none
+    """
+    before = {case['case']: case for case in baseline['cases']}
+    regressions = []
+    for case in current['cases']:
+        old = before.get(case['case'])
+        if old is None or old['engine'] != case['engine']:
+            continue
+        for stage, now in case['stages'].items():
+            then = old['stages'].get(stage)
+            if then is None:
+                continue
+            if now['wall_s'] > then['wall_s'] * (1 + threshold) and now['wall_s'] - then['wall_s'] > min_delta:
+                regressions.append(
+                    f"{case['case']} {stage}: wall {then['wall_s'] * 1e3:.1f}ms -> {now['wall_s'] * 1e3:.1f}ms"
+                )
+            if now['alloc_peak_mb'] > then['alloc_peak_mb'] * (1 + threshold) and now['alloc_peak_mb'] - then['alloc_peak_mb'] > 1:
+                regressions.append(
+                    f"{case['case']} {stage}: peak allocations {then['alloc_peak_mb']:.1f}MB -> {now['alloc_peak_mb']:.1f}MB"
+                )
+    return regressions
+
+
+def run_suite(
+    datasets: List[str],
+    tickers: List[int],
+    engine: str = AUTO_ARIMA,
+    repeat: int = 3,
+    fixtures: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Run every dataset and ticker count, each in its own worker process
+
+    Returns:
+        Dict with the environment and per-case stage measurements
+    """
+    cases = []
+    for dataset in datasets:
+        for count in tickers:
+            # One process per case so its peak RSS is not inherited from the previous one
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                cases.append(pool.submit(run_case, dataset, count, engine, repeat, fixtures).result())
+    return {'environment': environment(), 'cases': cases}
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"{'case':<16}{'stage':<10}{'wall':>11}{'peak RSS':>11}{'peak alloc':>12}{'retained':>10}")
+    for case in report['cases']:
+        for stage, m in case['stages'].items():
+            print(f"{case['case']:<16}{stage:<10}{m['wall_s'] * 1e3:>9.1f}ms{m['rss_peak_mb']:>9.0f}MB"
+                  f"{m['alloc_peak_mb']:>10.1f}MB{m['alloc_retained_mb']:>8.1f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--datasets', nargs='+', default=list(DATASETS), choices=list(DATASETS) + [FIXTURE])
+    parser.add_argument('--tickers', type=int, nargs='+', default=[1])
+    parser.add_argument('--engine', default=AUTO_ARIMA, choices=ENGINE_NAMES)
+    parser.add_argument('--repeat', type=int, default=3, help='Timed passes per case, the fastest is kept')
+    parser.add_argument('--fixtures', default=None, help='Directory of <TICKER>.csv files for the fixture dataset')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', default=None, help='Earlier output to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed relative regression')
+    parser.add_argument('--min-delta', type=float, default=0.005, help='Ignore wall time increases below this (s)')
+    args = parser.parse_args()
+
+    if FIXTURE in args.datasets and not args.fixtures:
+        parser.error("the fixture dataset needs --fixtures")
+
+    report = run_suite(args.datasets, args.tickers, args.engine, args.repeat, args.fixtures)
+    print_report(report)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(json.load(f), report, args.threshold, args.min_delta)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions over {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
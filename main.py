@@ -1,35 +1,289 @@
+import json
 import os
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 
-from src.core.financial_analysis import FinancialAnalysisSystem
+from src.core.financial_analysis import FinancialAnalysisSystem, StageName
+from src.core.batch_analysis import BatchAnalysisService
+from src.core.backtesting import BacktestService
+from src.core.executors import shutdown_executors
+from src.core.forecast_engines import AUTO_ARIMA, EngineName
+from src.core.jobs import Job, JobManager, QueueFullError, SUCCEEDED
+from src.core.llm_cache import get_llm_cache
+from src.core.model_registry import get_model_registry
+from src.core.portfolio import DEFAULT_WINDOW, MAX_TICKERS, PortfolioService
+from src.core.preload import configured_stages, preload
+from src.core.response_cache import AnalysisCache
+from src.core.scenarios import (
+    BOOTSTRAP, DEFAULT_BARRIERS, DEFAULT_CONFIDENCE, DEFAULT_PATHS, MAX_PATHS, ScenarioMethod, ScenarioService
+)
+from src.core.series_export import (
+    FormatUnavailableError, SeriesColumn, SeriesExportService, SeriesFormat, negotiate_format
+)
+from src.core.warmup import configured_scheduler, read_status
+from src.models.financial_analysis_state import FinancialAnalysisState
 from src.utils.logger import logger
+from src.utils import metrics
+from src.utils.visualization import get_chart_store
 
 
 class AnalysisRequest(BaseModel):
     ticker: str
     start_date: str
     end_date: Optional[str] = None
+    engine: EngineName = AUTO_ARIMA
+    stages: Optional[List[StageName]] = None
 
 
 class AnalysisResponse(BaseModel):
     ticker: str
-    market_insights: str
-    prediction_results: dict
-    visualization_paths: List[str]
+    market_insights: Optional[str] = None
+    prediction_results: Optional[dict] = None
+    visualization_paths: Optional[List[str]] = None
+    scenarios: Optional[dict] = None
+    stage_timings: Optional[Dict[str, Optional[float]]] = None
+
+
+class BatchAnalysisRequest(BaseModel):
+    tickers: List[str]
+    start_date: str
+    end_date: Optional[str] = None
+    max_workers: Optional[int] = None
+    engine: EngineName = AUTO_ARIMA
+    stages: Optional[List[StageName]] = None
+
+
+class BatchAnalysisResponse(BaseModel):
+    results: Dict[str, AnalysisResponse]
+    errors: Dict[str, str]
+
+
+class BacktestRequest(BaseModel):
+    tickers: List[str]
+    start_date: str
+    end_date: Optional[str] = None
+    horizon: int = 7
+    step: int = 5
+    min_train: int = 250
+    max_origins: Optional[int] = 20
+    engine: EngineName = AUTO_ARIMA
+    max_workers: Optional[int] = None
+
+
+class BacktestResponse(BaseModel):
+    results: Dict[str, dict]
+    overall: dict
+    errors: Dict[str, str]
+    tasks: Dict[str, int]
+
+
+class SeriesBatchRequest(BaseModel):
+    tickers: List[str]
+    start_date: str
+    end_date: Optional[str] = None
+    columns: Optional[List[SeriesColumn]] = None
+    periods: int = 7
+    engine: EngineName = AUTO_ARIMA
+    format: Optional[SeriesFormat] = None
+
+
+class ScenarioRequest(BaseModel):
+    ticker: str
+    start_date: str
+    end_date: Optional[str] = None
+    method: ScenarioMethod = BOOTSTRAP
+    engine: EngineName = AUTO_ARIMA
+    horizon: int = Field(7, ge=1, le=252)
+    paths: int = Field(DEFAULT_PATHS, ge=100, le=MAX_PATHS)
+    dtype: Literal["float32", "float64"] = "float64"
+    confidence: List[float] = list(DEFAULT_CONFIDENCE)
+    barriers: List[float] = list(DEFAULT_BARRIERS)
+    seed: Optional[int] = None
+
+
+class PortfolioRequest(BaseModel):
+    tickers: List[str] = Field(..., min_length=2, max_length=MAX_TICKERS)
+    start_date: str
+    end_date: Optional[str] = None
+    weights: Optional[Dict[str, float]] = None
+    benchmark: Optional[str] = None
+    window: int = Field(DEFAULT_WINDOW, ge=5, le=756)
+    include_matrix: Optional[bool] = None
+    top_pairs: int = Field(10, ge=0, le=1000)
+    dtype: Literal["float32", "float64"] = "float64"
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    ticker: str
+    start_date: str
+    end_date: str
+    coalesced: bool = False
+    error: Optional[str] = None
+    result: Optional[AnalysisResponse] = None
+
+
+def to_analysis_response(ticker: str, result: FinancialAnalysisState) -> AnalysisResponse:
+    return AnalysisResponse(
+        ticker=ticker,
+        market_insights=result.market_insights,
+        prediction_results=result.prediction_results,
+        visualization_paths=result.visualization_paths,
+        scenarios=result.scenarios,
+        stage_timings=result.stage_timings,
+    )
+
+
+def stage_key(stages: Optional[List[str]]) -> Optional[tuple]:
+    # Order-independent and hashable, for cache and job keys
+    return tuple(sorted(set(stages))) if stages else None
+
+
+def to_job_response(job: Job, coalesced: bool = False) -> JobResponse:
+    return JobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        ticker=job.ticker,
+        start_date=job.start_date,
+        end_date=job.end_date,
+        coalesced=coalesced,
+        error=job.error,
+        result=to_analysis_response(job.ticker, job.result) if job.status == SUCCEEDED else None,
+    )
+
+
+async def cached_analysis(
+    ticker: str, start_date: str, end_date: str, engine: str = AUTO_ARIMA, stages: Optional[tuple] = None
+) -> tuple:
+    async def compute():
+        # Run analysis off the event loop
+        result = await analysis_system.arun_analysis(
+            ticker=ticker,
+            start_date=start_date,
+            end_date=end_date,
+            engine=engine,
+            stages=stages,
+        )
+        return to_analysis_response(ticker, result)
+
+    # Identical concurrent requests share one run, completed ones are cached
+    return await analysis_cache.get_or_compute(
+        (ticker, start_date, end_date, engine, stages), compute, valid=charts_available
+    )
+
+
+def charts_available(response: AnalysisResponse) -> bool:
+    # Charts expire from the chart store long before settled responses do,
+    # so a response whose charts are gone is rendered again
+    return all(
+        analysis_system.visualization_service.get_chart(path.rsplit("/", 1)[-1]) is not None
+        for path in response.visualization_paths or []
+    )
+
+
+async def warm_analysis(
+    ticker: str, start_date: str, end_date: str, engine: str = AUTO_ARIMA, stages: Optional[tuple] = None
+) -> dict:
+    analysis, cache_status = await cached_analysis(ticker, start_date, end_date, engine, stage_key(stages))
+    return {"cache": cache_status, "stage_timings": analysis.stage_timings}
+
+
+async def run_analysis_job(
+    ticker: str, start_date: str, end_date: str, engine: str = AUTO_ARIMA, stages: Optional[tuple] = None
+) -> FinancialAnalysisState:
+    return await analysis_system.arun_analysis(ticker, start_date, end_date, engine, stages)
+
+
+# Shared across requests; the LLM client and chart renderer are created on first use
+analysis_system = FinancialAnalysisSystem()
+batch_service = BatchAnalysisService()
+backtest_service = BacktestService()
+series_service = SeriesExportService()
+scenario_service = ScenarioService()
+portfolio_service = PortfolioService()
+
+job_manager = JobManager(
+    runner=run_analysis_job,
+    workers=int(os.getenv("JOB_WORKERS", 2)),
+    max_queue=int(os.getenv("JOB_QUEUE_DEPTH", 32)),
+    result_ttl=float(os.getenv("JOB_RESULT_TTL", 3600)),
+)
+
+analysis_cache = AnalysisCache(
+    open_ttl=float(os.getenv("ANALYSIS_CACHE_TTL", 60)),
+    max_entries=int(os.getenv("ANALYSIS_CACHE_SIZE", 1024)),
+)
+
+# Pre-market warming of the WARMUP_TICKERS watchlist, None when not configured
+warmup_scheduler = configured_scheduler(runner=warm_analysis)
+
+
+def cache_metrics():
+    # Read at scrape time from the counters each cache already keeps
+    caches = {
+        "analysis": analysis_cache.stats(),
+        "model_registry": get_model_registry().stats(),
+        "charts": get_chart_store().stats(),
+    }
+    llm_cache = get_llm_cache()
+    if llm_cache is not None:
+        caches["llm"] = llm_cache.stats()
+
+    registry_stats = caches["model_registry"]
+    return [
+        ("cache_hits_total", "counter", "Cache lookups served from the cache",
+         [({"cache": name}, stats["hits"]) for name, stats in caches.items()]),
+        ("cache_misses_total", "counter", "Cache lookups that had to compute",
+         [({"cache": name}, stats["misses"]) for name, stats in caches.items()]),
+        ("cache_entries", "gauge", "Entries currently held",
+         [({"cache": name}, stats["entries"]) for name, stats in caches.items()]),
+        ("model_registry_reuse_total", "counter", "Registry lookups answered by updating or refitting a stored model",
+         [({"result": "update"}, registry_stats["updates"]), ({"result": "refit"}, registry_stats["refits"])]),
+        ("analysis_cache_coalesced_total", "counter", "Analysis requests that joined an identical run in flight",
+         [({}, caches["analysis"]["coalesced"])]),
+        ("analysis_jobs_queued", "gauge", "Analysis jobs waiting for a worker",
+         [({}, job_manager.queue_depth())]),
+    ]
+
+
+metrics.registry.register_collector("caches", cache_metrics)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Heavy stage dependencies load on first use unless ANALYSIS_PRELOAD asks for warm workers
+    preload_stages = configured_stages()
+    if preload_stages:
+        timings = preload(preload_stages)
+        logger.info(f"Preloaded stages {', '.join(f'{s} ({t:.2f}s)' for s, t in timings.items())}")
+    if warmup_scheduler is not None:
+        warmup_scheduler.start(run_now=os.getenv("WARMUP_ON_START", "").lower() in ("1", "true", "yes"))
+        times = ', '.join(at.strftime('%H:%M') for at in warmup_scheduler.times)
+        logger.info(f"Warming {len(warmup_scheduler.watchlist)} watchlist tickers at {times}")
+    yield
+    if warmup_scheduler is not None:
+        await warmup_scheduler.stop()
+    await job_manager.stop()
+    # Stop the shared thread and process pools used by the analysis pipeline
+    shutdown_executors()
 
 
 app = FastAPI(
     title="Financial Analysis API",
     description="AI-powered financial analysis and prediction system",
     version="0.1.0",
+    lifespan=lifespan,
 )
+app.add_middleware(metrics.MetricsMiddleware)
 
 
-@app.post("/analyze", response_model=AnalysisResponse)
-async def perform_financial_analysis(request: AnalysisRequest):
+@app.post("/analyze", response_model=AnalysisResponse, response_model_exclude_none=True)
+async def perform_financial_analysis(request: AnalysisRequest, response: Response):
     try:
         # Log the incoming request
         logger.info(f"Received analysis request for {request.ticker}")
@@ -37,23 +291,15 @@ async def perform_financial_analysis(request: AnalysisRequest):
         # Use current date if end_date is not provided
         end_date = request.end_date or datetime.now().strftime("%Y-%m-%d")
 
-        # Initialize analysis system
-        system = FinancialAnalysisSystem()
-
-        # Run analysis
-        result = system.run_analysis(
-            ticker=request.ticker, start_date=request.start_date, end_date=end_date
+        analysis, cache_status = await cached_analysis(
+            request.ticker, request.start_date, end_date, request.engine, stage_key(request.stages)
         )
+        response.headers["X-Cache"] = cache_status
 
         # Log successful analysis
-        logger.info(f"Completed analysis for {request.ticker}")
+        logger.info(f"Completed analysis for {request.ticker} (cache {cache_status})")
 
-        return AnalysisResponse(
-            ticker=request.ticker,
-            market_insights=result.get("market_insights", ""),
-            prediction_results=result.get("prediction_results", {}),
-            visualization_paths=result.get("visualization_paths", []),
-        )
+        return analysis
 
     except Exception as e:
         # Log the error
@@ -61,7 +307,271 @@ async def perform_financial_analysis(request: AnalysisRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/analyze/batch", response_model=BatchAnalysisResponse, response_model_exclude_none=True)
+def perform_batch_analysis(request: BatchAnalysisRequest):
+    try:
+        logger.info(f"Received batch analysis request for {len(request.tickers)} tickers")
+
+        end_date = request.end_date or datetime.now().strftime("%Y-%m-%d")
+
+        # Declared sync so FastAPI runs the batch in its threadpool
+        batch = batch_service.run_batch(
+            tickers=request.tickers,
+            start_date=request.start_date,
+            end_date=end_date,
+            max_workers=request.max_workers,
+            engine=request.engine,
+            stages=request.stages,
+        )
+
+        for ticker, error in batch["errors"].items():
+            logger.error(f"Batch analysis error for {ticker}: {error}")
+        logger.info(f"Completed batch analysis: {len(batch['results'])} succeeded, {len(batch['errors'])} failed")
+
+        return BatchAnalysisResponse(
+            results={
+                ticker: to_analysis_response(ticker, result)
+                for ticker, result in batch["results"].items()
+            },
+            errors=batch["errors"],
+        )
+
+    except Exception as e:
+        logger.error(f"Batch analysis error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/backtest", response_model=BacktestResponse)
+def run_backtest(request: BacktestRequest):
+    try:
+        logger.info(f"Received backtest request for {len(request.tickers)} tickers")
+
+        end_date = request.end_date or datetime.now().strftime("%Y-%m-%d")
+
+        # Declared sync so FastAPI runs the walk-forward in its threadpool
+        report = backtest_service.run(
+            tickers=request.tickers,
+            start_date=request.start_date,
+            end_date=end_date,
+            horizon=request.horizon,
+            step=request.step,
+            min_train=request.min_train,
+            max_origins=request.max_origins,
+            engine=request.engine,
+            max_workers=request.max_workers,
+        )
+
+        for ticker, error in report["errors"].items():
+            logger.error(f"Backtest error for {ticker}: {error}")
+        logger.info(f"Completed backtest over {report['overall']['origins']} origins")
+
+        return BacktestResponse(**report)
+
+    except Exception as e:
+        logger.error(f"Backtest error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Declared sync so FastAPI runs the simulation in its threadpool
+@app.post("/scenarios")
+def run_scenarios(request: ScenarioRequest):
+    try:
+        logger.info(f"Received scenario request for {request.ticker} ({request.paths} paths)")
+        options = request.model_dump(exclude={"ticker", "start_date", "end_date", "method", "engine"})
+        return scenario_service.run(
+            request.ticker,
+            request.start_date,
+            request.end_date or datetime.now().strftime("%Y-%m-%d"),
+            method=request.method,
+            engine=request.engine,
+            **options,
+        )
+    except Exception as e:
+        logger.error(f"Scenario error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Declared sync so FastAPI runs the matrix work in its threadpool
+@app.post("/portfolio")
+def analyze_portfolio(request: PortfolioRequest):
+    try:
+        logger.info(f"Received portfolio request for {len(request.tickers)} tickers")
+        options = request.model_dump(exclude={"tickers", "start_date", "end_date"})
+        return portfolio_service.analyze(
+            request.tickers,
+            request.start_date,
+            request.end_date or datetime.now().strftime("%Y-%m-%d"),
+            **options,
+        )
+    except Exception as e:
+        logger.error(f"Portfolio error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def export_series(
+    tickers: List[str], start_date: str, end_date: Optional[str], columns: Optional[List[str]],
+    periods: int, engine: str, fmt: Optional[str], accept: Optional[str]
+) -> Response:
+    try:
+        fmt = negotiate_format(fmt, accept)
+    except FormatUnavailableError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+
+    try:
+        logger.info(f"Received series export request for {len(tickers)} tickers as {fmt}")
+        frame = series_service.build_frame(
+            tickers, start_date, end_date or datetime.now().strftime("%Y-%m-%d"), columns, periods, engine
+        )
+        content, media_type = series_service.serialize(frame, fmt)
+        return Response(content=content, media_type=media_type)
+    except Exception as e:
+        logger.error(f"Series export error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Declared sync so FastAPI runs the export in its threadpool
+@app.get("/series/{ticker}")
+def get_series(
+    ticker: str,
+    start_date: str,
+    request: Request,
+    end_date: Optional[str] = None,
+    columns: Optional[List[SeriesColumn]] = Query(None),
+    periods: int = 7,
+    engine: EngineName = AUTO_ARIMA,
+    format: Optional[SeriesFormat] = None,
+):
+    return export_series(
+        [ticker], start_date, end_date, columns, periods, engine, format, request.headers.get("accept")
+    )
+
+
+@app.post("/series/batch")
+def get_series_batch(body: SeriesBatchRequest, request: Request):
+    return export_series(
+        body.tickers, body.start_date, body.end_date, body.columns, body.periods, body.engine,
+        body.format, request.headers.get("accept")
+    )
+
+
+@app.get("/analyze/{ticker}/insights/stream")
+async def stream_market_insights(ticker: str, start_date: str, request: Request, end_date: Optional[str] = None):
+    end_date = end_date or datetime.now().strftime("%Y-%m-%d")
+    system = analysis_system
+
+    # The forecast is computed before the stream opens so failures surface as
+    # a normal error response and the first event is ready immediately
+    try:
+        logger.info(f"Received insight stream request for {ticker}")
+        forecast_result = await system.aprepare_forecast(ticker, start_date, end_date)
+    except Exception as e:
+        logger.error(f"Insight stream error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def events():
+        yield f"event: forecast\ndata: {json.dumps(forecast_result.prediction_results)}\n\n"
+
+        tokens = system.insights_service.astream_insights(
+            forecast_result.prices.tail(10).to_frame(),
+            forecast_result.forecast.tolist(),
+        )
+        try:
+            async for token in tokens:
+                if await request.is_disconnected():
+                    logger.info(f"Client disconnected, cancelled insight stream for {ticker}")
+                    return
+                yield f"event: token\ndata: {json.dumps({'text': token})}\n\n"
+        except Exception as e:
+            logger.error(f"Insight stream error: {str(e)}")
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+            return
+        finally:
+            await tokens.aclose()
+
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.post("/jobs", response_model=JobResponse, status_code=202)
+async def submit_analysis_job(request: AnalysisRequest):
+    end_date = request.end_date or datetime.now().strftime("%Y-%m-%d")
+
+    try:
+        job, created = job_manager.submit(
+            request.ticker, request.start_date, end_date, engine=request.engine, stages=stage_key(request.stages)
+        )
+    except QueueFullError as e:
+        logger.warning(f"Rejected analysis job for {request.ticker}: {str(e)}")
+        return JSONResponse(status_code=429, content={"detail": str(e)}, headers={"Retry-After": "5"})
+
+    if created:
+        logger.info(f"Queued analysis job {job.job_id} for {request.ticker}")
+    return to_job_response(job, coalesced=not created)
+
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_analysis_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job: {job_id}")
+    return to_job_response(job)
+
+
+@app.get("/jobs/{job_id}/events")
+async def stream_analysis_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job: {job_id}")
+
+    async def events():
+        while True:
+            status = job.status
+            payload = to_job_response(job).model_dump()
+            yield f"event: {status}\ndata: {json.dumps(payload)}\n\n"
+            if job.done:
+                return
+
+            # Comment lines keep proxies from closing an idle stream
+            while job.status == status:
+                await job.wait_for_change(timeout=15)
+                if job.status == status:
+                    yield ": keep-alive\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/charts/{chart_id}")
+async def get_chart(chart_id: str):
+    chart = analysis_system.visualization_service.get_chart(chart_id)
+    if chart is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired chart: {chart_id}")
+
+    content, media_type = chart
+    # Chart IDs are content hashes, so a chart never changes once served
+    return Response(content=content, media_type=media_type, headers={"Cache-Control": "public, max-age=86400, immutable"})
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return analysis_cache.stats()
+
+
 # Additional endpoints can be added here
+@app.get("/warmup/status")
+async def warmup_status():
+    # The in-process scheduler, or the status file of a separate warm-up worker
+    status = warmup_scheduler.status() if warmup_scheduler is not None else read_status()
+    if status is None:
+        raise HTTPException(status_code=404, detail="Cache warming is not configured")
+    return status
+
+
 @app.get("/")
 async def root():
     return {"message": "Financial Analysis API is running"}
@@ -0,0 +1,300 @@
+"""
+Walk-forward backtesting of price forecasts
+
+    python -m src.core.backtesting AAPL MSFT --start-date 2021-01-01 --end-date 2024-01-01 \
+        --checkpoint backtest.json
+"""
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.core.data_ingestion import DataIngestionService
+from src.core.forecast_engines import AUTO_ARIMA, ClosedFormModel, get_engine
+from src.core.model_registry import extend_model
+from src.core.prediction import PredictionService
+from src.core.price_store import PriceStore, get_price_store, validate_ticker
+
+# Upper bound on worker processes a single backtest may use
+MAX_BACKTEST_WORKERS = int(os.getenv('BACKTEST_MAX_WORKERS', os.cpu_count() or 1))
+
+
+def evaluate_origins(
+    close: pd.Series,
+    origins: List[int],
+    horizon: int,
+    engine: str = AUTO_ARIMA,
+    search_every: int = 10,
+    alpha: float = 0.05
+) -> List[Dict[str, Any]]:
+    """
+    Forecast from consecutive origins of one series
+
+    With auto_arima the order search runs at the first origin and then only
+    every `search_every` origins; in between, the last searched order is
+    refitted from the previous parameters as the model registry does.
+
+    Args:
+        close (pd.Series): Full price history
+        origins (List[int]): Training lengths, in increasing order
+        horizon (int): Number of periods forecast from each origin
+        engine (str): 'auto_arima' or a fast engine from forecast_engines.ENGINES
+        search_every (int): Origins between full order searches
+        alpha (float): Prediction intervals cover 1 - alpha
+
+    Returns:
+        List of per-origin records with forecast, interval and actual prices
+    """
+    records = []
+    model = None
+    for i, origin in enumerate(origins):
+        train = close.iloc[:origin]
+        if engine != AUTO_ARIMA:
+            model = ClosedFormModel(get_engine(engine), train.to_numpy(dtype=np.float64))
+            order = None
+        else:
+            if model is None or i % search_every == 0:
+                model = PredictionService.fit_model(train)
+            else:
+                model = extend_model(model, train, len(train), 'refit')
+            order = list(model.order)
+
+        forecast, conf_int = model.predict(n_periods=horizon, return_conf_int=True, alpha=alpha)
+        records.append({
+            'origin': close.index[origin - 1].strftime('%Y-%m-%d'),
+            'order': order,
+            'forecast': np.asarray(forecast).tolist(),
+            'lower': np.asarray(conf_int)[:, 0].tolist(),
+            'upper': np.asarray(conf_int)[:, 1].tolist(),
+            'actual': close.iloc[origin:origin + horizon].tolist(),
+        })
+    return records
+
+
+def summarize(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Accuracy metrics over backtest records
+
+    Args:
+        records (List[Dict]): Records from evaluate_origins
+
+    Returns:
+        Dict of origins, MAE, MAPE (percent), interval coverage and MAE per horizon step
+    """
+    if not records:
+        return {'origins': 0, 'mae': None, 'mape': None, 'coverage': None, 'mae_by_horizon': []}
+
+    forecast = np.array([r['forecast'] for r in records])
+    actual = np.array([r['actual'] for r in records])
+    lower = np.array([r['lower'] for r in records])
+    upper = np.array([r['upper'] for r in records])
+
+    errors = np.abs(forecast - actual)
+    return {
+        'origins': len(records),
+        'mae': float(errors.mean()),
+        'mape': float((errors / np.abs(actual)).mean() * 100),
+        'coverage': float(((lower <= actual) & (actual <= upper)).mean()),
+        'mae_by_horizon': errors.mean(axis=0).tolist(),
+    }
+
+
+class BacktestService:
+    def __init__(self, store: Optional[PriceStore] = None):
+        """
+        Initialize the backtesting service
+
+        Args:
+            store (PriceStore): Price store, the shared store by default
+        """
+        self.store = store or get_price_store()
+
+    def run(
+        self,
+        tickers: List[str],
+        start_date: str,
+        end_date: str,
+        horizon: int = 7,
+        step: int = 5,
+        min_train: int = 250,
+        max_origins: Optional[int] = None,
+        engine: str = AUTO_ARIMA,
+        search_every: int = 10,
+        block_size: int = 10,
+        max_workers: Optional[int] = None,
+        checkpoint: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a walk-forward backtest over several tickers
+
+        Origins start after `min_train` bars and advance by `step` bars. Each
+        ticker's origins are split into blocks of `block_size` neighbours that
+        run as one task in a process pool, so an order found at the start of
+        a block is reused by the rest of it. Finished blocks are written to
+        `checkpoint`, and a rerun with the same checkpoint and parameters
+        skips them.
+
+        Args:
+            tickers (List[str]): Stock ticker symbols
+            start_date (str): Start of the price history
+            end_date (str): End of the price history
+            horizon (int): Number of periods forecast from each origin
+            step (int): Bars between consecutive origins
+            min_train (int): Bars in the first training window
+            max_origins (int): Keep only the latest origins per ticker
+            engine (str): 'auto_arima' or a fast engine from forecast_engines.ENGINES
+            search_every (int): Origins between full auto_arima order searches
+            block_size (int): Neighbouring origins evaluated by one task
+            max_workers (int): Worker processes, bounded by MAX_BACKTEST_WORKERS; 1 runs inline
+            checkpoint (str): Optional JSON file to save progress to and resume from
+
+        Returns:
+            Dict with per-ticker `results`, `overall` metrics, per-ticker `errors`
+            and task counts
+        """
+        if engine != AUTO_ARIMA:
+            # Reject unknown engines before fetching anything
+            get_engine(engine)
+
+        tickers = list(dict.fromkeys(tickers))
+        workers = max(1, min(max_workers or MAX_BACKTEST_WORKERS, MAX_BACKTEST_WORKERS))
+        config = {
+            'tickers': tickers, 'start_date': start_date, 'end_date': end_date, 'horizon': horizon,
+            'step': step, 'min_train': min_train, 'max_origins': max_origins, 'engine': engine,
+            'search_every': search_every, 'block_size': block_size,
+        }
+        done = self._load_checkpoint(checkpoint, config)
+        errors: Dict[str, str] = {}
+
+        # 1. Data and origins
+        # Malformed symbols are rejected on their own so they cannot fail the bulk fetch
+        for ticker in tickers:
+            try:
+                validate_ticker(ticker)
+            except ValueError as e:
+                errors[ticker] = f"Data ingestion error: {str(e)}"
+        valid = [ticker for ticker in tickers if ticker not in errors]
+
+        try:
+            frames = self.store.get_many(valid, start_date, end_date)
+        except Exception as e:
+            errors.update({t: f"Data ingestion error: {str(e)}" for t in valid})
+            return self._report(tickers, {}, errors, 0, 0)
+
+        series, tasks = {}, {}
+        for ticker in valid:
+            try:
+                if frames[ticker].empty:
+                    raise ValueError("No data found for the given ticker and date range")
+                close = DataIngestionService._preprocess_data(frames[ticker])['Close']
+                origins = list(range(min_train, len(close) - horizon + 1, step))
+                if max_origins:
+                    origins = origins[-max_origins:]
+                if not origins:
+                    raise ValueError(f"Need at least {min_train + horizon} bars, got {len(close)}")
+                series[ticker] = close
+                for start in range(0, len(origins), block_size):
+                    tasks[f"{ticker}:{origins[start]}"] = (ticker, origins[start:start + block_size])
+            except Exception as e:
+                errors[ticker] = f"Backtest error: {str(e)}"
+
+        # 2. Walk-forward evaluation of the blocks not in the checkpoint
+        pending = {key: task for key, task in tasks.items() if key not in done}
+        resumed = len(tasks) - len(pending)
+
+        def finish(key, records):
+            done[key] = records
+            self._save_checkpoint(checkpoint, config, done)
+
+        if workers == 1:
+            for key, (ticker, origins) in pending.items():
+                try:
+                    finish(key, evaluate_origins(series[ticker], origins, horizon, engine, search_every))
+                except Exception as e:
+                    errors[ticker] = f"Backtest error: {str(e)}"
+        elif pending:
+            with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+                futures = {
+                    pool.submit(evaluate_origins, series[ticker], origins, horizon, engine, search_every): key
+                    for key, (ticker, origins) in pending.items()
+                }
+                for future in as_completed(futures):
+                    key = futures[future]
+                    try:
+                        finish(key, future.result())
+                    except Exception as e:
+                        errors[tasks[key][0]] = f"Backtest error: {str(e)}"
+
+        records = {ticker: [] for ticker in series if ticker not in errors}
+        for key, (ticker, _) in tasks.items():
+            if ticker in records:
+                records[ticker].extend(done[key])
+        return self._report(tickers, records, errors, len(pending), resumed)
+
+    @staticmethod
+    def _report(tickers, records, errors, computed, resumed) -> Dict[str, Any]:
+        return {
+            'results': {ticker: summarize(records[ticker]) for ticker in tickers if ticker in records},
+            'overall': summarize([r for ticker_records in records.values() for r in ticker_records]),
+            'errors': errors,
+            'tasks': {'computed': computed, 'resumed': resumed},
+        }
+
+    @staticmethod
+    def _config_hash(config: Dict[str, Any]) -> str:
+        return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def _load_checkpoint(path: Optional[str], config: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        if not path or not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            saved = json.load(f)
+        if saved.get('config_hash') != BacktestService._config_hash(config):
+            raise ValueError(f"Checkpoint {path} was written by a backtest with different parameters")
+        return saved['blocks']
+
+    @staticmethod
+    def _save_checkpoint(path: Optional[str], config: Dict[str, Any], blocks: Dict[str, Any]) -> None:
+        if not path:
+            return
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'config': config, 'config_hash': BacktestService._config_hash(config), 'blocks': blocks}, f)
+        os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('tickers', nargs='+')
+    parser.add_argument('--start-date', required=True)
+    parser.add_argument('--end-date', required=True)
+    parser.add_argument('--horizon', type=int, default=7)
+    parser.add_argument('--step', type=int, default=5)
+    parser.add_argument('--min-train', type=int, default=250)
+    parser.add_argument('--max-origins', type=int, default=None)
+    parser.add_argument('--engine', default=AUTO_ARIMA)
+    parser.add_argument('--search-every', type=int, default=10)
+    parser.add_argument('--block-size', type=int, default=10)
+    parser.add_argument('--max-workers', type=int, default=None)
+    parser.add_argument('--checkpoint', default=None, help='JSON file to save progress to and resume from')
+    args = parser.parse_args()
+
+    report = BacktestService().run(
+        args.tickers, args.start_date, args.end_date,
+        horizon=args.horizon, step=args.step, min_train=args.min_train, max_origins=args.max_origins,
+        engine=args.engine, search_every=args.search_every, block_size=args.block_size,
+        max_workers=args.max_workers, checkpoint=args.checkpoint
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
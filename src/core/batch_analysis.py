@@ -0,0 +1,264 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional
+
+import numpy as np
+
+from src.core.data_ingestion import DataIngestionService
+from src.core.executors import get_cpu_executor
+from src.core.financial_analysis import CHARTS, INSIGHTS, SCENARIOS, resolve_stages
+from src.core.forecast_engines import AUTO_ARIMA, ClosedFormModel, forecast_many, get_engine
+from src.core.prediction import PredictionService
+from src.core.insights import MarketInsightsService
+from src.core.scenarios import ScenarioService
+from src.core.price_store import PriceStore, get_price_store, validate_ticker
+from src.core.model_registry import ModelRegistry, extend_model, get_model_registry
+from src.models.financial_analysis_state import FinancialAnalysisState, PriceFrame
+from src.utils.metrics import observe_search
+from src.utils.visualization import VisualizationService
+
+# Upper bound on threads, and on model fits in the shared process pool, a single batch may use
+MAX_BATCH_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', os.cpu_count() or 1))
+
+class BatchAnalysisService:
+    def __init__(
+        self,
+        store: Optional[PriceStore] = None,
+        registry: Optional[ModelRegistry] = None,
+        insights_service: Optional[MarketInsightsService] = None,
+        visualization_service: Optional[VisualizationService] = None
+    ):
+        """
+        Initialize the batch analysis pipeline
+
+        Args:
+            store (PriceStore): Price store, the shared store by default
+            registry (ModelRegistry): Model registry, the shared registry by default
+            insights_service (MarketInsightsService): Insights generator
+            visualization_service (VisualizationService): Chart renderer
+        """
+        self.store = store or get_price_store()
+        self.registry = registry or get_model_registry()
+        self._insights_service = insights_service
+        self._visualization_service = visualization_service
+
+    @property
+    def insights_service(self) -> MarketInsightsService:
+        if self._insights_service is None:
+            self._insights_service = MarketInsightsService()
+        return self._insights_service
+
+    @property
+    def visualization_service(self) -> VisualizationService:
+        if self._visualization_service is None:
+            self._visualization_service = VisualizationService()
+        return self._visualization_service
+
+    def run_batch(
+        self,
+        tickers: List[str],
+        start_date: str,
+        end_date: str,
+        max_workers: Optional[int] = None,
+        periods: int = 7,
+        engine: str = AUTO_ARIMA,
+        stages: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run the analysis workflow for several tickers sharing a date range
+
+        Data for all tickers is fetched with one bulk provider call, ARIMA
+        searches, updates and refits the model registry cannot serve as is
+        run in the shared process pool, and LLM insights are requested from a
+        thread pool, each at most `max_workers` at a time. Closed-form
+        engines forecast all tickers with one vectorized call instead. A
+        failure for one ticker is reported under `errors` without affecting
+        the others.
+
+        Args:
+            tickers (List[str]): Stock ticker symbols
+            start_date (str): Analysis start date
+            end_date (str): Analysis end date
+            max_workers (int): Concurrency cap, bounded by MAX_BATCH_WORKERS
+            periods (int): Number of periods to forecast
+            engine (str): 'auto_arima' or a fast engine from forecast_engines.ENGINES
+            stages (Iterable[str]): Stages to run, see financial_analysis.ALL_STAGES; DEFAULT_STAGES by default
+
+        Returns:
+            Dict with per-ticker FinancialAnalysisState `results` and per-ticker `errors`
+        """
+        stages = resolve_stages(stages)
+        if engine != AUTO_ARIMA:
+            # Reject unknown engines before fetching anything
+            get_engine(engine)
+
+        tickers = list(dict.fromkeys(tickers))
+        workers = max(1, min(max_workers or MAX_BATCH_WORKERS, MAX_BATCH_WORKERS))
+        results: Dict[str, FinancialAnalysisState] = {}
+        preprocessed = {}
+        errors: Dict[str, str] = {}
+
+        # 1. Data Ingestion
+        # Malformed symbols are rejected on their own so they cannot fail the bulk fetch
+        for ticker in tickers:
+            try:
+                validate_ticker(ticker)
+            except ValueError as e:
+                errors[ticker] = f"Data ingestion error: {str(e)}"
+        tickers = [ticker for ticker in tickers if ticker not in errors]
+
+        try:
+            frames = self.store.get_many(tickers, start_date, end_date)
+        except Exception as e:
+            errors.update({ticker: f"Data ingestion error: {str(e)}" for ticker in tickers})
+            return {'results': {}, 'errors': errors}
+
+        for ticker in tickers:
+            try:
+                if frames[ticker].empty:
+                    raise ValueError("No data found for the given ticker and date range")
+                preprocessed[ticker] = DataIngestionService._preprocess_data(frames[ticker])
+                results[ticker] = FinancialAnalysisState(
+                    ticker=ticker,
+                    start_date=start_date,
+                    end_date=end_date,
+                    prices=PriceFrame.from_frame(preprocessed[ticker])
+                )
+            except Exception as e:
+                errors[ticker] = f"Data ingestion error: {str(e)}"
+        # Only the preprocessed buffers are kept from here on
+        del frames
+
+        # 2. Predictive Modeling
+        series = {ticker: preprocessed[ticker]['Close'] for ticker in results}
+        forecasts = {}
+        if engine == AUTO_ARIMA:
+            models = self._resolve_models(series, workers, errors)
+        else:
+            models = {
+                ticker: ClosedFormModel(get_engine(engine), close.to_numpy(dtype='float64'))
+                for ticker, close in series.items()
+            }
+            try:
+                forecasts = forecast_many(series, engine, periods)
+            except Exception:
+                # Fall back to per-ticker forecasts so one bad series only fails itself
+                forecasts = {}
+
+        for ticker in list(results):
+            try:
+                if ticker in forecasts:
+                    forecast, conf_int = forecasts[ticker]
+                else:
+                    forecast, conf_int = models[ticker].predict(n_periods=periods, return_conf_int=True)
+                results[ticker].forecast = np.asarray(forecast, dtype=np.float64)
+                results[ticker].conf_int = np.asarray(conf_int, dtype=np.float64)
+            except Exception as e:
+                errors.setdefault(ticker, f"Prediction error: {str(e)}")
+                del results[ticker]
+
+        # 3. Market Insights
+        if INSIGHTS in stages:
+            self._run_stage(
+                results, errors, workers, 'market_insights',
+                lambda ticker, result: self.insights_service.generate_insights(
+                    preprocessed[ticker].tail(10),
+                    result.forecast.tolist()
+                )['market_insights']
+            )
+
+        # 4. Visualization, each chart has its own figure so they render concurrently
+        if CHARTS in stages:
+            self._run_stage(
+                results, errors, workers, 'visualization_paths',
+                lambda ticker, result: self.visualization_service.create_visualizations(
+                    preprocessed[ticker],
+                    result.prediction_results,
+                    ticker
+                ),
+                'Visualization error'
+            )
+
+        # 5. Risk Scenarios
+        if SCENARIOS in stages:
+            self._run_stage(
+                results, errors, workers, 'scenarios',
+                lambda ticker, result: ScenarioService.simulate(
+                    result.prices.column('Close')[-1], result.prices.column('Returns'), horizon=periods
+                ),
+                'Scenario error'
+            )
+
+        return {'results': results, 'errors': errors}
+
+    @staticmethod
+    def _run_stage(results, errors, workers, key, stage, error_prefix=None) -> None:
+        """Run `stage` for every remaining ticker in a thread pool, moving failures to `errors`"""
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {ticker: pool.submit(stage, ticker, result) for ticker, result in results.items()}
+            for ticker, future in futures.items():
+                try:
+                    setattr(results[ticker], key, future.result())
+                except Exception as e:
+                    errors[ticker] = f"{error_prefix}: {str(e)}" if error_prefix else str(e)
+                    del results[ticker]
+
+    def _resolve_models(self, series: Dict[str, Any], workers: int, errors: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Look models up in the registry and run the searches, updates and
+        refits in the shared process pool, at most `workers` at a time
+        """
+        models = {}
+        jobs = {}
+        for ticker, close in series.items():
+            try:
+                model, status, base = self.registry.find(ticker, close)
+            except Exception as e:
+                errors[ticker] = f"Prediction error: {str(e)}"
+                continue
+            if model is not None:
+                models[ticker] = model
+            elif base is None:
+                jobs[ticker] = (status, base, PredictionService.fit_model, (close,))
+            else:
+                jobs[ticker] = (status, base, extend_model, (base.model, close, base.length, status))
+
+        if not jobs:
+            return models
+
+        # The pool is shared with other requests, so this batch holds at most
+        # `workers` of its slots and submits the next job as one finishes
+        pool = get_cpu_executor()
+        slots = threading.BoundedSemaphore(workers)
+        futures = {}
+        for ticker, (_, _, fn, args) in jobs.items():
+            slots.acquire()
+            futures[ticker] = pool.submit(fn, *args)
+            futures[ticker].add_done_callback(lambda _: slots.release())
+
+        for ticker, future in futures.items():
+            status, base, _, _ = jobs[ticker]
+            try:
+                models[ticker] = future.result()
+                if base is None:
+                    observe_search(models[ticker])
+                    self.registry.put(ticker, series[ticker], models[ticker])
+                else:
+                    self.registry.put_extended(ticker, series[ticker], models[ticker], status, base)
+            except Exception as e:
+                errors[ticker] = f"Prediction error: {str(e)}"
+
+        return models
+
+        pool = get_cpu_executor()
+        futures = {ticker: pool.submit(PredictionService.fit_model, series[ticker]) for ticker in misses}
+        for ticker, future in futures.items():
+            try:
+                models[ticker] = future.result()
+                observe_search(models[ticker])
+                self.registry.put(ticker, series[ticker], models[ticker])
+            except Exception as e:
+                errors[ticker] = f"Prediction error: {str(e)}"
+
+        return models
@@ -1,29 +1,33 @@
-import yfinance as yf
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from src.models.financial_analysis_state import FinancialAnalysisState
+from src.core.price_store import PriceStore, get_price_store
 
 class DataIngestionService:
     @staticmethod
-    def fetch_stock_data(ticker: str, start_date: str, end_date: str) -> Dict[str, Any]:
+    def fetch_stock_data(
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        store: Optional[PriceStore] = None
+    ) -> Dict[str, Any]:
         """
-        Fetch stock data from Yahoo Finance
+        Fetch stock data through the local price store
         
         Args:
             ticker (str): Stock ticker symbol
             start_date (str): Start date for data retrieval
             end_date (str): End date for data retrieval
+            store (PriceStore): Price store to read from, the shared store by default
         
         Returns:
             Dict containing raw and preprocessed data
         """
         try:
-            # Download stock data
-            df = yf.download(
-                ticker, 
-                start=start_date, 
-                end=end_date
-            )
+            # Read stock data, downloading only ranges not held locally
+            store = store or get_price_store()
+            df = store.get(ticker, start_date, end_date)
 
             if df.empty:
                 raise ValueError("No data found for the given ticker and date range")
@@ -42,19 +46,42 @@ class DataIngestionService:
     def _preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
         """
         Preprocess financial data
-        
+
+        The cleaned bars and the derived columns are written once into a
+        single column-major float64 buffer, which the returned frame wraps
+        without copying, so its columns are views other stages can share.
+
         Args:
             df (pd.DataFrame): Raw stock data
-        
+
         Returns:
             Cleaned and feature-engineered DataFrame
         """
+        columns = [str(col) for col in df.columns] + ['Returns', 'Rolling_Mean', 'Rolling_Std']
+        raw = df.to_numpy(dtype=np.float64)
+
         # Remove any rows with missing values
-        df_cleaned = df.dropna()
-        
+        complete = ~np.isnan(raw).any(axis=1)
+        count = int(complete.sum())
+
+        buffer = np.empty((count, len(columns)), dtype=np.float64, order='F')
+        buffer[:, :raw.shape[1]] = raw[complete] if count < len(raw) else raw
+        index = df.index[complete] if count < len(raw) else df.index
+
         # Calculate additional features
-        df_cleaned['Returns'] = df_cleaned['Close'].pct_change()
-        df_cleaned['Rolling_Mean'] = df_cleaned['Close'].rolling(window=20).mean()
-        df_cleaned['Rolling_Std'] = df_cleaned['Close'].rolling(window=20).std()
-        
-        return df_cleaned.dropna()
\ No newline at end of file
+        close = pd.Series(buffer[:, columns.index('Close')], copy=False)
+        buffer[:1, -3] = np.nan
+        buffer[1:, -3] = close.to_numpy()[1:] / close.to_numpy()[:-1] - 1
+        buffer[:, -2] = close.rolling(window=20).mean().to_numpy()
+        buffer[:, -1] = close.rolling(window=20).std().to_numpy()
+
+        # Rows without a full rolling window lead the frame, so they can be
+        # sliced off as a view; anything else falls back to a copy
+        keep = ~np.isnan(buffer[:, -3:]).any(axis=1)
+        first = int(keep.argmax()) if keep.any() else count
+        if keep[first:].all():
+            buffer, index = buffer[first:], index[first:]
+        else:
+            buffer, index = np.asfortranarray(buffer[keep]), index[keep]
+
+        return pd.DataFrame(buffer, index=index, columns=columns, copy=False)
@@ -0,0 +1,77 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+# Threads for blocking I/O stages: downloads, disk reads, chart rendering
+IO_THREADS = int(os.getenv('ANALYSIS_IO_THREADS', 8))
+
+# Worker processes for CPU-bound model fitting
+CPU_PROCESSES = int(os.getenv('ANALYSIS_CPU_PROCESSES', os.cpu_count() or 1))
+
+# Optional multiprocessing start method for the process pool (fork, spawn, forkserver)
+MP_START_METHOD = os.getenv('ANALYSIS_MP_START_METHOD') or None
+
+# Warm worker processes up with the model fitting dependencies, see src.core.preload
+PRELOAD = bool(os.getenv('ANALYSIS_PRELOAD', '').strip())
+
+_io_executor: Optional[ThreadPoolExecutor] = None
+_cpu_executor: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """
+    Shared thread pool for blocking I/O stages
+
+    Returns:
+        ThreadPoolExecutor: Lazily created pool with IO_THREADS workers
+    """
+    global _io_executor
+    with _lock:
+        if _io_executor is None:
+            _io_executor = ThreadPoolExecutor(max_workers=IO_THREADS, thread_name_prefix='analysis-io')
+        return _io_executor
+
+
+def get_cpu_executor() -> ProcessPoolExecutor:
+    """
+    Shared process pool for CPU-bound model fitting
+
+    Returns:
+        ProcessPoolExecutor: Lazily created pool with CPU_PROCESSES workers
+    """
+    global _cpu_executor
+    with _lock:
+        if _cpu_executor is None:
+            context = multiprocessing.get_context(MP_START_METHOD) if MP_START_METHOD else None
+            _cpu_executor = ProcessPoolExecutor(
+                max_workers=CPU_PROCESSES,
+                mp_context=context,
+                initializer=_preload_worker if PRELOAD else None
+            )
+        return _cpu_executor
+
+
+def _preload_worker() -> None:
+    from src.core.preload import preload
+    preload(['forecast'])
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """
+    Shut down the shared pools, they are recreated on next use
+
+    Args:
+        wait (bool): Block until running work has finished
+    """
+    global _io_executor, _cpu_executor
+    with _lock:
+        io_executor, cpu_executor = _io_executor, _cpu_executor
+        _io_executor, _cpu_executor = None, None
+
+    if io_executor is not None:
+        io_executor.shutdown(wait=wait)
+    if cpu_executor is not None:
+        cpu_executor.shutdown(wait=wait)
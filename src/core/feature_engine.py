@@ -0,0 +1,274 @@
+import warnings
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+# Same columns as PreprocessingService.engineer_financial_features
+FINANCIAL_FEATURES = ('Returns', 'MA_20', 'MA_50', 'Returns_Volatility', 'RSI')
+
+# Same columns as DataIngestionService._preprocess_data
+INGESTION_FEATURES = ('Returns', 'Rolling_Mean', 'Rolling_Std')
+
+ALL_FEATURES = FINANCIAL_FEATURES + ('Rolling_Mean', 'Rolling_Std')
+
+
+class _Rolling:
+    """
+    Cumulative sums of a (dates, tickers) block shared by every window length
+
+    Columns are shifted by their mean before summing so rolling variances do
+    not lose precision to cancellation. A window containing a missing value
+    is missing, matching pandas rolling with the default min_periods.
+    """
+
+    __slots__ = ('_center', '_sum', '_sq', '_missing', '_rows')
+
+    def __init__(self, values: np.ndarray, center: bool = True, squares: bool = False):
+        missing = np.isnan(values)
+        self._rows = values.shape[0]
+
+        if center:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                shift = np.nanmean(values, axis=0)
+            self._center = np.where(np.isfinite(shift), shift, 0.0)
+            filled = np.where(missing, 0.0, values - self._center)
+        else:
+            self._center = 0.0
+            filled = np.where(missing, 0.0, values)
+
+        self._sum = self._cumsum(filled)
+        self._sq = self._cumsum(filled * filled) if squares else None
+        self._missing = self._cumsum(missing) if missing.any() else None
+
+    @staticmethod
+    def _cumsum(values: np.ndarray) -> np.ndarray:
+        out = np.zeros((values.shape[0] + 1,) + values.shape[1:], dtype=np.float64)
+        np.cumsum(values, axis=0, out=out[1:])
+        return out
+
+    @staticmethod
+    def _window(cumulative: np.ndarray, window: int) -> np.ndarray:
+        return cumulative[window:] - cumulative[:-window]
+
+    def _place(self, values: np.ndarray, window: int) -> np.ndarray:
+        out = np.full((self._rows,) + values.shape[1:], np.nan)
+        if window <= self._rows:
+            out[window - 1:] = values
+            if self._missing is not None:
+                out[window - 1:][self._window(self._missing, window) > 0] = np.nan
+        return out
+
+    def mean(self, window: int) -> np.ndarray:
+        if window > self._rows:
+            return self._place(None, window)
+        return self._place(self._window(self._sum, window) / window + self._center, window)
+
+    def std(self, window: int) -> np.ndarray:
+        if window > self._rows:
+            return self._place(None, window)
+        sums = self._window(self._sum, window)
+        var = (self._window(self._sq, window) - sums * sums / window) / (window - 1)
+        return self._place(np.sqrt(np.maximum(var, 0.0)), window)
+
+
+class FeaturePanel:
+    """
+    Features of many tickers as (dates, tickers) arrays
+
+    `valid` marks the rows a per-ticker dropna() would keep: the price and
+    every computed feature are present.
+    """
+
+    def __init__(
+        self,
+        index: pd.Index,
+        tickers: pd.Index,
+        close: np.ndarray,
+        features: Dict[str, np.ndarray],
+        valid: np.ndarray
+    ):
+        self.index = index
+        self.tickers = tickers
+        self.close = close
+        self.features = features
+        self.valid = valid
+
+    def frame(self, feature: str) -> pd.DataFrame:
+        """
+        Wide frame of one feature
+
+        Args:
+            feature (str): Feature name, or 'Close'
+
+        Returns:
+            pd.DataFrame: Dates by tickers, invalid rows included as computed
+        """
+        values = self.close if feature == 'Close' else self.features[feature]
+        return pd.DataFrame(values, index=self.index, columns=self.tickers, copy=False)
+
+    def ticker(self, ticker: str) -> pd.DataFrame:
+        """
+        Feature frame of one ticker laid out like the per-ticker services
+
+        Args:
+            ticker (str): Ticker symbol
+
+        Returns:
+            pd.DataFrame: Close and feature columns over the valid rows
+        """
+        col = self.tickers.get_loc(ticker)
+        rows = self.valid[:, col]
+        columns = {'Close': self.close[rows, col]}
+        for name, values in self.features.items():
+            columns[name] = values[rows, col]
+        return pd.DataFrame(columns, index=self.index[rows])
+
+    def normalize(self, features: Optional[Iterable[str]] = None) -> 'FeaturePanel':
+        """
+        Add min-max scaled copies of features, computed over each ticker's valid rows
+
+        Matches PreprocessingService.normalize_data applied to ticker().
+
+        Args:
+            features (Iterable[str]): Features to scale, Close and every feature by default
+
+        Returns:
+            FeaturePanel: self, with '<name>_normalized' features added
+        """
+        names = list(features) if features is not None else ['Close'] + list(self.features)
+        scaled = {}
+        for name in names:
+            values = self.close if name == 'Close' else self.features[name]
+            scaled[f'{name}_normalized'] = FeatureEngine.min_max(values, self.valid)
+        self.features.update(scaled)
+        return self
+
+
+class FeatureEngine:
+    @staticmethod
+    def to_wide(
+        data: Union[pd.DataFrame, pd.Series, Dict[str, pd.DataFrame]],
+        column: str = 'Close'
+    ) -> pd.DataFrame:
+        """
+        Lay out price data as a (dates, tickers) frame
+
+        Args:
+            data: A wide frame with one column per ticker, a stacked frame or
+                series indexed by (date, ticker), or a dict of per-ticker frames
+            column (str): Price column to use from stacked or per-ticker frames
+
+        Returns:
+            pd.DataFrame: Prices with dates as rows and tickers as columns
+        """
+        if isinstance(data, dict):
+            return pd.concat({ticker: frame[column] for ticker, frame in data.items()}, axis=1).sort_index()
+        if isinstance(data.index, pd.MultiIndex):
+            series = data[column] if isinstance(data, pd.DataFrame) else data
+            return series.unstack(level=-1).sort_index()
+        return data
+
+    @staticmethod
+    def compute(
+        data: Union[pd.DataFrame, pd.Series, Dict[str, pd.DataFrame]],
+        features: Sequence[str] = FINANCIAL_FEATURES,
+        dtype: np.dtype = np.float32,
+        chunk_size: int = 1024
+    ) -> FeaturePanel:
+        """
+        Compute features for many tickers at once
+
+        Sums run in float64 over blocks of `chunk_size` tickers and results
+        are stored as `dtype`. Each ticker's valid rows hold the same values
+        as the per-ticker services applied to that ticker's price history.
+        Rows without a price are treated as gaps: windows spanning them are
+        missing.
+
+        Args:
+            data: Prices in any layout accepted by to_wide
+            features (Sequence[str]): Features to compute, see ALL_FEATURES
+            dtype (np.dtype): Storage type of the results
+            chunk_size (int): Tickers processed per block, bounds temporary memory
+
+        Returns:
+            FeaturePanel: Computed features and the valid row mask
+        """
+        try:
+            unknown = set(features) - set(ALL_FEATURES)
+            if unknown:
+                raise ValueError(f"Unknown features: {sorted(unknown)}")
+
+            wide = FeatureEngine.to_wide(data)
+            close = wide.to_numpy(dtype=np.float64)
+            rows, width = close.shape
+
+            out = {name: np.empty((rows, width), dtype=dtype) for name in features}
+            valid = np.empty((rows, width), dtype=bool)
+
+            for start in range(0, width, chunk_size):
+                block = slice(start, start + chunk_size)
+                computed = FeatureEngine._compute_block(close[:, block], features)
+                ok = ~np.isnan(close[:, block])
+                for name in features:
+                    out[name][:, block] = computed[name]
+                    ok &= ~np.isnan(computed[name])
+                valid[:, block] = ok
+
+            return FeaturePanel(wide.index, wide.columns, close.astype(dtype), out, valid)
+        except Exception as e:
+            raise ValueError(f"Feature engine error: {str(e)}")
+
+    @staticmethod
+    def min_max(values: np.ndarray, valid: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Column-wise min-max scaling
+
+        Args:
+            values (np.ndarray): (dates, tickers) array
+            valid (np.ndarray): Optional mask of the rows that define min and max
+
+        Returns:
+            np.ndarray: Scaled values in the dtype of `values`
+        """
+        masked = values if valid is None else np.where(valid, values, np.nan)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            low = np.nanmin(masked, axis=0)
+            span = np.nanmax(masked, axis=0) - low
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return ((values - low) / span).astype(values.dtype, copy=False)
+
+    @staticmethod
+    def _compute_block(close: np.ndarray, features: Sequence[str]) -> Dict[str, np.ndarray]:
+        wanted = set(features)
+        result = {}
+
+        prices = _Rolling(close, squares='Rolling_Std' in wanted)
+        if 'MA_20' in wanted or 'Rolling_Mean' in wanted:
+            ma_20 = prices.mean(20)
+            result['MA_20'] = result['Rolling_Mean'] = ma_20
+        if 'MA_50' in wanted:
+            result['MA_50'] = prices.mean(50)
+        if 'Rolling_Std' in wanted:
+            result['Rolling_Std'] = prices.std(20)
+
+        delta = np.full_like(close, np.nan)
+        delta[1:] = close[1:] - close[:-1]
+
+        if 'Returns' in wanted or 'Returns_Volatility' in wanted:
+            returns = np.full_like(close, np.nan)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                returns[1:] = delta[1:] / close[:-1]
+            result['Returns'] = returns
+            if 'Returns_Volatility' in wanted:
+                result['Returns_Volatility'] = _Rolling(returns, squares=True).std(20)
+
+        if 'RSI' in wanted:
+            # pandas' where() turns the leading missing delta into a zero gain/loss
+            gain = _Rolling(np.where(delta > 0, delta, 0.0), center=False).mean(14)
+            loss = _Rolling(np.where(delta < 0, -delta, 0.0), center=False).mean(14)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                result['RSI'] = 100 - (100 / (1 + gain / loss))
+
+        return {name: result[name] for name in features}
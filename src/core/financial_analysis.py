@@ -1,62 +1,310 @@
-import matplotlib.pyplot as plt
-import pandas as pd
-from typing import Dict, Any
+import asyncio
+import time
+import numpy as np
+from typing import Dict, Any, Iterable, Literal, Optional, Tuple
 
 from src.core.data_ingestion import DataIngestionService
+from src.core.executors import get_io_executor
+from src.core.forecast_engines import AUTO_ARIMA
+from src.core.price_store import PriceStore
+from src.core.model_registry import ModelRegistry
 from src.core.prediction import PredictionService
 from src.core.insights import MarketInsightsService
+from src.core.scenarios import ScenarioService
+from src.models.financial_analysis_state import FinancialAnalysisState, PriceFrame
+from src.utils.metrics import INPUT_ROWS, observe_stage
 from src.utils.visualization import VisualizationService
 
+FORECAST = 'forecast'
+INSIGHTS = 'insights'
+CHARTS = 'charts'
+SCENARIOS = 'scenarios'
+
+# Optional pipeline stages; data ingestion always runs
+ALL_STAGES = (FORECAST, INSIGHTS, CHARTS, SCENARIOS)
+
+# Stages run when none are requested; scenarios are opt-in
+DEFAULT_STAGES = (FORECAST, INSIGHTS, CHARTS)
+
+# Request-level stage names, kept in sync with ALL_STAGES
+StageName = Literal['forecast', 'insights', 'charts', 'scenarios']
+
+
+def resolve_stages(stages: Optional[Iterable[str]] = None) -> Tuple[str, ...]:
+    """
+    Validate a stage selection and add the stages it depends on
+
+    Insights and charts are built from the forecast, so selecting either
+    also selects the forecast.
+
+    Args:
+        stages (Iterable[str]): Requested stages, DEFAULT_STAGES when None or empty
+
+    Returns:
+        Tuple of stages to run in pipeline order
+    """
+    requested = set(stages or DEFAULT_STAGES)
+    unknown = requested - set(ALL_STAGES)
+    if unknown:
+        raise ValueError(f"Unknown analysis stages: {sorted(unknown)}, expected some of {list(ALL_STAGES)}")
+    requested.add(FORECAST)
+    return tuple(stage for stage in ALL_STAGES if stage in requested)
+
+
+def _elapsed_ms(started: float, stage: str) -> float:
+    """Record a finished stage in the metrics and return its duration in milliseconds"""
+    elapsed = time.perf_counter() - started
+    observe_stage(stage, elapsed)
+    return round(elapsed * 1000, 2)
+
+
 class FinancialAnalysisSystem:
-    def __init__(self):
+    def __init__(
+        self,
+        store: Optional[PriceStore] = None,
+        registry: Optional[ModelRegistry] = None,
+        insights_service: Optional[MarketInsightsService] = None,
+        visualization_service: Optional[VisualizationService] = None
+    ):
+        """
+        Initialize the analysis pipeline
+
+        The insights and visualization services are built on first use, so a
+        system that only forecasts never creates an LLM client.
+
+        Args:
+            store (PriceStore): Price store, the shared store by default
+            registry (ModelRegistry): Model registry, the shared registry by default
+            insights_service (MarketInsightsService): Insights generator
+            visualization_service (VisualizationService): Chart renderer
+        """
+        self.store = store
+        self.registry = registry
         self.data_service = DataIngestionService()
         self.prediction_service = PredictionService()
-        self.insights_service = MarketInsightsService()
-        self.visualization_service = VisualizationService()
-    
-    def run_analysis(self, ticker: str, start_date: str, end_date: str) -> Dict[str, Any]:
+        self._insights_service = insights_service
+        self._visualization_service = visualization_service
+
+    @property
+    def insights_service(self) -> MarketInsightsService:
+        if self._insights_service is None:
+            self._insights_service = MarketInsightsService()
+        return self._insights_service
+
+    @property
+    def visualization_service(self) -> VisualizationService:
+        if self._visualization_service is None:
+            self._visualization_service = VisualizationService()
+        return self._visualization_service
+
+    def run_analysis(
+        self,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        engine: str = AUTO_ARIMA,
+        stages: Optional[Iterable[str]] = None
+    ) -> FinancialAnalysisState:
         """
         Execute complete financial analysis workflow
-        
+
         Args:
             ticker (str): Stock ticker symbol
             start_date (str): Analysis start date
             end_date (str): Analysis end date
-        
+            engine (str): Forecasting engine
+            stages (Iterable[str]): Stages to run, see ALL_STAGES; DEFAULT_STAGES by default
+
         Returns:
-            Dict containing analysis results
+            FinancialAnalysisState with the results and per-stage timings in
+            milliseconds, None for skipped stages
         """
         try:
+            stages = resolve_stages(stages)
+            timings = dict.fromkeys(('data',) + ALL_STAGES)
+
             # 1. Data Ingestion
-            data_result = self.data_service.fetch_stock_data(ticker, start_date, end_date)
-            preprocessed_data = data_result['preprocessed_data']
-            
+            started = time.perf_counter()
+            preprocessed_data = self.data_service.fetch_stock_data(
+                ticker, start_date, end_date, store=self.store
+            )['preprocessed_data']
+            state = self._new_state(ticker, start_date, end_date, preprocessed_data, timings)
+            timings['data'] = _elapsed_ms(started, 'data')
+
             # 2. Predictive Modeling
-            prediction_result = self.prediction_service.forecast_prices(
-                preprocessed_data['Close']
-            )
-            
+            started = time.perf_counter()
+            self._set_forecast(state, self.prediction_service.forecast_prices(
+                preprocessed_data['Close'],
+                ticker=ticker,
+                registry=self.registry,
+                engine=engine
+            ))
+            timings[FORECAST] = _elapsed_ms(started, FORECAST)
+
+            # 3. Market Insights
+            if INSIGHTS in stages:
+                started = time.perf_counter()
+                state.market_insights = self.insights_service.generate_insights(
+                    preprocessed_data.tail(10),
+                    state.forecast.tolist()
+                )['market_insights']
+                timings[INSIGHTS] = _elapsed_ms(started, INSIGHTS)
+
+            # 4. Visualization
+            if CHARTS in stages:
+                started = time.perf_counter()
+                state.visualization_paths = self.visualization_service.create_visualizations(
+                    preprocessed_data,
+                    state.prediction_results,
+                    ticker
+                )
+                timings[CHARTS] = _elapsed_ms(started, CHARTS)
+
+            # 5. Risk Scenarios
+            if SCENARIOS in stages:
+                started = time.perf_counter()
+                state.scenarios = self._simulate(state)
+                timings[SCENARIOS] = _elapsed_ms(started, SCENARIOS)
+
+            return state
+
+        except Exception as e:
+            raise ValueError(f"Financial analysis error: {str(e)}")
+
+    async def aprepare_forecast(
+        self,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        engine: str = AUTO_ARIMA,
+        timings: Optional[Dict[str, Optional[float]]] = None
+    ) -> FinancialAnalysisState:
+        """
+        Run the data ingestion and predictive modeling stages asynchronously
+
+        Args:
+            ticker (str): Stock ticker symbol
+            start_date (str): Analysis start date
+            end_date (str): Analysis end date
+            engine (str): Forecasting engine
+            timings (Dict): Optional dict to record the stage timings in
+
+        Returns:
+            FinancialAnalysisState holding the preprocessed prices and the forecast
+        """
+        loop = asyncio.get_running_loop()
+        timings = timings if timings is not None else {}
+
+        # 1. Data Ingestion
+        started = time.perf_counter()
+        data_result = await loop.run_in_executor(
+            get_io_executor(),
+            lambda: self.data_service.fetch_stock_data(ticker, start_date, end_date, store=self.store)
+        )
+        state = self._new_state(ticker, start_date, end_date, data_result['preprocessed_data'], timings)
+        timings['data'] = _elapsed_ms(started, 'data')
+
+        # 2. Predictive Modeling
+        started = time.perf_counter()
+        self._set_forecast(state, await self.prediction_service.aforecast_prices(
+            data_result['preprocessed_data']['Close'],
+            ticker=ticker,
+            registry=self.registry,
+            engine=engine
+        ))
+        timings[FORECAST] = _elapsed_ms(started, FORECAST)
+
+        return state
+
+    async def arun_analysis(
+        self,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        engine: str = AUTO_ARIMA,
+        stages: Optional[Iterable[str]] = None
+    ) -> FinancialAnalysisState:
+        """
+        Execute the analysis workflow without blocking the event loop
+
+        Data ingestion and chart rendering run on the shared I/O thread pool,
+        model fitting runs in the shared worker process pool and the LLM is
+        called through its async client.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            start_date (str): Analysis start date
+            end_date (str): Analysis end date
+            engine (str): Forecasting engine
+            stages (Iterable[str]): Stages to run, see ALL_STAGES; DEFAULT_STAGES by default
+
+        Returns:
+            FinancialAnalysisState with the results and per-stage timings in
+            milliseconds, None for skipped stages
+        """
+        try:
+            loop = asyncio.get_running_loop()
+            stages = resolve_stages(stages)
+            timings = dict.fromkeys(('data',) + ALL_STAGES)
+
+            # 1-2. Data Ingestion and Predictive Modeling
+            state = await self.aprepare_forecast(ticker, start_date, end_date, engine, timings)
+            preprocessed_data = state.prices.to_frame()
+
             # 3. Market Insights
-            market_insights = self.insights_service.generate_insights(
-                preprocessed_data.tail(10), 
-                prediction_result['prediction_results']['forecast']
-            )
-            
+            if INSIGHTS in stages:
+                started = time.perf_counter()
+                state.market_insights = (await self.insights_service.agenerate_insights(
+                    preprocessed_data.tail(10),
+                    state.forecast.tolist()
+                ))['market_insights']
+                timings[INSIGHTS] = _elapsed_ms(started, INSIGHTS)
+
             # 4. Visualization
-            visualization_paths = self.visualization_service.create_visualizations(
-                preprocessed_data, 
-                prediction_result['prediction_results'],
-                ticker
-            )
-            
-            # Combine results
-            return {
-                'ticker': ticker,
-                **data_result,
-                **prediction_result,
-                **market_insights,
-                'visualization_paths': visualization_paths
-            }
-        
+            if CHARTS in stages:
+                started = time.perf_counter()
+                state.visualization_paths = await loop.run_in_executor(
+                    get_io_executor(),
+                    self.visualization_service.create_visualizations,
+                    preprocessed_data,
+                    state.prediction_results,
+                    ticker
+                )
+                timings[CHARTS] = _elapsed_ms(started, CHARTS)
+
+            # 5. Risk Scenarios
+            if SCENARIOS in stages:
+                started = time.perf_counter()
+                state.scenarios = await loop.run_in_executor(get_io_executor(), self._simulate, state)
+                timings[SCENARIOS] = _elapsed_ms(started, SCENARIOS)
+
+            return state
+
         except Exception as e:
-            raise ValueError(f"Financial analysis error: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Financial analysis error: {str(e)}")
+
+    @staticmethod
+    def _new_state(ticker, start_date, end_date, preprocessed_data, timings) -> FinancialAnalysisState:
+        # The raw download is dropped here; the state keeps a view of the preprocessed buffer
+        INPUT_ROWS.observe(len(preprocessed_data))
+        return FinancialAnalysisState(
+            ticker=ticker,
+            start_date=start_date,
+            end_date=end_date,
+            prices=PriceFrame.from_frame(preprocessed_data),
+            stage_timings=timings
+        )
+
+    @staticmethod
+    def _simulate(state: FinancialAnalysisState) -> Dict[str, Any]:
+        # Bootstrapped daily returns over the forecast horizon
+        return ScenarioService.simulate(
+            state.prices.column('Close')[-1], state.prices.column('Returns'), horizon=len(state.forecast)
+        )
+
+    @staticmethod
+    def _set_forecast(state: FinancialAnalysisState, prediction_result: Dict[str, Any]) -> None:
+        # The fitted model stays in the registry rather than on every result
+        state.forecast = np.asarray(prediction_result['prediction_results']['forecast'], dtype=np.float64)
+        state.conf_int = np.asarray(prediction_result['prediction_results']['confidence_interval'], dtype=np.float64)
+        state.model_cache = prediction_result['model_cache']
@@ -0,0 +1,251 @@
+import numpy as np
+import pandas as pd
+from statistics import NormalDist
+from typing import Dict, Literal, Mapping, Tuple
+
+AUTO_ARIMA = 'auto_arima'
+
+# Standard normal for interval widths; avoids loading scipy.stats at import
+_Z = NormalDist()
+
+# Request-level choice of engine, kept in sync with ENGINE_NAMES
+EngineName = Literal['auto_arima', 'drift', 'holt', 'arima_ls']
+
+
+class ForecastEngine:
+    """
+    Closed-form forecaster applied to many equal-length series at once
+
+    Subclasses implement forecast_many on a (series, observations) array
+    and return point forecasts with (lower, upper) prediction intervals in
+    the layout pmdarima's predict() uses.
+    """
+
+    name = None
+
+    def forecast_many(self, values: np.ndarray, periods: int, alpha: float = 0.05) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Forecast every row of `values`
+
+        Args:
+            values (np.ndarray): (series, observations) array without missing values
+            periods (int): Number of periods to forecast
+            alpha (float): Prediction intervals cover 1 - alpha
+
+        Returns:
+            Tuple of (series, periods) forecasts and (series, periods, 2) intervals
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _intervals(forecast: np.ndarray, variance: np.ndarray, alpha: float) -> np.ndarray:
+        half_width = _Z.inv_cdf(1 - alpha / 2) * np.sqrt(np.maximum(variance, 0.0))
+        return np.stack([forecast - half_width, forecast + half_width], axis=-1)
+
+
+class DriftEngine(ForecastEngine):
+    """Random walk with drift, the line through the first and last observation"""
+
+    name = 'drift'
+
+    def forecast_many(self, values: np.ndarray, periods: int, alpha: float = 0.05) -> Tuple[np.ndarray, np.ndarray]:
+        n = values.shape[1]
+        if n <= 2:
+            raise ValueError(f"Need more than 2 observations for drift, got {n}")
+        drift = (values[:, -1] - values[:, 0]) / (n - 1)
+        residuals = np.diff(values, axis=1) - drift[:, None]
+        sigma2 = (residuals ** 2).sum(axis=1) / max(n - 2, 1)
+
+        h = np.arange(1, periods + 1)
+        forecast = values[:, -1:] + drift[:, None] * h
+        variance = sigma2[:, None] * h * (1 + h / (n - 1))
+        return forecast, self._intervals(forecast, variance, alpha)
+
+
+class HoltEngine(ForecastEngine):
+    """
+    Holt's linear trend exponential smoothing
+
+    Smoothing parameters are picked per series from a fixed grid by one-step
+    squared error, with every series and grid point updated together in
+    each time step. Intervals use the ETS(A,A,N) forecast variance.
+    """
+
+    name = 'holt'
+
+    def __init__(
+        self,
+        alphas: Tuple[float, ...] = (0.1, 0.2, 0.3, 0.5, 0.7, 0.9, 0.99),
+        betas: Tuple[float, ...] = (0.01, 0.05, 0.1, 0.2, 0.4)
+    ):
+        """
+        Initialize the Holt engine
+
+        Args:
+            alphas (Tuple[float]): Level smoothing candidates
+            betas (Tuple[float]): Trend smoothing candidates
+        """
+        grid = np.array([(a, b) for a in alphas for b in betas])
+        self.alpha = grid[:, 0]
+        self.beta = grid[:, 1]
+
+    def forecast_many(self, values: np.ndarray, periods: int, alpha: float = 0.05) -> Tuple[np.ndarray, np.ndarray]:
+        n = values.shape[1]
+        if n <= 3:
+            raise ValueError(f"Need more than 3 observations for Holt, got {n}")
+        a, b = self.alpha[None, :], self.beta[None, :]
+
+        level = np.repeat(values[:, :1], a.shape[1], axis=1)
+        trend = np.repeat(values[:, 1:2] - values[:, :1], a.shape[1], axis=1)
+        sse = np.zeros_like(level)
+
+        for t in range(1, n):
+            y = values[:, t:t + 1]
+            predicted = level + trend
+            error = y - predicted
+            sse += error * error
+            new_level = predicted + a * error
+            trend = b * (new_level - level) + (1 - b) * trend
+            level = new_level
+
+        best = sse.argmin(axis=1)
+        rows = np.arange(values.shape[0])
+        level, trend, sse = level[rows, best], trend[rows, best], sse[rows, best]
+        a, b = self.alpha[best][:, None], self.beta[best][:, None]
+        sigma2 = sse / max(n - 3, 1)
+
+        h = np.arange(1, periods + 1)
+        forecast = level[:, None] + trend[:, None] * h
+        # In error-correction form the trend gain is alpha * beta
+        ab = a * b
+        variance = sigma2[:, None] * (1 + (h - 1) * (a ** 2 + a * ab * h + ab ** 2 * h * (2 * h - 1) / 6))
+        return forecast, self._intervals(forecast, variance, alpha)
+
+
+class LeastSquaresARIMAEngine(ForecastEngine):
+    """
+    Fixed-order ARIMA(p, 1, 0) with intercept, fitted by least squares
+
+    The autoregression on first differences is solved for all series with
+    one batched set of normal equations instead of a likelihood search.
+    """
+
+    name = 'arima_ls'
+
+    def __init__(self, p: int = 2):
+        """
+        Initialize the least squares ARIMA engine
+
+        Args:
+            p (int): Autoregressive order on first differences
+        """
+        self.p = p
+
+    def forecast_many(self, values: np.ndarray, periods: int, alpha: float = 0.05) -> Tuple[np.ndarray, np.ndarray]:
+        p = self.p
+        diffs = np.diff(values, axis=1)
+        rows = diffs.shape[1] - p
+        if rows <= p + 1:
+            raise ValueError(f"Need more than {2 * p + 2} observations for ARIMA({p},1,0)")
+
+        design = np.ones((values.shape[0], rows, p + 1))
+        for k in range(p):
+            design[:, :, k + 1] = diffs[:, p - 1 - k:p - 1 - k + rows]
+        target = diffs[:, p:]
+
+        gram = np.einsum('nti,ntj->nij', design, design)
+        moment = np.einsum('nti,nt->ni', design, target)
+        coef = np.linalg.solve(gram, moment[..., None])[..., 0]
+        residuals = target - np.einsum('nti,ni->nt', design, coef)
+        sigma2 = (residuals ** 2).sum(axis=1) / (rows - p - 1)
+
+        intercept, phi = coef[:, 0], coef[:, 1:]
+        recent = diffs[:, -p:][:, ::-1].copy() if p else np.zeros((values.shape[0], 0))
+        steps = np.empty((values.shape[0], periods))
+        for h in range(periods):
+            steps[:, h] = intercept + (phi * recent).sum(axis=1)
+            recent = np.concatenate([steps[:, h:h + 1], recent[:, :-1]], axis=1) if p else recent
+        forecast = values[:, -1:] + np.cumsum(steps, axis=1)
+
+        # MA(infinity) weights of the differences, summed for the level
+        psi = np.zeros((values.shape[0], periods))
+        psi[:, 0] = 1.0
+        for j in range(1, periods):
+            for k in range(1, min(p, j) + 1):
+                psi[:, j] += phi[:, k - 1] * psi[:, j - k]
+        variance = sigma2[:, None] * np.cumsum(np.cumsum(psi, axis=1) ** 2, axis=1)
+        return forecast, self._intervals(forecast, variance, alpha)
+
+
+ENGINES: Dict[str, ForecastEngine] = {
+    engine.name: engine for engine in (DriftEngine(), HoltEngine(), LeastSquaresARIMAEngine())
+}
+
+ENGINE_NAMES = (AUTO_ARIMA,) + tuple(ENGINES)
+
+
+def get_engine(name: str) -> ForecastEngine:
+    """
+    Look up a closed-form forecasting engine
+
+    Args:
+        name (str): Engine name, one of ENGINES
+
+    Returns:
+        ForecastEngine: The shared engine instance
+    """
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown forecasting engine: {name}, expected one of {list(ENGINE_NAMES)}")
+
+
+class ClosedFormModel:
+    """Fitted closed-form forecaster with the predict() interface of pmdarima models"""
+
+    __slots__ = ('engine', 'values')
+
+    def __init__(self, engine: ForecastEngine, values: np.ndarray):
+        self.engine = engine
+        self.values = values
+
+    def predict(self, n_periods: int = 10, return_conf_int: bool = False, alpha: float = 0.05):
+        forecast, conf_int = self.engine.forecast_many(self.values[None, :], n_periods, alpha)
+        if return_conf_int:
+            return forecast[0], conf_int[0]
+        return forecast[0]
+
+    def __repr__(self) -> str:
+        return f"ClosedFormModel(engine={self.engine.name!r}, observations={len(self.values)})"
+
+
+def forecast_many(
+    series: Mapping[str, pd.Series],
+    engine: str,
+    periods: int = 7,
+    alpha: float = 0.05
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Forecast many price series with one vectorized call per series length
+
+    Args:
+        series (Mapping[str, pd.Series]): Price series by ticker
+        engine (str): Closed-form engine name
+        periods (int): Number of periods to forecast
+        alpha (float): Prediction intervals cover 1 - alpha
+
+    Returns:
+        Dict of ticker to (forecast, confidence interval) arrays
+    """
+    forecaster = get_engine(engine)
+    by_length: Dict[int, list] = {}
+    for ticker, values in series.items():
+        by_length.setdefault(len(values), []).append(ticker)
+
+    results = {}
+    for tickers in by_length.values():
+        block = np.stack([series[ticker].to_numpy(dtype=np.float64) for ticker in tickers])
+        forecast, conf_int = forecaster.forecast_many(block, periods, alpha)
+        for i, ticker in enumerate(tickers):
+            results[ticker] = (forecast[i], conf_int[i])
+    return results
@@ -0,0 +1,226 @@
+import math
+import numbers
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Union
+
+from src.core.feature_engine import ALL_FEATURES
+
+RSI_SIMPLE = 'simple'
+RSI_WILDER = 'wilder'
+
+_NAN = float('nan')
+
+
+class _Window:
+    """
+    Fixed-size ring buffer with running sum and sum of squares
+
+    Values are stored relative to a shift close to the window mean so the
+    variance does not suffer from cancellation, and the sums are rebuilt
+    from the buffer each time it wraps so rounding errors do not build up.
+    Both keep the amortized cost of push() O(1).
+    """
+
+    __slots__ = ('_values', '_size', '_pos', '_count', '_shift', '_sum', '_sq')
+
+    def __init__(self, size: int):
+        self._values = [0.0] * size
+        self._size = size
+        self._pos = 0
+        self._count = 0
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sq = 0.0
+
+    @property
+    def full(self) -> bool:
+        return self._count == self._size
+
+    def push(self, value: float) -> None:
+        if self._count == 0:
+            self._shift = value
+        x = value - self._shift
+
+        if self._count == self._size:
+            old = self._values[self._pos]
+            self._sum -= old
+            self._sq -= old * old
+        else:
+            self._count += 1
+
+        self._values[self._pos] = x
+        self._sum += x
+        self._sq += x * x
+        self._pos = (self._pos + 1) % self._size
+
+        if self._pos == 0:
+            self._recenter()
+
+    def mean(self) -> float:
+        return self._sum / self._size + self._shift if self.full else _NAN
+
+    def std(self) -> float:
+        if not self.full:
+            return _NAN
+        var = (self._sq - self._sum * self._sum / self._size) / (self._size - 1)
+        return math.sqrt(var) if var > 0 else 0.0
+
+    def _recenter(self) -> None:
+        offset = math.fsum(self._values[:self._count]) / self._count
+        self._shift += offset
+        self._values = [v - offset for v in self._values]
+        self._sum = math.fsum(self._values[:self._count])
+        self._sq = math.fsum(v * v for v in self._values[:self._count])
+
+
+class IncrementalIndicators:
+    """
+    Streaming indicator state for one ticker
+
+    Keeps the windows behind engineer_financial_features and the ingestion
+    preprocessing so each new bar costs O(1) instead of a recompute over the
+    whole history. Values match the batch pandas path:
+
+      - RSI 'simple' is the rolling mean of gains and losses
+        (engineer_financial_features)
+      - RSI 'wilder' is gains.ewm(alpha=1 / period, adjust=False,
+        min_periods=period).mean() over the same gains and losses
+
+    Missing closes are skipped, as the batch path drops them first.
+    """
+
+    __slots__ = (
+        '_rsi_method', '_rsi_period', '_prev', '_bars',
+        '_close_20', '_close_50', '_returns_20', '_gain', '_loss', '_last'
+    )
+
+    def __init__(self, rsi_method: str = RSI_SIMPLE, rsi_period: int = 14):
+        """
+        Initialize an empty indicator state
+
+        Args:
+            rsi_method (str): 'simple' for rolling means or 'wilder' for Wilder smoothing
+            rsi_period (int): RSI lookback in bars
+        """
+        if rsi_method not in (RSI_SIMPLE, RSI_WILDER):
+            raise ValueError(f"Unknown RSI method: {rsi_method}")
+
+        self._rsi_method = rsi_method
+        self._rsi_period = rsi_period
+        self._prev = _NAN
+        self._bars = 0
+        self._close_20 = _Window(20)
+        self._close_50 = _Window(50)
+        self._returns_20 = _Window(20)
+        if rsi_method == RSI_SIMPLE:
+            self._gain = _Window(rsi_period)
+            self._loss = _Window(rsi_period)
+        else:
+            self._gain = 0.0
+            self._loss = 0.0
+        self._last = dict.fromkeys(('Close',) + ALL_FEATURES, _NAN)
+
+    @classmethod
+    def from_frame(cls, data: Union[pd.DataFrame, pd.Series], **kwargs) -> 'IncrementalIndicators':
+        """
+        Build an indicator state seeded with a price history
+
+        Args:
+            data (pd.DataFrame | pd.Series): History with a Close column, or a close series
+            **kwargs: Passed to the constructor
+
+        Returns:
+            IncrementalIndicators: State positioned after the last bar
+        """
+        return cls(**kwargs).seed(data)
+
+    def seed(self, data: Union[pd.DataFrame, pd.Series]) -> 'IncrementalIndicators':
+        """
+        Feed a price history bar by bar
+
+        Args:
+            data (pd.DataFrame | pd.Series): History with a Close column, or a close series
+
+        Returns:
+            IncrementalIndicators: self
+        """
+        close = data['Close'] if isinstance(data, pd.DataFrame) else data
+        for value in close.to_numpy(dtype=np.float64).tolist():
+            self.update(value)
+        return self
+
+    def update(self, bar: Union[float, Dict[str, Any], pd.Series]) -> Dict[str, float]:
+        """
+        Advance the indicators by one bar
+
+        Args:
+            bar (float | dict | pd.Series): Close price, or a bar with a 'Close' field
+
+        Returns:
+            Dict of Close and every feature in ALL_FEATURES, NaN while warming up
+        """
+        close = float(bar if isinstance(bar, numbers.Real) else bar['Close'])
+        if math.isnan(close):
+            return self.values()
+
+        prev, self._prev = self._prev, close
+        self._bars += 1
+        self._close_20.push(close)
+        self._close_50.push(close)
+
+        delta = close - prev if self._bars > 1 else _NAN
+        returns = delta / prev if self._bars > 1 else _NAN
+        if self._bars > 1:
+            self._returns_20.push(returns)
+
+        # The batch path counts the first bar as a zero gain and zero loss
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        rsi = self._update_rsi(gain, loss)
+
+        ma_20 = self._close_20.mean()
+        last = self._last
+        last['Close'] = close
+        last['Returns'] = returns
+        last['MA_20'] = last['Rolling_Mean'] = ma_20
+        last['MA_50'] = self._close_50.mean()
+        last['Returns_Volatility'] = self._returns_20.std()
+        last['Rolling_Std'] = self._close_20.std()
+        last['RSI'] = rsi
+        return dict(last)
+
+    def values(self) -> Dict[str, float]:
+        """
+        Latest indicator values
+
+        Returns:
+            Dict of Close and every feature in ALL_FEATURES
+        """
+        return dict(self._last)
+
+    @property
+    def ready(self) -> bool:
+        """Whether every indicator is defined, i.e. the batch path would keep the row"""
+        return not any(math.isnan(value) for value in self._last.values())
+
+    def _update_rsi(self, gain: float, loss: float) -> float:
+        if self._rsi_method == RSI_SIMPLE:
+            self._gain.push(gain)
+            self._loss.push(loss)
+            avg_gain, avg_loss = self._gain.mean(), self._loss.mean()
+        else:
+            if self._bars == 1:
+                self._gain, self._loss = gain, loss
+            else:
+                self._gain += (gain - self._gain) / self._rsi_period
+                self._loss += (loss - self._loss) / self._rsi_period
+            if self._bars < self._rsi_period:
+                return _NAN
+            avg_gain, avg_loss = self._gain, self._loss
+
+        if math.isnan(avg_gain):
+            return _NAN
+        if avg_loss == 0:
+            return 100.0 if avg_gain > 0 else _NAN
+        return 100 - (100 / (1 + avg_gain / avg_loss))
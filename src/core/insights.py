@@ -1,53 +1,205 @@
-from langchain_groq import ChatGroq
+import asyncio
+import os
+from contextlib import aclosing
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, Optional
+from src.core.executors import get_io_executor
+from src.core.llm_cache import LLMCache, get_llm_cache
 
 class MarketInsightsService:
-    def __init__(self, model: str = "llama3-8b-8192", temperature: float = 0.3):
+    def __init__(
+        self,
+        model: str = "llama3-8b-8192",
+        temperature: float = 0.3,
+        llm: Optional[Any] = None,
+        cache: Optional[LLMCache] = None,
+        compact: bool = True
+    ):
         """
         Initialize Market Insights Service with LLM
-        
+
         Args:
             model (str): LLM model to use
             temperature (float): Creativity/randomness of responses
+            llm (Any): Pre-built chat model, e.g. FakeLLM for offline runs
+            cache (LLMCache): Response cache, the shared cache by default
+            compact (bool): Serialize recent data with compact_frame instead of to_string
         """
-        self.llm = ChatGroq(
-            model=model,
-            temperature=temperature,
-            max_tokens=None
-        )
-    
+        if llm is None and os.getenv('INSIGHTS_LLM') == 'fake':
+            from src.utils.fake_llm import FakeLLM
+            llm = FakeLLM()
+
+        if llm is None:
+            # Imported here since langchain_groq alone takes most of a second to load
+            from langchain_groq import ChatGroq
+            llm = ChatGroq(
+                model=model,
+                temperature=temperature,
+                max_tokens=None
+            )
+
+        self.llm = llm
+        self.model = getattr(self.llm, 'model_name', model)
+        self.temperature = temperature
+        self.cache = cache if cache is not None else get_llm_cache()
+        self.compact = compact
+
     def generate_insights(self, recent_data: pd.DataFrame, predictions: list) -> Dict[str, str]:
         """
         Generate market insights using LLM
-        
+
+        Args:
+            recent_data (pd.DataFrame): Recent stock performance data
+            predictions (list): Price predictions
+
+        Returns:
+            Dict with market insights
+        """
+        try:
+            prompt = self._build_prompt(recent_data, predictions)
+            key = self._cache_key(prompt)
+
+            content = self.cache.get(key) if key else None
+            if content is None:
+                content = self.llm.invoke(prompt).content
+                if key:
+                    self.cache.put(key, content)
+
+            return {
+                'market_insights': content
+            }
+        except Exception as e:
+            raise ValueError(f"Market insights generation error: {str(e)}")
+
+    async def agenerate_insights(self, recent_data: pd.DataFrame, predictions: list) -> Dict[str, str]:
+        """
+        Generate market insights through the LLM's async client
+
         Args:
             recent_data (pd.DataFrame): Recent stock performance data
             predictions (list): Price predictions
-        
+
         Returns:
             Dict with market insights
         """
         try:
-            prompt = f"""
+            loop = asyncio.get_running_loop()
+            prompt = self._build_prompt(recent_data, predictions)
+            key = self._cache_key(prompt)
+
+            content = await loop.run_in_executor(get_io_executor(), self.cache.get, key) if key else None
+            if content is None:
+                content = (await self.llm.ainvoke(prompt)).content
+                if key:
+                    await loop.run_in_executor(get_io_executor(), self.cache.put, key, content)
+
+            return {
+                'market_insights': content
+            }
+        except Exception as e:
+            raise ValueError(f"Market insights generation error: {str(e)}")
+
+    async def astream_insights(self, recent_data: pd.DataFrame, predictions: list) -> AsyncIterator[str]:
+        """
+        Stream market insights token by token through the LLM's astream
+
+        A cached response is yielded as a single chunk. A streamed response is
+        only cached once it has completed, so an abandoned stream (the
+        consumer closing the generator) leaves no partial entry behind.
+
+        Args:
+            recent_data (pd.DataFrame): Recent stock performance data
+            predictions (list): Price predictions
+
+        Yields:
+            str: Pieces of the insight text
+        """
+        try:
+            loop = asyncio.get_running_loop()
+            prompt = self._build_prompt(recent_data, predictions)
+            key = self._cache_key(prompt)
+
+            content = await loop.run_in_executor(get_io_executor(), self.cache.get, key) if key else None
+            if content is not None:
+                yield content
+                return
+
+            chunks = []
+            # aclosing stops the upstream LLM stream as soon as our consumer goes away
+            async with aclosing(self.llm.astream(prompt)) as stream:
+                async for chunk in stream:
+                    if chunk.content:
+                        chunks.append(chunk.content)
+                        yield chunk.content
+
+            if key:
+                await loop.run_in_executor(get_io_executor(), self.cache.put, key, ''.join(chunks))
+        except (GeneratorExit, asyncio.CancelledError):
+            raise
+        except Exception as e:
+            raise ValueError(f"Market insights generation error: {str(e)}")
+
+    def _cache_key(self, prompt: str) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return LLMCache.make_key(self.model, self.temperature, prompt)
+
+    def _build_prompt(self, recent_data: pd.DataFrame, predictions: list) -> str:
+        if self.compact:
+            recent_data_text = compact_frame(recent_data)
+            predictions = [round(float(p), 2) for p in predictions]
+        else:
+            recent_data_text = recent_data.to_string()
+
+        return f"""
             Analyze the following financial data:
             Recent Stock Performance:
-            {recent_data.to_string()}
-            
+            {recent_data_text}
+
             Price Predictions for Next Week:
             {predictions}
-            
+
             Provide a comprehensive market insight including:
             1. Current market trend
             2. Potential investment risks
             3. Short-term price movement prediction
             4. Recommendation for investors
             """
-            
-            response = self.llm.invoke(prompt)
-            
-            return {
-                'market_insights': response.content
-            }
-        except Exception as e:
-            raise ValueError(f"Market insights generation error: {str(e)}")
\ No newline at end of file
+
+
+def compact_frame(data: pd.DataFrame, decimals: int = 2) -> str:
+    """
+    Serialize a price frame as compact CSV for LLM prompts
+
+    Drops columns that repeat information (Adj Close equal to Close,
+    Rolling_Mean when MA_20 is present, *_normalized copies), rounds
+    prices to `decimals` places and small-valued columns such as returns
+    to four significant digits, and prints dates without a time part.
+
+    Args:
+        data (pd.DataFrame): Recent stock performance data
+        decimals (int): Decimal places for price-scale columns
+
+    Returns:
+        str: CSV text with a header row
+    """
+    drop = [col for col in data.columns if str(col).endswith('_normalized')]
+    if 'Adj Close' in data.columns and 'Close' in data.columns and np.allclose(data['Adj Close'], data['Close']):
+        drop.append('Adj Close')
+    if 'Rolling_Mean' in data.columns and 'MA_20' in data.columns:
+        drop.append('Rolling_Mean')
+
+    frame = data.drop(columns=drop)
+    columns = {}
+    for col in frame.columns:
+        values = frame[col]
+        if col == 'Volume':
+            columns[col] = values.round().astype('int64').astype(str)
+        elif values.abs().max() < 1:
+            columns[col] = values.map(lambda v: f"{v:.4g}")
+        else:
+            columns[col] = values.map(lambda v: f"{v:.{decimals}f}")
+
+    index = frame.index.strftime('%Y-%m-%d') if isinstance(frame.index, pd.DatetimeIndex) else frame.index
+    return pd.DataFrame(columns, index=index).to_csv(index_label='Date').strip()
@@ -0,0 +1,208 @@
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.core.result_store import ResultStore
+from src.models.financial_analysis_state import FinancialAnalysisState
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the job queue has reached its depth limit"""
+
+
+class Job:
+    __slots__ = (
+        'job_id', 'key', 'ticker', 'start_date', 'end_date', 'options', 'status',
+        'result', 'error', 'created_at', 'started_at', 'finished_at', '_changed'
+    )
+
+    def __init__(self, ticker: str, start_date: str, end_date: str, options: Optional[Dict[str, Any]] = None):
+        self.job_id = uuid.uuid4().hex
+        self.options = options or {}
+        self.key = (ticker, start_date, end_date, tuple(sorted(self.options.items())))
+        self.ticker = ticker
+        self.start_date = start_date
+        self.end_date = end_date
+        self.status = QUEUED
+        self.result: Optional[FinancialAnalysisState] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    async def wait_for_change(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until the job status changes or the timeout elapses
+
+        Args:
+            timeout (float): Seconds to wait, forever if None
+        """
+        if self.done:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._changed.wait()), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _set_status(self, status: str) -> None:
+        self.status = status
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'ticker': self.ticker,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'options': self.options,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class JobManager:
+    """
+    Bounded in-process job queue for long-running analyses
+
+    A fixed number of asyncio workers consume a queue with a depth limit;
+    submissions beyond the limit raise QueueFullError so callers can apply
+    backpressure. Submitting a request identical to one that is still
+    queued or running returns the existing job instead of a new one.
+    Finished jobs are kept in a ResultStore until their TTL expires.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[..., Awaitable[FinancialAnalysisState]],
+        workers: int = 2,
+        max_queue: int = 32,
+        result_ttl: float = 3600,
+        max_results: int = 1024
+    ):
+        """
+        Initialize the job manager
+
+        Args:
+            runner (Callable): Coroutine function running one analysis and returning its FinancialAnalysisState
+            workers (int): Number of jobs processed concurrently
+            max_queue (int): Maximum number of jobs waiting to run
+            result_ttl (float): Seconds finished jobs are kept
+            max_results (int): Maximum number of finished jobs kept
+        """
+        self.runner = runner
+        self.workers = workers
+        self.max_queue = max_queue
+        self.results = ResultStore(ttl=result_ttl, max_entries=max_results)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks = []
+        self._active: Dict[str, Job] = {}
+        self._inflight: Dict[Tuple, Job] = {}
+
+    def submit(self, ticker: str, start_date: str, end_date: str, **options: Any) -> Tuple[Job, bool]:
+        """
+        Queue an analysis, coalescing with an identical in-flight job
+
+        Must be called from the event loop the workers run on.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            start_date (str): Analysis start date
+            end_date (str): Analysis end date
+            **options: Extra keyword arguments for the runner, part of the job identity
+
+        Returns:
+            Tuple of the job and whether it was newly created
+        """
+        self._ensure_workers()
+
+        job = Job(ticker, start_date, end_date, options)
+        existing = self._inflight.get(job.key)
+        if existing is not None:
+            return existing, False
+
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Job queue is full ({self.max_queue} pending)")
+
+        self._active[job.job_id] = job
+        self._inflight[job.key] = job
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a queued, running or finished job
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            The job, or None if unknown or expired
+        """
+        return self._active.get(job_id) or self.results.get(job_id)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def stop(self) -> None:
+        """Cancel the workers, queued jobs are dropped"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._loop = None
+        self._active.clear()
+        self._inflight.clear()
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._tasks and self._loop is loop:
+            return
+
+        # Workers are bound to the loop they were started on; a new loop
+        # (e.g. after a server restart in-process) gets a fresh pool
+        self._loop = loop
+        self._active.clear()
+        self._inflight.clear()
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            job.started_at = time.time()
+            job._set_status(RUNNING)
+            try:
+                job.result = await self.runner(job.ticker, job.start_date, job.end_date, **job.options)
+                status = SUCCEEDED
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.error = str(e)
+                status = FAILED
+            finally:
+                self._queue.task_done()
+
+            job.finished_at = time.time()
+            self.results.put(job.job_id, job)
+            self._active.pop(job.job_id, None)
+            self._inflight.pop(job.key, None)
+            job._set_status(status)
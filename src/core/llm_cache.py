@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+DEFAULT_CACHE_PATH = os.path.join('.cache', 'llm_cache.sqlite')
+
+
+class LLMCache:
+    """
+    Content-addressed SQLite cache of LLM responses
+
+    Entries are keyed on the model, the temperature and a whitespace
+    normalized prompt. Expired entries are dropped on access and on insert,
+    and the least recently read entries are evicted past `max_entries`.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = 24 * 3600, max_entries: int = 10000):
+        """
+        Initialize the LLM cache
+
+        Args:
+            path (str): SQLite database file, ':memory:' for a private in-memory cache
+            ttl (float): Seconds a response stays valid
+            max_entries (int): Maximum number of cached responses
+        """
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, temperature: float, prompt: str) -> str:
+        """
+        Cache key for a prompt sent to a model
+
+        Args:
+            model (str): LLM model name
+            temperature (float): Sampling temperature
+            prompt (str): Prompt text
+
+        Returns:
+            str: SHA-256 hex digest
+        """
+        normalized = '\n'.join(
+            re.sub(r'\s+', ' ', line).strip() for line in prompt.splitlines() if line.strip()
+        )
+        payload = json.dumps([model, round(float(temperature), 4), normalized])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return a cached response unless it has expired
+
+        Args:
+            key (str): Key from make_key
+
+        Returns:
+            The response text, or None
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response FROM responses WHERE key = ? AND created_at > ?', (key, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        """
+        Store a response and apply TTL and size eviction
+
+        Args:
+            key (str): Key from make_key
+            response (str): Response text
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, response, now, now)
+            )
+            self._conn.execute('DELETE FROM responses WHERE created_at <= ?', (now - self.ttl,))
+            self._conn.execute(
+                'DELETE FROM responses WHERE key IN ('
+                'SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Hit/miss counters and current size
+
+        Returns:
+            Dict of hits, misses, entries and hit ratio
+        """
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': entries,
+            'hit_ratio': self.hits / total if total else 0.0,
+        }
+
+
+_default_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """
+    Shared process-wide LLM cache
+
+    The database location can be overridden with the LLM_CACHE_PATH
+    environment variable (an empty value disables caching) and the
+    lifetime with LLM_CACHE_TTL (seconds).
+
+    Returns:
+        LLMCache: Lazily created default cache, or None when disabled
+    """
+    global _default_cache
+    path = os.getenv('LLM_CACHE_PATH', DEFAULT_CACHE_PATH)
+    if not path:
+        return None
+    if _default_cache is None:
+        _default_cache = LLMCache(path, ttl=float(os.getenv('LLM_CACHE_TTL', 24 * 3600)))
+    return _default_cache
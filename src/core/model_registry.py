@@ -0,0 +1,307 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class _RegistryEntry:
+    __slots__ = ('ticker', 'fingerprint', 'length', 'model', 'size')
+
+    def __init__(self, ticker: str, fingerprint: str, length: int, model: Any, size: int):
+        self.ticker = ticker
+        self.fingerprint = fingerprint
+        self.length = length
+        self.model = model
+        self.size = size
+
+
+class ModelRegistry:
+    """
+    LRU registry of fitted ARIMA models keyed by ticker and data fingerprint
+
+    A lookup resolves in one of four ways:
+      - hit: the exact same series was fitted before, the model is reused as is
+      - update: a stored series is a prefix of the new one with at most
+        `max_update_bars` new observations, the model is updated in place
+      - refit: a stored series is a prefix but too many bars arrived, the
+        stored order is refitted from the stored parameters without a search
+      - miss: nothing usable is stored, the caller runs the full search
+
+    Updates and refits are statsmodels fits. lookup() runs them inline;
+    callers that keep fits off their threads split it into find(), which
+    only reads the registry, extend_model() in a worker process, and
+    put_extended().
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        max_bytes: int = 256 * 1024 * 1024,
+        persist_dir: Optional[str] = None,
+        max_update_bars: int = 5
+    ):
+        """
+        Initialize the model registry
+
+        Args:
+            max_entries (int): Maximum number of models held in memory
+            max_bytes (int): Maximum pickled size of all models held in memory
+            persist_dir (str): Optional directory to persist fitted models to
+            max_update_bars (int): Largest number of new bars handled by update()
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.persist_dir = persist_dir
+        self.max_update_bars = max_update_bars
+
+        self._entries: 'OrderedDict[Tuple[str, str], _RegistryEntry]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'updates': 0, 'refits': 0, 'evictions': 0}
+
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(data: pd.Series) -> str:
+        """
+        Content hash of a price series including its date index
+
+        Args:
+            data (pd.Series): Historical price data
+
+        Returns:
+            str: Hex digest identifying the series
+        """
+        digest = hashlib.sha1(np.ascontiguousarray(data.to_numpy(dtype=np.float64)).tobytes())
+        if isinstance(data.index, pd.DatetimeIndex):
+            digest.update(np.ascontiguousarray(data.index.asi8).tobytes())
+        return digest.hexdigest()
+
+    def get_or_fit(self, ticker: str, data: pd.Series, fit_fn: Callable[[pd.Series], Any]) -> Tuple[Any, str]:
+        """
+        Return a model fitted on `data`, searching only on a miss
+
+        Args:
+            ticker (str): Stock ticker symbol
+            data (pd.Series): Historical price data
+            fit_fn (Callable): Full model search used on a miss
+
+        Returns:
+            Tuple of the fitted model and the lookup status
+        """
+        model, status = self.lookup(ticker, data)
+        if model is None:
+            model = fit_fn(data)
+            self.put(ticker, data, model)
+        return model, status
+
+    def lookup(self, ticker: str, data: pd.Series) -> Tuple[Optional[Any], str]:
+        """
+        Resolve a model for `data` without running an order search
+
+        Args:
+            ticker (str): Stock ticker symbol
+            data (pd.Series): Historical price data
+
+        Returns:
+            Tuple of the model (None on a miss) and the lookup status
+        """
+        model, status, base = self.find(ticker, data)
+        if base is not None:
+            model = extend_model(base.model, data, base.length, status)
+            self.put_extended(ticker, data, model, status, base)
+        return model, status
+
+    def find(self, ticker: str, data: pd.Series) -> Tuple[Optional[Any], str, Optional[_RegistryEntry]]:
+        """
+        Resolve what lookup() would do without fitting anything
+
+        Args:
+            ticker (str): Stock ticker symbol
+            data (pd.Series): Historical price data
+
+        Returns:
+            Tuple of the model (None unless a hit), the lookup status, and for
+            'update' and 'refit' the stored entry to pass to extend_model()
+            and put_extended()
+        """
+        fp = self.fingerprint(data)
+
+        with self._lock:
+            entry = self._entries.get((ticker, fp))
+            if entry is not None:
+                self._entries.move_to_end((ticker, fp))
+                self._counters['hits'] += 1
+                return entry.model, 'hit', None
+
+            base = self._find_prefix(ticker, data)
+
+        if base is None:
+            model = self._load(ticker, fp, len(data))
+            with self._lock:
+                self._counters['hits' if model is not None else 'misses'] += 1
+            if model is not None:
+                self.put(ticker, data, model)
+                return model, 'hit', None
+            return None, 'miss', None
+
+        status = 'update' if len(data) - base.length <= self.max_update_bars else 'refit'
+        return None, status, base
+
+    def put_extended(self, ticker: str, data: pd.Series, model: Any, status: str, base: _RegistryEntry) -> None:
+        """
+        Store a model extend_model() brought up to date, replacing the entry it started from
+
+        Args:
+            ticker (str): Stock ticker symbol
+            data (pd.Series): Series the model now covers
+            model (Any): Updated or refitted model
+            status (str): 'update' or 'refit', as returned by find()
+            base (_RegistryEntry): Entry returned by find()
+        """
+        with self._lock:
+            self._counters[status + 's'] += 1
+        self.put(ticker, data, model, replaces=base)
+        self._discard_persisted(base)
+
+    def put(self, ticker: str, data: pd.Series, model: Any, replaces: Optional[_RegistryEntry] = None) -> None:
+        """
+        Store a model fitted on `data`
+
+        Args:
+            ticker (str): Stock ticker symbol
+            data (pd.Series): Series the model was fitted on
+            model (Any): Fitted model
+            replaces (_RegistryEntry): Entry superseded by this model, swapped out in the same step
+        """
+        fp = self.fingerprint(data)
+        payload = pickle.dumps(model)
+        entry = _RegistryEntry(ticker, fp, len(data), model, len(payload))
+
+        with self._lock:
+            if replaces is not None and self._entries.get((replaces.ticker, replaces.fingerprint)) is replaces:
+                self._remove(replaces)
+            if (ticker, fp) in self._entries:
+                self._remove(self._entries[(ticker, fp)])
+            self._entries[(ticker, fp)] = entry
+            self._bytes += entry.size
+            self._evict()
+
+        if self.persist_dir:
+            path = self._path(ticker, fp, len(data))
+            if not os.path.exists(path):
+                tmp = path + '.tmp'
+                with open(tmp, 'wb') as f:
+                    f.write(payload)
+                os.replace(tmp, path)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Lookup counters and current memory usage
+
+        Returns:
+            Dict of hit/miss/update/refit/eviction counters, entries and bytes
+        """
+        with self._lock:
+            return {**self._counters, 'entries': len(self._entries), 'bytes': self._bytes}
+
+    def clear(self) -> None:
+        """Drop all in-memory models and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._counters = dict.fromkeys(self._counters, 0)
+
+    def _find_prefix(self, ticker: str, data: pd.Series) -> Optional[_RegistryEntry]:
+        """Most recently used entry whose series is a strict prefix of `data`"""
+        for entry in reversed(self._entries.values()):
+            if entry.ticker == ticker and entry.length < len(data):
+                if self.fingerprint(data.iloc[:entry.length]) == entry.fingerprint:
+                    return entry
+        return None
+
+    def _remove(self, entry: _RegistryEntry) -> None:
+        del self._entries[(entry.ticker, entry.fingerprint)]
+        self._bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self._counters['evictions'] += 1
+
+    def _path(self, ticker: str, fp: str, length: int) -> str:
+        return os.path.join(self.persist_dir, f"{ticker.upper()}-{length}-{fp}.pkl")
+
+    def _load(self, ticker: str, fp: str, length: int) -> Optional[Any]:
+        if not self.persist_dir:
+            return None
+        path = self._path(ticker, fp, length)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def _discard_persisted(self, entry: _RegistryEntry) -> None:
+        if self.persist_dir:
+            path = self._path(entry.ticker, entry.fingerprint, entry.length)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def extend_model(model: Any, data: pd.Series, fitted_length: int, status: str) -> Any:
+    """
+    Bring a model fitted on the first `fitted_length` bars of `data` up to date
+
+    A module-level function so it can run in a worker process.
+
+    Args:
+        model (Any): Stored pmdarima model
+        data (pd.Series): Full series the model should now cover
+        fitted_length (int): Number of bars the model was fitted on
+        status (str): 'update' absorbs the new bars, 'refit' refits the
+            stored order from the stored parameters
+
+    Returns:
+        New model; `model` itself is left untouched
+    """
+    if status == 'update':
+        # Earlier hits may still be predicting with the stored instance,
+        # so the new bars go into a private copy that then replaces it
+        updated = pickle.loads(pickle.dumps(model))
+        updated.update(data.iloc[fitted_length:])
+        return updated
+
+    import pmdarima as pm
+
+    refitted = pm.ARIMA(
+        order=model.order,
+        seasonal_order=model.seasonal_order,
+        with_intercept=model.with_intercept,
+        start_params=model.params(),
+        suppress_warnings=True
+    )
+    return refitted.fit(data)
+
+
+_default_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """
+    Shared process-wide model registry
+
+    Models are persisted when the MODEL_REGISTRY_DIR environment variable is set.
+
+    Returns:
+        ModelRegistry: Lazily created default registry
+    """
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ModelRegistry(persist_dir=os.getenv('MODEL_REGISTRY_DIR') or None)
+    return _default_registry
@@ -0,0 +1,147 @@
+"""
+Data-driven bounds for the Auto ARIMA order search
+
+Daily closes rarely have the fixed monthly period the search used to assume,
+and fitting seasonal candidates is what makes it slow. plan_search() runs
+cheap tests first: unit-root tests fix the differencing order, the
+autocorrelation at candidate periods confirmed by a periodogram peak decides
+whether a seasonal model is worth trying at all, and the significant
+ACF/PACF lags of the differenced series bound p and q.
+"""
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+# Trading-day periods worth a seasonal term: week, two weeks, month
+CANDIDATE_PERIODS = (5, 10, 21)
+
+# Upper bound on p and q whatever the correlograms show
+MAX_ORDER = 5
+
+# Parallel candidate fits per search; with one job the search stays stepwise
+SEARCH_JOBS = int(os.getenv('ARIMA_SEARCH_JOBS', 1))
+
+
+@dataclass(frozen=True, slots=True)
+class SearchSpace:
+    """Pruned candidate space for one series"""
+    d: int
+    max_p: int
+    max_q: int
+    m: int = 1
+    D: int = 0
+
+    @property
+    def seasonal(self) -> bool:
+        return self.m > 1
+
+    def auto_arima_kwargs(self, n_jobs: int = 1) -> Dict[str, Any]:
+        """
+        Arguments restricting pmdarima.auto_arima to this space
+
+        Args:
+            n_jobs (int): Candidates fitted in parallel; above one the search
+                fits the whole pruned grid instead of stepping through it
+
+        Returns:
+            Dict of keyword arguments
+        """
+        kwargs = {
+            'd': self.d,
+            'start_p': 0,
+            'start_q': 0,
+            'max_p': self.max_p,
+            'max_q': self.max_q,
+            'seasonal': self.seasonal,
+            'stepwise': n_jobs <= 1,
+            'n_jobs': max(1, n_jobs),
+        }
+        if self.seasonal:
+            kwargs.update(m=self.m, D=self.D, max_P=1, max_Q=1)
+        return kwargs
+
+
+def _significant_lags(values: np.ndarray, bound: float) -> int:
+    """Last lag, counting from 1, up to which the correlations stay significant"""
+    outside = np.abs(values[1:]) > bound
+    return int(np.argmin(outside)) if not outside.all() else len(outside)
+
+
+def detect_period(
+    values: np.ndarray,
+    candidates: Sequence[int] = CANDIDATE_PERIODS,
+    z: float = 3.0
+) -> Optional[int]:
+    """
+    Find a seasonal period in a stationary series
+
+    A candidate is accepted when the autocorrelation at its lag is above
+    z standard errors and the periodogram peaks near its frequency.
+
+    Args:
+        values (np.ndarray): Stationary series, e.g. differenced closes
+        candidates (Sequence[int]): Periods to test, shortest first
+        z (float): Significance threshold in standard errors
+
+    Returns:
+        The strongest significant period, or None
+    """
+    from statsmodels.tsa.stattools import acf
+
+    n = len(values)
+    candidates = [m for m in candidates if n >= 4 * m]
+    if not candidates:
+        return None
+
+    correlations = acf(values, nlags=max(candidates), fft=True)
+    centered = values - values.mean()
+    power = np.abs(np.fft.rfft(centered)) ** 2
+    threshold = z / np.sqrt(n)
+
+    best, best_corr = None, threshold
+    for m in candidates:
+        if correlations[m] <= best_corr:
+            continue
+        # The periodogram must peak within one bin of the candidate frequency
+        # (or a harmonic of it, for non-sinusoidal cycles)
+        bins = [int(round(k * n / m)) for k in range(1, m // 2 + 1)]
+        near = [power[max(b - 1, 1):b + 2].max() for b in bins if b < len(power)]
+        if near and max(near) > 3 * np.median(power[1:]):
+            best, best_corr = m, correlations[m]
+    return best
+
+
+def plan_search(data: Any, max_order: int = MAX_ORDER) -> SearchSpace:
+    """
+    Pick the differencing orders, the seasonal period and the p/q bounds for a series
+
+    Args:
+        data: Historical price data, array-like
+        max_order (int): Cap on p and q
+
+    Returns:
+        SearchSpace for auto_arima
+    """
+    from pmdarima.arima import ndiffs, nsdiffs
+    from statsmodels.tsa.stattools import acf, pacf
+
+    values = np.asarray(data, dtype=np.float64)
+    # ADF rather than auto_arima's default KPSS, which often asks for a
+    # second difference of a trending random walk
+    d = ndiffs(values, test='adf', max_d=2)
+    stationary = np.diff(values, n=d) if d else values
+
+    m = detect_period(stationary) or 1
+    D = nsdiffs(stationary, m=m, test='ocsb', max_D=1) if m > 1 else 0
+    if D:
+        stationary = stationary[m:] - stationary[:-m]
+
+    # Keep at least one AR and one MA term so the search can still move
+    bound = 1.96 / np.sqrt(len(stationary))
+    nlags = min(max_order, len(stationary) // 2 - 1)
+    max_p = max(1, min(max_order, _significant_lags(pacf(stationary, nlags=nlags), bound)))
+    max_q = max(1, min(max_order, _significant_lags(acf(stationary, nlags=nlags, fft=True), bound)))
+
+    return SearchSpace(d=int(d), max_p=max_p, max_q=max_q, m=m, D=int(D))
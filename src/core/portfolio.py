@@ -0,0 +1,401 @@
+"""
+Portfolio analytics over a dense matrix of aligned daily returns
+
+Returns of every ticker are laid out as one (dates, tickers) array on the
+dates all of them traded, and the covariance is kept as a RunningCovariance:
+row blocks are merged into its mean and co-moment matrix, so new bars update
+the statistics without a pass over the history. Prices are read in batches
+of tickers and the matrix products run in blocks of rows and columns, which
+bounds temporary memory for baskets of a thousand tickers and more.
+"""
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.core.price_store import PriceStore, get_price_store
+from src.core.result_store import ResultStore
+
+TRADING_DAYS = 252
+DEFAULT_WINDOW = 63
+MAX_TICKERS = 2000
+
+# Baskets up to this size get the full matrices and rolling series by default
+MATRIX_LIMIT = 100
+
+DEFAULT_FETCH_BATCH = 100
+DEFAULT_CHUNK_SIZE = 512
+
+# Memory budget of the running covariances kept for incremental updates
+DEFAULT_STATE_BYTES = 64 * 2**20
+
+
+class RunningCovariance:
+    """
+    Mean and co-moment matrix of a stream of return vectors
+
+    Blocks of rows are merged with the pairwise update of Chan, Golub and
+    LeVeque, so adding k bars to N tickers costs O(k N^2) however long the
+    history already is, and merging blocks gives the same result as one pass
+    over all rows. The co-moment is accumulated in float64 whatever the
+    block type.
+    """
+
+    __slots__ = ('count', 'mean', 'comoment')
+
+    def __init__(self, width: int):
+        self.count = 0
+        self.mean = np.zeros(width, dtype=np.float64)
+        self.comoment = np.zeros((width, width), dtype=np.float64)
+
+    def update(self, rows: np.ndarray) -> 'RunningCovariance':
+        """
+        Merge new return vectors
+
+        Args:
+            rows (np.ndarray): (k, width) block, or one (width,) bar
+
+        Returns:
+            RunningCovariance: self
+        """
+        rows = np.atleast_2d(rows)
+        k = rows.shape[0]
+        if not k:
+            return self
+
+        block_mean = rows.mean(axis=0, dtype=np.float64)
+        centered = rows - block_mean.astype(rows.dtype)
+        total = self.count + k
+        delta = block_mean - self.mean
+
+        self.comoment += centered.T @ centered
+        self.comoment += np.outer(delta, delta) * (self.count * k / total)
+        self.mean += delta * (k / total)
+        self.count = total
+        return self
+
+    def copy(self) -> 'RunningCovariance':
+        other = RunningCovariance(0)
+        other.count = self.count
+        other.mean = self.mean.copy()
+        other.comoment = self.comoment.copy()
+        return other
+
+    def covariance(self, ddof: int = 1) -> np.ndarray:
+        if self.count <= ddof:
+            raise ValueError("Not enough observations for a covariance")
+        return self.comoment / (self.count - ddof)
+
+    def correlation(self) -> np.ndarray:
+        return _normalize(self.comoment, np.sqrt(np.diag(self.comoment)))
+
+
+def _normalize(block: np.ndarray, scale: np.ndarray, rows: slice = slice(None)) -> np.ndarray:
+    """Divide a covariance block by the scales of its rows and columns, constant series give NaN"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return block / np.outer(scale[rows], scale)
+
+
+class PortfolioService:
+    def __init__(
+        self,
+        store: Optional[PriceStore] = None,
+        fetch_batch: int = DEFAULT_FETCH_BATCH,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_states: int = 32,
+        max_state_bytes: int = DEFAULT_STATE_BYTES
+    ):
+        """
+        Initialize the portfolio analytics service
+
+        Args:
+            store (PriceStore): Price store, the shared store by default
+            fetch_batch (int): Tickers read from the store at a time
+            chunk_size (int): Rows or columns per block of the matrix products
+            max_states (int): Baskets whose running covariance is kept for incremental updates
+            max_state_bytes (int): Memory bound of the kept states; a basket whose
+                co-moment matrix needs more than max_state_bytes / max_states is not kept
+        """
+        self.store = store
+        self.fetch_batch = fetch_batch
+        self.chunk_size = chunk_size
+        self.states = ResultStore(ttl=24 * 3600, max_entries=max_states)
+        self.max_state_bytes = max_state_bytes
+        self._lock = threading.Lock()
+
+    def returns_matrix(
+        self,
+        tickers: Sequence[str],
+        start_date: str,
+        end_date: str,
+        dtype: str = 'float64'
+    ) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """
+        Daily returns of many tickers aligned on the dates they all traded
+
+        Returns are the preprocessed 'Returns' column of each ticker (close
+        over previous complete bar, minus one). Tickers are read from the
+        store `fetch_batch` at a time into one preallocated business-day
+        array, so only one batch of price frames is held at once.
+
+        Args:
+            tickers (Sequence[str]): Stock ticker symbols
+            start_date (str): History start date
+            end_date (str): History end date, exclusive
+            dtype (str): 'float64' or 'float32'
+
+        Returns:
+            Tuple of the common dates and the (dates, tickers) returns
+        """
+        store = self.store or get_price_store()
+        calendar = pd.bdate_range(start_date, pd.Timestamp(end_date) - pd.Timedelta(days=1), name='Date')
+        values = np.full((len(calendar), len(tickers)), np.nan, dtype=dtype)
+
+        missing = []
+        for start in range(0, len(tickers), self.fetch_batch):
+            batch = list(tickers[start:start + self.fetch_batch])
+            frames = store.get_many(batch, start_date, end_date)
+            for offset, ticker in enumerate(batch):
+                df = frames[ticker]
+                # Complete bars only, as the preprocessing keeps
+                complete = ~np.isnan(df.to_numpy(dtype=np.float64)).any(axis=1)
+                if np.count_nonzero(complete) < 2:
+                    missing.append(ticker)
+                    continue
+                close = df['Close'].to_numpy(dtype=np.float64)[complete]
+                rows = calendar.get_indexer(df.index[complete][1:])
+                keep = rows >= 0
+                values[rows[keep], start + offset] = close[1:][keep] / close[:-1][keep] - 1
+            del frames
+        if missing:
+            raise ValueError(f"No data found for {missing} in the given date range")
+
+        complete = ~np.isnan(values).any(axis=1)
+        if complete.sum() < 2:
+            raise ValueError("The tickers share fewer than two trading days in the given date range")
+        return calendar[complete], values[complete]
+
+    def analyze(
+        self,
+        tickers: Sequence[str],
+        start_date: str,
+        end_date: str,
+        weights: Optional[Dict[str, float]] = None,
+        benchmark: Optional[str] = None,
+        window: int = DEFAULT_WINDOW,
+        include_matrix: Optional[bool] = None,
+        top_pairs: int = 10,
+        dtype: str = 'float64'
+    ) -> Dict[str, Any]:
+        """
+        Covariance, correlation, volatility, beta and rolling correlation of a basket
+
+        The running covariance of a basket is kept between calls, within
+        max_state_bytes: asking again with a later end_date only merges the
+        bars added since, as long as the earlier dates are unchanged.
+
+        Args:
+            tickers (Sequence[str]): Stock ticker symbols
+            start_date (str): History start date
+            end_date (str): History end date, exclusive
+            weights (Dict[str, float]): Portfolio weights by ticker, normalized
+                to sum to one; equal weights by default
+            benchmark (str): Ticker betas and rolling correlations are measured
+                against, the portfolio itself when None
+            window (int): Rolling correlation window in bars
+            include_matrix (bool): Return the full matrices and the rolling
+                series; by default only for baskets up to MATRIX_LIMIT tickers
+            top_pairs (int): Most correlated pairs to list
+            dtype (str): 'float32' halves memory and is faster, 'float64' is exact
+
+        Returns:
+            Dict with the portfolio volatility and per-ticker statistics, see README
+        """
+        try:
+            tickers = list(dict.fromkeys(tickers))
+            if len(tickers) < 2:
+                raise ValueError("A portfolio needs at least two tickers")
+            if len(tickers) > MAX_TICKERS:
+                raise ValueError(f"At most {MAX_TICKERS} tickers are supported")
+            w = self._weights(tickers, weights)
+
+            if include_matrix is None:
+                include_matrix = len(tickers) <= MATRIX_LIMIT
+
+            columns = tickers + ([benchmark] if benchmark and benchmark not in tickers else [])
+            dates, returns = self.returns_matrix(columns, start_date, end_date, dtype)
+            state = self._running_covariance(columns, start_date, dates, returns, dtype)
+
+            n = len(tickers)
+            cov = state.covariance()
+            vol = np.sqrt(np.diag(cov))
+            sigma_w = cov[:n, :n] @ w
+            port_var = float(w @ sigma_w)
+
+            if benchmark:
+                b = columns.index(benchmark)
+                target = returns[:, b].astype(np.float64)
+                beta = cov[:n, b] / cov[b, b]
+            else:
+                target = returns[:, :n] @ w.astype(returns.dtype)
+                beta = sigma_w / port_var
+
+            if include_matrix:
+                rolling = self._rolling_correlation(returns[:, :n], target, window)
+            else:
+                # Only the latest value is returned, so only the last window is needed
+                rolling = self._rolling_correlation(returns[-window:, :n], target[-window:], window)
+            result = {
+                'tickers': tickers,
+                'observations': len(dates),
+                'start': dates[0].strftime('%Y-%m-%d'),
+                'end': dates[-1].strftime('%Y-%m-%d'),
+                'dtype': np.dtype(dtype).name,
+                'weights': dict(zip(tickers, w.tolist())),
+                'portfolio': {
+                    'volatility': float(np.sqrt(port_var * TRADING_DAYS)),
+                    'daily_volatility': float(np.sqrt(port_var)),
+                    'expected_return': float(state.mean[:n] @ w * TRADING_DAYS),
+                },
+                'volatility': dict(zip(tickers, (vol[:n] * np.sqrt(TRADING_DAYS)).tolist())),
+                'beta': dict(zip(tickers, beta.tolist())),
+                'beta_to': benchmark or 'portfolio',
+                'risk_contribution': dict(zip(tickers, (w * sigma_w / port_var).tolist())),
+                'top_pairs': self._top_pairs(cov[:n, :n], vol[:n], tickers, top_pairs),
+                'rolling_correlation': {
+                    'window': window,
+                    'against': benchmark or 'portfolio',
+                    'latest': dict(zip(tickers, _finite(rolling[-1]))),
+                },
+            }
+            if include_matrix:
+                result['covariance'] = (cov[:n, :n] * TRADING_DAYS).tolist()
+                correlation = _normalize(cov[:n, :n], vol[:n])
+                # Exact ones rather than rounding residue, constant series stay NaN
+                correlation[np.diag_indices(n)] = np.where(vol[:n] > 0, 1.0, np.nan)
+                result['correlation'] = [_finite(row) for row in correlation]
+                result['rolling_correlation']['dates'] = [d.strftime('%Y-%m-%d') for d in dates[window - 1:]]
+                result['rolling_correlation']['values'] = {
+                    ticker: _finite(rolling[window - 1:, i]) for i, ticker in enumerate(tickers)
+                }
+            return result
+        except Exception as e:
+            raise ValueError(f"Portfolio error: {str(e)}")
+
+    def _running_covariance(
+        self,
+        columns: List[str],
+        start_date: str,
+        dates: pd.DatetimeIndex,
+        returns: np.ndarray,
+        dtype: str
+    ) -> RunningCovariance:
+        """Covariance of the returns, merging only the rows after a kept state's last date"""
+        key = (tuple(columns), start_date, np.dtype(dtype).name)
+        with self._lock:
+            kept = self.states.get(key)
+
+        state, new = RunningCovariance(len(columns)), returns
+        if kept is not None and kept[0] in dates:
+            last, count, digest, kept_state = kept
+            # A backfilled or dropped bar changes the aligned dates before
+            # `last`, and the kept sums then no longer match these rows
+            if dates.get_loc(last) + 1 == count and _dates_digest(dates[:count]) == digest:
+                state, new = kept_state.copy(), returns[count:]
+
+        for start in range(0, len(new), self.chunk_size):
+            state.update(new[start:start + self.chunk_size])
+
+        if state.comoment.nbytes * self.states.max_entries <= self.max_state_bytes:
+            with self._lock:
+                self.states.put(key, (dates[-1], len(dates), _dates_digest(dates), state))
+        return state
+
+    @staticmethod
+    def _weights(tickers: List[str], weights: Optional[Dict[str, float]]) -> np.ndarray:
+        if not weights:
+            return np.full(len(tickers), 1 / len(tickers))
+        unknown = set(weights) - set(tickers)
+        if unknown:
+            raise ValueError(f"Weights given for tickers not in the portfolio: {sorted(unknown)}")
+        w = np.array([weights.get(ticker, 0.0) for ticker in tickers], dtype=np.float64)
+        if w.sum() == 0:
+            raise ValueError("Weights must not sum to zero")
+        return w / w.sum()
+
+    def _rolling_correlation(self, returns: np.ndarray, target: np.ndarray, window: int) -> np.ndarray:
+        """
+        Correlation of each column with `target` over trailing windows
+
+        Windowed sums come from cumulative sums of mean-shifted values,
+        `chunk_size` columns at a time.
+
+        Returns:
+            np.ndarray: (dates, tickers) correlations, NaN for the first window - 1 rows
+        """
+        rows, width = returns.shape
+        out = np.full((rows, width), np.nan, dtype=returns.dtype)
+        if window > rows:
+            return out
+
+        y = target - target.mean()
+        sy, syy = _window_sums(y, window), _window_sums(y * y, window)
+        var_y = syy - sy * sy / window
+        for start in range(0, width, self.chunk_size):
+            block = returns[:, start:start + self.chunk_size].astype(np.float64)
+            block -= block.mean(axis=0)
+            sx = _window_sums(block, window)
+            sxx = _window_sums(block * block, window)
+            sxy = _window_sums(block * y[:, None], window)
+            cov = sxy - sx * sy[:, None] / window
+            var_x = sxx - sx * sx / window
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out[window - 1:, start:start + self.chunk_size] = cov / np.sqrt(np.maximum(var_x * var_y[:, None], 0.0))
+        return out
+
+    def _top_pairs(self, cov: np.ndarray, vol: np.ndarray, tickers: List[str], count: int) -> List[Dict[str, Any]]:
+        """Most correlated distinct pairs, found one block of correlation rows at a time"""
+        if count <= 0:
+            return []
+        n = len(tickers)
+        best_values = np.empty(0)
+        best_pairs = np.empty((0, 2), dtype=np.int64)
+        for start in range(0, n, self.chunk_size):
+            rows = slice(start, min(start + self.chunk_size, n))
+            block = _normalize(cov[rows], vol, rows)
+            i, j = np.nonzero(np.triu(np.ones(block.shape, dtype=bool), k=start + 1))
+            values = block[i, j]
+            keep = np.isfinite(values)
+            i, j, values = i[keep] + start, j[keep], values[keep]
+            if len(values) > count:
+                top = np.argpartition(-values, count - 1)[:count]
+                i, j, values = i[top], j[top], values[top]
+            best_values = np.concatenate([best_values, values])
+            best_pairs = np.concatenate([best_pairs, np.column_stack([i, j])])
+            if len(best_values) > count:
+                top = np.argpartition(-best_values, count - 1)[:count]
+                best_values, best_pairs = best_values[top], best_pairs[top]
+
+        order = np.argsort(-best_values, kind='stable')
+        return [
+            {'pair': [tickers[a], tickers[b]], 'correlation': float(value)}
+            for (a, b), value in zip(best_pairs[order].tolist(), best_values[order])
+        ]
+
+
+def _dates_digest(dates: pd.DatetimeIndex) -> str:
+    return hashlib.sha1(np.ascontiguousarray(dates.asi8).tobytes()).hexdigest()
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """Sums over each trailing window of rows, from the first full window on"""
+    cumulative = np.cumsum(values, axis=0)
+    sums = cumulative[window - 1:].copy()
+    sums[1:] -= cumulative[:-window]
+    return sums
+
+
+def _finite(values: np.ndarray) -> List[Optional[float]]:
+    """JSON-safe list, NaN becomes None"""
+    return [None if np.isnan(value) else float(value) for value in values.tolist()]
@@ -1,39 +1,148 @@
-import pmdarima as pm
+import asyncio
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from src.core.executors import get_cpu_executor, get_io_executor
+from src.core.forecast_engines import AUTO_ARIMA, ClosedFormModel, get_engine
+from src.core.model_registry import ModelRegistry, extend_model, get_model_registry
+from src.core.order_search import SEARCH_JOBS, plan_search
+from src.utils.metrics import observe_search
 
 class PredictionService:
     @staticmethod
-    def forecast_prices(data: pd.Series, periods: int = 7) -> Dict[str, Any]:
+    def forecast_prices(
+        data: pd.Series,
+        periods: int = 7,
+        ticker: Optional[str] = None,
+        registry: Optional[ModelRegistry] = None,
+        engine: str = AUTO_ARIMA
+    ) -> Dict[str, Any]:
         """
-        Generate price forecasts using Auto ARIMA
-        
+        Generate price forecasts using Auto ARIMA or a closed-form engine
+
         Args:
             data (pd.Series): Historical price data
             periods (int): Number of periods to forecast
-        
+            ticker (str): Stock ticker symbol, enables model reuse through the registry
+            registry (ModelRegistry): Model registry, the shared registry by default
+            engine (str): 'auto_arima' or a fast engine from forecast_engines.ENGINES
+
         Returns:
             Dict containing forecast and confidence intervals
         """
         try:
-            # Fit Auto ARIMA model
-            model = pm.auto_arima(
-                data, 
-                seasonal=True, 
-                m=12,  # Monthly seasonality
-                suppress_warnings=True,
-                stepwise=True
-            )
-            
-            # Forecast next week's prices
-            forecast, conf_int = model.predict(n_periods=periods, return_conf_int=True)
-            
-            return {
-                'prediction_model': model,
-                'prediction_results': {
-                    'forecast': forecast.tolist(),
-                    'confidence_interval': conf_int.tolist()
-                }
-            }
+            if engine != AUTO_ARIMA:
+                # Closed-form engines fit in milliseconds, nothing to cache
+                model = ClosedFormModel(get_engine(engine), data.to_numpy(dtype='float64'))
+                return PredictionService._build_result(model, 'disabled', periods)
+
+            if ticker is None:
+                model, model_cache = PredictionService.fit_model(data), 'disabled'
+            else:
+                registry = registry or get_model_registry()
+                model, model_cache = registry.get_or_fit(ticker, data, PredictionService.fit_model)
+
+            return PredictionService._build_result(model, model_cache, periods)
         except Exception as e:
-            raise ValueError(f"Prediction error: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Prediction error: {str(e)}")
+
+    @staticmethod
+    async def aforecast_prices(
+        data: pd.Series,
+        periods: int = 7,
+        ticker: Optional[str] = None,
+        registry: Optional[ModelRegistry] = None,
+        engine: str = AUTO_ARIMA
+    ) -> Dict[str, Any]:
+        """
+        Generate price forecasts without blocking the event loop
+
+        Registry lookups run on the shared I/O thread pool; the Auto ARIMA
+        search and the update or refit of a stored model run in the shared
+        worker process pool. Closed-form engines are cheap enough to run
+        inline.
+
+        Args:
+            data (pd.Series): Historical price data
+            periods (int): Number of periods to forecast
+            ticker (str): Stock ticker symbol, enables model reuse through the registry
+            registry (ModelRegistry): Model registry, the shared registry by default
+            engine (str): 'auto_arima' or a fast engine from forecast_engines.ENGINES
+
+        Returns:
+            Dict containing forecast and confidence intervals
+        """
+        if engine != AUTO_ARIMA:
+            return PredictionService.forecast_prices(data, periods, engine=engine)
+
+        try:
+            loop = asyncio.get_running_loop()
+            model, model_cache = None, 'disabled'
+
+            if ticker is not None:
+                registry = registry or get_model_registry()
+                model, model_cache, base = await loop.run_in_executor(get_io_executor(), registry.find, ticker, data)
+                if base is not None:
+                    model = await loop.run_in_executor(
+                        get_cpu_executor(), extend_model, base.model, data, base.length, model_cache
+                    )
+                    await loop.run_in_executor(
+                        get_io_executor(), registry.put_extended, ticker, data, model, model_cache, base
+                    )
+
+            if model is None:
+                model = await loop.run_in_executor(get_cpu_executor(), PredictionService.fit_model, data)
+                if ticker is not None:
+                    await loop.run_in_executor(get_io_executor(), registry.put, ticker, data, model)
+
+            return PredictionService._build_result(model, model_cache, periods)
+        except Exception as e:
+            raise ValueError(f"Prediction error: {str(e)}")
+
+    @staticmethod
+    def _build_result(model: Any, model_cache: str, periods: int) -> Dict[str, Any]:
+        if model_cache in ('miss', 'disabled'):
+            # The model came from a fresh order search
+            observe_search(model)
+
+        # Forecast next week's prices
+        forecast, conf_int = model.predict(n_periods=periods, return_conf_int=True)
+
+        return {
+            'prediction_model': model,
+            'model_cache': model_cache,
+            'prediction_results': {
+                'forecast': forecast.tolist(),
+                'confidence_interval': conf_int.tolist()
+            }
+        }
+
+    @staticmethod
+    def fit_model(data: pd.Series, n_jobs: Optional[int] = None) -> Any:
+        """
+        Run the Auto ARIMA order search over a space pruned by plan_search
+
+        Args:
+            data (pd.Series): Historical price data
+            n_jobs (int): Candidates fitted in parallel, ARIMA_SEARCH_JOBS by default
+
+        Returns:
+            Fitted pmdarima ARIMA model, with the number of candidates the
+            search fitted in `search_fits_` and the space in `search_space_`
+        """
+        # pmdarima pulls in statsmodels and pyplot, so it is loaded on the first search
+        import pmdarima as pm
+
+        space = plan_search(data)
+        fits = pm.auto_arima(
+            data,
+            **space.auto_arima_kwargs(SEARCH_JOBS if n_jobs is None else n_jobs),
+            suppress_warnings=True,
+            return_valid_fits=True
+        )
+        # Candidates come back best first; the count travels with the model
+        # so searches run in worker processes are recorded by the caller
+        model = fits[0]
+        model.search_fits_ = len(fits)
+        model.search_space_ = space
+        return model
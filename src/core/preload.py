@@ -0,0 +1,56 @@
+"""
+Optional warm-up of the heavy dependencies behind each analysis stage
+
+Stages import their heavy libraries on first use so the API starts fast.
+Long-lived workers can pay that cost up front instead by setting
+ANALYSIS_PRELOAD to 'all' or a comma-separated list of stages, which the
+API preloads at startup and the model fitting pool in each worker process.
+"""
+import importlib
+import os
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.core.financial_analysis import ALL_STAGES, CHARTS, FORECAST, INSIGHTS, SCENARIOS, resolve_stages
+
+# Modules each stage loads the first time it runs
+STAGE_IMPORTS = {
+    FORECAST: ('pmdarima',),
+    INSIGHTS: ('langchain_groq',),
+    CHARTS: ('matplotlib.figure', 'matplotlib.backends.backend_agg'),
+    SCENARIOS: (),
+}
+
+
+def configured_stages() -> Optional[Tuple[str, ...]]:
+    """
+    Stages selected by the ANALYSIS_PRELOAD environment variable
+
+    Returns:
+        Tuple of stages to preload, or None when preloading is off
+    """
+    value = os.getenv('ANALYSIS_PRELOAD', '').strip()
+    if not value:
+        return None
+    if value == 'all':
+        return resolve_stages(ALL_STAGES)
+    return resolve_stages(stage.strip() for stage in value.split(',') if stage.strip())
+
+
+def preload(stages: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Import the heavy dependencies of `stages` ahead of their first run
+
+    Args:
+        stages (Iterable[str]): Stages to warm up, the default stages when None or empty
+
+    Returns:
+        Dict of seconds spent importing per stage
+    """
+    timings = {}
+    for stage in resolve_stages(stages):
+        started = time.perf_counter()
+        for module in STAGE_IMPORTS[stage]:
+            importlib.import_module(module)
+        timings[stage] = time.perf_counter() - started
+    return timings
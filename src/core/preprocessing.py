@@ -14,14 +14,14 @@ class PreprocessingService:
         Returns:
             pd.DataFrame: Normalized DataFrame
         """
-        numeric_columns = data.select_dtypes(include=[np.number]).columns
-        data_normalized = data.copy()
+        numeric = data.select_dtypes(include=[np.number])
+        low = numeric.min()
         
-        for col in numeric_columns:
-            data_normalized[f'{col}_normalized'] = (data[col] - data[col].min()) / \
-                (data[col].max() - data[col].min())
+        # Scale every numeric column in one pass and attach them with a single concat
+        normalized = (numeric - low) / (numeric.max() - low)
+        normalized.columns = [f'{col}_normalized' for col in numeric.columns]
         
-        return data_normalized
+        return pd.concat([data, normalized], axis=1)
     
     @staticmethod
     def handle_missing_values(data: pd.DataFrame, strategy: str = 'mean') -> pd.DataFrame:
@@ -0,0 +1,272 @@
+import json
+import os
+import re
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+from src.core.providers import MarketDataProvider, YFinanceProvider
+
+DEFAULT_STORE_DIR = os.path.join('.cache', 'prices')
+
+# Exchange symbols such as BRK-B, ^GSPC or EURUSD=X; anything else could
+# escape the store directory once used as a path component
+TICKER_PATTERN = re.compile(r'^[A-Z0-9.\-^=]{1,20}$')
+
+
+def validate_ticker(ticker: str) -> str:
+    """
+    Check a ticker is a plain symbol that is safe to use as a directory name
+
+    Args:
+        ticker (str): Stock ticker symbol, any case
+
+    Returns:
+        str: The upper-cased ticker
+    """
+    symbol = str(ticker).upper()
+    if not TICKER_PATTERN.match(symbol) or not symbol.strip('.'):
+        raise ValueError(f"Invalid ticker: {ticker!r}")
+    return symbol
+
+
+class PriceStore:
+    """
+    Persistent per-ticker OHLCV store backed by memory-mapped NumPy files
+
+    Each ticker lives in its own directory holding `index.npy` (int64
+    nanosecond timestamps), `values.npy` (float64 rows x columns) and
+    `meta.json` (column names and the [start, end) date range already
+    fetched). Requests only go to the provider for the part of the range
+    that is not covered yet, and reads memory-map the files so only the
+    requested row slice is paged in from disk.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR, provider: Optional[MarketDataProvider] = None):
+        """
+        Initialize the price store
+
+        Args:
+            root (str): Directory holding one sub-directory per ticker
+            provider (MarketDataProvider): Source for missing bars, yfinance by default
+        """
+        self.root = root
+        self.provider = provider or YFinanceProvider()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def get(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        Return bars for [start_date, end_date), fetching only what is missing
+
+        Args:
+            ticker (str): Stock ticker symbol
+            start_date (str): First date to include
+            end_date (str): First date to exclude
+
+        Returns:
+            pd.DataFrame: OHLCV bars for the requested range
+        """
+        validate_ticker(ticker)
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+
+        with self._lock_for(ticker):
+            gaps = self.missing_ranges(ticker, start, end)
+            if gaps:
+                fetched = [self.provider.download(ticker, _fmt(lo), _fmt(hi)) for lo, hi in gaps]
+                self._merge(ticker, fetched, start, end)
+
+            return self._read(ticker, start, end)
+
+    def get_many(self, tickers: List[str], start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+        """
+        Return bars for several tickers using at most one bulk provider call
+
+        Tickers with missing ranges are fetched together over the union of
+        their gaps, trading some over-fetching for a single round trip.
+        Tickers the provider returns nothing for come back empty.
+
+        Args:
+            tickers (List[str]): Stock ticker symbols
+            start_date (str): First date to include
+            end_date (str): First date to exclude
+
+        Returns:
+            Dict mapping each ticker to its OHLCV bars
+        """
+        for ticker in tickers:
+            validate_ticker(ticker)
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        locks = [self._lock_for(ticker) for ticker in sorted(set(tickers))]
+
+        for lock in locks:
+            lock.acquire()
+        try:
+            gaps = {ticker: self.missing_ranges(ticker, start, end) for ticker in tickers}
+            stale = [ticker for ticker in tickers if gaps[ticker]]
+
+            if stale:
+                lo = min(gap[0] for ticker in stale for gap in gaps[ticker])
+                hi = max(gap[1] for ticker in stale for gap in gaps[ticker])
+                fetched = self.provider.download_many(stale, _fmt(lo), _fmt(hi))
+
+                for ticker in stale:
+                    if ticker in fetched:
+                        self._merge(ticker, [fetched[ticker]], start, end)
+
+            return {ticker: self._read(ticker, start, end) for ticker in tickers}
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def coverage(self, ticker: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Date range already fetched for a ticker
+
+        Args:
+            ticker (str): Stock ticker symbol
+
+        Returns:
+            (start, end) half-open range, or None if nothing is stored
+        """
+        meta = self._read_meta(ticker)
+        if meta is None:
+            return None
+        return pd.Timestamp(meta['start']), pd.Timestamp(meta['end'])
+
+    def missing_ranges(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Head and tail ranges that must be fetched to cover [start, end)
+
+        The covered range is kept contiguous, so a request that lies entirely
+        before or after it also fetches the gap in between.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            start (pd.Timestamp): First date to include
+            end (pd.Timestamp): First date to exclude
+
+        Returns:
+            List of (start, end) ranges to download
+        """
+        end = min(end, _today())
+        if start >= end:
+            return []
+
+        held = self.coverage(ticker)
+        if held is None:
+            return [(start, end)]
+
+        held_start, held_end = held
+        gaps = []
+        if start < held_start:
+            gaps.append((start, held_start))
+        if end > held_end:
+            gaps.append((held_end, end))
+        return gaps
+
+    def _merge(self, ticker: str, fetched: List[pd.DataFrame], start: pd.Timestamp, end: pd.Timestamp) -> None:
+        """Merge freshly fetched bars into the stored arrays and widen coverage"""
+        held = self.coverage(ticker)
+        frames = [self._read(ticker, *held)] if held else []
+        frames.extend(df for df in fetched if not df.empty)
+
+        new_start = min(start, held[0]) if held else start
+        new_end = max(min(end, _today()), held[1]) if held else min(end, _today())
+
+        if frames:
+            merged = pd.concat(frames)
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+        else:
+            merged = pd.DataFrame()
+
+        self._write(ticker, merged, new_start, new_end)
+
+    def _write(self, ticker: str, df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> None:
+        path = self._ticker_dir(ticker)
+        os.makedirs(path, exist_ok=True)
+
+        columns = [str(col) for col in df.columns]
+        index = df.index.values.astype('datetime64[ns]').astype(np.int64)
+        values = df.to_numpy(dtype=np.float64) if columns else np.empty((0, 0))
+
+        # Arrays are replaced before the metadata so a crash mid-write can
+        # only leave coverage that under-reports what is on disk
+        for name, array in (('index.npy', index), ('values.npy', values)):
+            tmp = os.path.join(path, f'.{name}.tmp')
+            with open(tmp, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp, os.path.join(path, name))
+
+        meta = {'columns': columns, 'start': _fmt(start), 'end': _fmt(end)}
+        tmp = os.path.join(path, '.meta.json.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(path, 'meta.json'))
+
+    def _read(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        meta = self._read_meta(ticker)
+        if meta is None or not meta['columns']:
+            return pd.DataFrame()
+
+        path = self._ticker_dir(ticker)
+        index = np.load(os.path.join(path, 'index.npy'), mmap_mode='r')
+        values = np.load(os.path.join(path, 'values.npy'), mmap_mode='r')
+
+        lo = int(np.searchsorted(index, start.value, side='left'))
+        hi = int(np.searchsorted(index, end.value, side='left'))
+
+        df = pd.DataFrame(
+            np.array(values[lo:hi]),
+            index=pd.DatetimeIndex(np.array(index[lo:hi]).astype('datetime64[ns]'), name='Date'),
+            columns=meta['columns'],
+        )
+        if 'Volume' in df.columns and not df['Volume'].isna().any():
+            df['Volume'] = df['Volume'].astype(np.int64)
+        return df
+
+    def _read_meta(self, ticker: str) -> Optional[dict]:
+        path = os.path.join(self._ticker_dir(ticker), 'meta.json')
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _ticker_dir(self, ticker: str) -> str:
+        return os.path.join(self.root, validate_ticker(ticker))
+
+    def _lock_for(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker.upper(), threading.Lock())
+
+
+_default_store: Optional[PriceStore] = None
+
+
+def get_price_store() -> PriceStore:
+    """
+    Shared process-wide price store
+
+    The location can be overridden with the PRICE_STORE_DIR environment
+    variable. Downloads go through provider_pool.build_provider():
+    MARKET_DATA_PROVIDER picks yfinance (default), http or synthetic, and
+    the MARKET_DATA_* variables tune pooling, rate limit and retries.
+
+    Returns:
+        PriceStore: Lazily created default store
+    """
+    global _default_store
+    if _default_store is None:
+        from src.core.provider_pool import build_provider
+
+        _default_store = PriceStore(os.getenv('PRICE_STORE_DIR', DEFAULT_STORE_DIR), provider=build_provider())
+    return _default_store
+
+
+def _today() -> pd.Timestamp:
+    return pd.Timestamp.now().normalize()
+
+
+def _fmt(ts: pd.Timestamp) -> str:
+    return ts.strftime('%Y-%m-%d')
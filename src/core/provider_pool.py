@@ -0,0 +1,274 @@
+"""
+Pooled, rate-limited access to remote market data
+
+Wrappers around a MarketDataProvider that every remote request goes
+through: one shared HTTP connection pool, a token bucket capping the request
+rate, retries with jittered exponential backoff for transient failures, and
+coalescing of concurrent single-ticker downloads into one multi-ticker call.
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.core.providers import (
+    HTTPProvider, MarketDataProvider, SyntheticProvider, TransientProviderError, YFinanceProvider
+)
+from src.utils import metrics
+
+PROVIDER_REQUESTS = metrics.registry.counter(
+    'market_data_requests_total', 'Requests sent to the market data provider', ('outcome',)
+)
+PROVIDER_COALESCED = metrics.registry.counter(
+    'market_data_coalesced_total', 'Single-ticker downloads served by another request\'s bulk download'
+)
+PROVIDER_THROTTLED_SECONDS = metrics.registry.counter(
+    'market_data_throttled_seconds_total', 'Time spent waiting on the market data rate limit'
+)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session(pool_size: Optional[int] = None) -> Any:
+    """
+    Shared process-wide requests.Session with a bounded connection pool
+
+    Connections are kept alive and reused across requests instead of being
+    opened per download. MARKET_DATA_POOL_SIZE sets the connections kept
+    per host.
+
+    Args:
+        pool_size (int): Connections per host, only used on first call
+
+    Returns:
+        requests.Session
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            size = pool_size or int(os.getenv('MARKET_DATA_POOL_SIZE', 10))
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing `rate` requests per second with bursts of `burst`
+
+    A caller that finds the bucket empty reserves the next token and sleeps
+    until it is due, so waiting callers are served in arrival order.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take one token, waiting for it if none is left
+
+        Returns:
+            float: Seconds waited
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            self._sleep(wait)
+        return wait
+
+
+class ThrottledProvider(MarketDataProvider):
+    """Rate limits calls to `provider` and retries transient failures with jittered backoff"""
+
+    def __init__(
+        self,
+        provider: MarketDataProvider,
+        bucket: Optional[TokenBucket] = None,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None
+    ):
+        """
+        Args:
+            provider (MarketDataProvider): Provider to wrap
+            bucket (TokenBucket): Rate limit every attempt takes a token from, none when None
+            retries (int): Retries after the first attempt
+            backoff (float): Upper bound of the first retry delay, doubled per retry
+            max_backoff (float): Cap on the retry delay bound
+            sleep (Callable): Sleep function, replaceable in tests
+            rng (random.Random): Jitter source
+        """
+        self.provider = provider
+        self.bucket = bucket
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+
+    def download(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        return self._call(self.provider.download, ticker, start_date, end_date)
+
+    def download_many(self, tickers: List[str], start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+        return self._call(self.provider.download_many, tickers, start_date, end_date)
+
+    def _call(self, fn: Callable, *args: Any) -> Any:
+        for attempt in range(self.retries + 1):
+            if self.bucket is not None:
+                PROVIDER_THROTTLED_SECONDS.inc(self.bucket.acquire())
+            try:
+                result = fn(*args)
+            except TransientProviderError as e:
+                if attempt == self.retries:
+                    PROVIDER_REQUESTS.inc(outcome='failed')
+                    raise
+                PROVIDER_REQUESTS.inc(outcome='retried')
+                # Full jitter keeps clients that failed together from retrying together
+                delay = self._rng.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+                self._sleep(max(delay, e.retry_after or 0.0))
+                continue
+            PROVIDER_REQUESTS.inc(outcome='ok')
+            return result
+
+
+class _Batch:
+    __slots__ = ('futures', 'callers', 'full', 'closed')
+
+    def __init__(self):
+        self.futures: Dict[str, Future] = {}
+        self.callers = 0
+        self.full = threading.Event()
+        self.closed = False
+
+
+class CoalescingProvider(MarketDataProvider):
+    """
+    Merges concurrent single-ticker downloads of the same range into one download_many
+
+    The first caller for a date range waits up to `window` seconds, or until
+    `max_batch` tickers have joined, then downloads every ticker requested
+    in the meantime with one call and hands each caller its frame.
+    """
+
+    def __init__(self, provider: MarketDataProvider, window: float = 0.025, max_batch: int = 50):
+        """
+        Args:
+            provider (MarketDataProvider): Provider to wrap
+            window (float): Seconds the first caller waits for others to join, 0 disables coalescing
+            max_batch (int): Tickers per bulk download
+        """
+        self.provider = provider
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[Tuple[str, str], _Batch] = {}
+        self._lock = threading.Lock()
+
+    def download(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        if self.window <= 0:
+            return self.provider.download(ticker, start_date, end_date)
+
+        key = (start_date, end_date)
+        with self._lock:
+            batch = self._pending.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._pending[key] = _Batch()
+            batch.callers += 1
+            future = batch.futures.setdefault(ticker, Future())
+            if len(batch.futures) >= self.max_batch:
+                # Later callers start a new batch
+                self._close(key, batch)
+
+        if leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                self._close(key, batch)
+            self._fetch(list(batch.futures), start_date, end_date, batch)
+
+        return future.result()
+
+    def download_many(self, tickers: List[str], start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+        return self.provider.download_many(tickers, start_date, end_date)
+
+    def _close(self, key: Tuple[str, str], batch: _Batch) -> None:
+        if not batch.closed:
+            batch.closed = True
+            del self._pending[key]
+            batch.full.set()
+
+    def _fetch(self, tickers: List[str], start_date: str, end_date: str, batch: _Batch) -> None:
+        PROVIDER_COALESCED.inc(batch.callers - 1)
+        try:
+            frames = self.provider.download_many(tickers, start_date, end_date)
+        except Exception as e:
+            for future in batch.futures.values():
+                future.set_exception(e)
+            return
+        for ticker, future in batch.futures.items():
+            if ticker in frames:
+                future.set_result(frames[ticker])
+            else:
+                future.set_exception(ValueError(f"Download failed for {ticker}"))
+
+
+def build_provider(name: Optional[str] = None) -> MarketDataProvider:
+    """
+    Provider selected by MARKET_DATA_PROVIDER, wrapped for remote access
+
+    'yfinance' (default) and 'http' (MARKET_DATA_URL) go through the shared
+    session, the MARKET_DATA_RATE requests/second limit with bursts of
+    MARKET_DATA_BURST, MARKET_DATA_RETRIES jittered retries and a
+    MARKET_DATA_COALESCE_MS coalescing window. 'synthetic' is offline and
+    returned as is.
+
+    Args:
+        name (str): Provider name, the environment variable when None
+
+    Returns:
+        MarketDataProvider
+    """
+    name = name or os.getenv('MARKET_DATA_PROVIDER', 'yfinance')
+    if name == 'synthetic':
+        return SyntheticProvider()
+    if name == 'http':
+        base = HTTPProvider(os.environ['MARKET_DATA_URL'], session=get_http_session())
+    elif name == 'yfinance':
+        base = YFinanceProvider(session=get_http_session())
+    else:
+        raise ValueError(f"Unknown market data provider: {name}, expected 'yfinance', 'http' or 'synthetic'")
+
+    throttled = ThrottledProvider(
+        base,
+        TokenBucket(float(os.getenv('MARKET_DATA_RATE', 2)), int(os.getenv('MARKET_DATA_BURST', 5))),
+        retries=int(os.getenv('MARKET_DATA_RETRIES', 3)),
+    )
+    return CoalescingProvider(throttled, window=float(os.getenv('MARKET_DATA_COALESCE_MS', 25)) / 1000)
@@ -0,0 +1,229 @@
+import time
+import zlib
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+
+
+class TransientProviderError(RuntimeError):
+    """
+    Raised for provider failures worth retrying: throttling, timeouts, 5xx
+
+    `retry_after` carries the delay the source asked for, in seconds.
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# Substrings of yfinance error messages that mark a transient failure
+_TRANSIENT_MARKERS = ('too many requests', 'rate limit', 'timed out', 'timeout', 'connection', '502', '503', '504')
+
+
+class MarketDataProvider:
+    """
+    Base class for OHLCV market data sources
+
+    Providers return a DataFrame indexed by date with the columns in
+    OHLCV_COLUMNS for the half-open range [start_date, end_date), matching
+    the semantics of yf.download.
+    """
+
+    def download(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        Download daily bars for a single ticker
+
+        Args:
+            ticker (str): Stock ticker symbol
+            start_date (str): First date to include
+            end_date (str): First date to exclude
+
+        Returns:
+            pd.DataFrame: OHLCV bars, empty if the range holds no trading days
+        """
+        raise NotImplementedError
+
+    def download_many(self, tickers: List[str], start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+        """
+        Download daily bars for several tickers
+
+        Args:
+            tickers (List[str]): Stock ticker symbols
+            start_date (str): First date to include
+            end_date (str): First date to exclude
+
+        Returns:
+            Dict mapping each ticker to its OHLCV bars
+        """
+        return {ticker: self.download(ticker, start_date, end_date) for ticker in tickers}
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Yahoo Finance provider backed by yf.download"""
+
+    def __init__(self, session: Any = None):
+        """
+        Args:
+            session (requests.Session): Shared connection pool, yfinance's own when None
+        """
+        self.session = session
+
+    def download(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        import yfinance as yf
+
+        df = yf.download(ticker, start=start_date, end=end_date, progress=False, session=self.session)
+        self._raise_for_errors([ticker])
+
+        if isinstance(df.columns, pd.MultiIndex):
+            df = df.droplevel(1, axis=1) if ticker in df.columns.get_level_values(1) else df.droplevel(0, axis=1)
+
+        return df
+
+    def download_many(self, tickers: List[str], start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+        import yfinance as yf
+
+        if len(tickers) == 1:
+            return {tickers[0]: self.download(tickers[0], start_date, end_date)}
+
+        df = yf.download(
+            tickers, start=start_date, end=end_date, group_by='ticker', progress=False, session=self.session
+        )
+        failed = self._collect_errors(tickers)
+        if failed and len(failed) == len(tickers):
+            self._raise_for_errors(tickers)
+
+        return {
+            ticker: df[ticker].dropna(how='all') if ticker in df.columns.get_level_values(0) else pd.DataFrame()
+            for ticker in tickers
+            if ticker not in failed
+        }
+
+    @staticmethod
+    def _collect_errors(tickers: List[str]) -> Dict[str, str]:
+        import yfinance as yf
+
+        # yf.download logs failures instead of raising, so an empty frame is
+        # ambiguous between "no trading days" and "request failed"
+        errors = getattr(yf.shared, '_ERRORS', {}) or {}
+        return {ticker: errors[ticker] for ticker in tickers if ticker in errors}
+
+    @staticmethod
+    def _raise_for_errors(tickers: List[str]) -> None:
+        errors = YFinanceProvider._collect_errors(tickers)
+        if errors:
+            if any(marker in str(error).lower() for error in errors.values() for marker in _TRANSIENT_MARKERS):
+                raise TransientProviderError(f"Download failed: {errors}")
+            raise ValueError(f"Download failed: {errors}")
+
+
+class HTTPProvider(MarketDataProvider):
+    """
+    Provider for a JSON bars service such as src.utils.market_data_server
+
+    `GET {base_url}/history?tickers=A,B&start=...&end=...` answers with one
+    `{"columns": [...], "index": [...], "data": [...]}` object per ticker.
+    Throttling (429), server errors (5xx) and network failures raise
+    TransientProviderError; other errors raise ValueError.
+    """
+
+    def __init__(self, base_url: str, session: Any = None, timeout: float = 10.0):
+        """
+        Args:
+            base_url (str): Service root, e.g. http://127.0.0.1:8900
+            session (requests.Session): Connection pool, a private session when None
+            timeout (float): Seconds to wait for a response
+        """
+        self.base_url = base_url.rstrip('/')
+        self.session = session
+        self.timeout = timeout
+
+    def download(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        return self.download_many([ticker], start_date, end_date)[ticker]
+
+    def download_many(self, tickers: List[str], start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+        import requests
+
+        if self.session is None:
+            self.session = requests.Session()
+        try:
+            response = self.session.get(
+                f"{self.base_url}/history",
+                params={'tickers': ','.join(tickers), 'start': start_date, 'end': end_date},
+                timeout=self.timeout,
+            )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise TransientProviderError(f"Download failed: {str(e)}")
+
+        if response.status_code == 429 or response.status_code >= 500:
+            retry_after = response.headers.get('Retry-After')
+            raise TransientProviderError(
+                f"Download failed: HTTP {response.status_code}",
+                retry_after=float(retry_after) if retry_after else None,
+            )
+        if response.status_code != 200:
+            raise ValueError(f"Download failed: HTTP {response.status_code} {response.text}")
+
+        body = response.json()
+        return {ticker: self._frame(body[ticker]) if ticker in body else pd.DataFrame() for ticker in tickers}
+
+    @staticmethod
+    def _frame(payload: Dict[str, Any]) -> pd.DataFrame:
+        index = pd.DatetimeIndex(payload['index'], name='Date')
+        return pd.DataFrame(payload['data'], index=index, columns=payload['columns'])
+
+
+class SyntheticProvider(MarketDataProvider):
+    """
+    Deterministic offline provider generating random-walk business-day bars
+
+    Each bar depends only on its ticker and date, so fetching a range in
+    pieces yields exactly the same data as fetching it in one call. Every
+    call is recorded in `calls` so tests can assert on network usage, and
+    `latency` simulates the round trip of a remote provider.
+    """
+
+    def __init__(
+        self,
+        epoch: str = '2000-01-03',
+        start_price: float = 100.0,
+        volatility: float = 0.02,
+        latency: float = 0.0
+    ):
+        self.epoch = pd.Timestamp(epoch)
+        self.start_price = start_price
+        self.volatility = volatility
+        self.latency = latency
+        self.calls = []
+
+    def download(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        self.calls.append(([ticker], start_date, end_date))
+        if self.latency:
+            time.sleep(self.latency)
+        return self._generate(ticker, start_date, end_date)
+
+    def download_many(self, tickers: List[str], start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+        self.calls.append((list(tickers), start_date, end_date))
+        if self.latency:
+            time.sleep(self.latency)
+        return {ticker: self._generate(ticker, start_date, end_date) for ticker in tickers}
+
+    def _generate(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        end = pd.Timestamp(end_date)
+        dates = pd.bdate_range(self.epoch, end - pd.Timedelta(days=1), name='Date')
+
+        rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+        steps = rng.normal(0.0003, self.volatility, (len(dates), 5))
+        close = self.start_price * np.exp(np.cumsum(steps[:, 0]))
+        open_ = close * np.exp(steps[:, 1] / 4)
+        high = np.maximum(open_, close) * (1 + np.abs(steps[:, 2]) / 2)
+        low = np.minimum(open_, close) * (1 - np.abs(steps[:, 3]) / 2)
+        volume = (5_000_000 * np.exp(10 * steps[:, 4])).astype(np.int64)
+
+        df = pd.DataFrame(
+            {'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Adj Close': close, 'Volume': volume},
+            index=dates,
+        )
+        return df.loc[df.index >= pd.Timestamp(start_date)]
@@ -0,0 +1,146 @@
+import asyncio
+import math
+from datetime import datetime, time as dtime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from src.core.result_store import ResultStore
+
+HIT = 'HIT'
+MISS = 'MISS'
+COALESCED = 'COALESCED'
+
+MARKET_TZ = ZoneInfo('America/New_York')
+MARKET_OPEN = dtime(9, 30)
+MARKET_CLOSE = dtime(16, 0)
+
+
+def market_ttl(end_date: str, open_ttl: float = 60, now: Optional[datetime] = None) -> float:
+    """
+    Cache lifetime for an analysis ending at `end_date`
+
+    Ranges ending today or earlier only hold settled bars and never expire.
+    Ranges that include today expire after `open_ttl` seconds while the
+    market is open, and at the next market open otherwise.
+
+    Args:
+        end_date (str): Exclusive analysis end date (YYYY-MM-DD)
+        open_ttl (float): Lifetime in seconds during market hours
+        now (datetime): Current time, for testing
+
+    Returns:
+        float: Seconds to cache, math.inf for settled ranges
+    """
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    if datetime.strptime(end_date, '%Y-%m-%d').date() <= now.date():
+        return math.inf
+
+    if now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE:
+        return open_ttl
+
+    next_open = datetime.combine(now.date(), MARKET_OPEN, tzinfo=MARKET_TZ)
+    if now.time() >= MARKET_OPEN:
+        next_open += timedelta(days=1)
+    while next_open.weekday() >= 5:
+        next_open += timedelta(days=1)
+    return (next_open - now).total_seconds()
+
+
+class SingleFlight:
+    """Runs one computation per key and shares its outcome with concurrent callers"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Await `compute()` unless an identical call is already running
+
+        Args:
+            key (Hashable): Identity of the computation
+            compute (Callable): Coroutine function producing the value
+
+        Returns:
+            Tuple of the value and whether it was shared from another caller
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            return await asyncio.shield(task), True
+
+        # The computation runs as its own task so a disconnecting caller
+        # does not cancel it for the others waiting on the same key
+        task = asyncio.ensure_future(compute())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task), False
+
+
+class AnalysisCache:
+    """
+    Response cache with single-flight coalescing for analysis requests
+
+    Completed responses are cached with a market-hours TTL, concurrent
+    identical requests wait on one computation, and failures are never
+    cached.
+    """
+
+    def __init__(self, open_ttl: float = 60, max_entries: int = 1024):
+        """
+        Initialize the analysis cache
+
+        Args:
+            open_ttl (float): Lifetime in seconds of live results during market hours
+            max_entries (int): Maximum number of cached responses
+        """
+        self.open_ttl = open_ttl
+        self.store = ResultStore(max_entries=max_entries)
+        self.flight = SingleFlight()
+        self._counters = {'hits': 0, 'misses': 0, 'coalesced': 0}
+
+    async def get_or_compute(
+        self,
+        key: Tuple[str, ...],
+        compute: Callable[[], Awaitable[Any]],
+        valid: Optional[Callable[[Any], bool]] = None
+    ) -> Tuple[Any, str]:
+        """
+        Return a cached response or compute it once for all concurrent callers
+
+        Args:
+            key (Tuple): (ticker, start_date, end_date, ...) of the request
+            compute (Callable): Coroutine function producing the response
+            valid (Callable): Checks a cached response is still usable, failing ones are recomputed
+
+        Returns:
+            Tuple of the response and its cache status (HIT, MISS or COALESCED)
+        """
+        cached = self.store.get(key)
+        if cached is not None:
+            if valid is None or valid(cached):
+                self._counters['hits'] += 1
+                return cached, HIT
+            self.store.pop(key)
+
+        async def compute_and_store():
+            value = await compute()
+            self.store.put(key, value, ttl=market_ttl(key[2], self.open_ttl))
+            return value
+
+        value, shared = await self.flight.do(key, compute_and_store)
+        status = COALESCED if shared else MISS
+        self._counters['coalesced' if shared else 'misses'] += 1
+        return value, status
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache counters for sizing
+
+        Returns:
+            Dict of hits, misses, coalesced requests, entries and hit ratio
+        """
+        total = sum(self._counters.values())
+        return {
+            **self._counters,
+            'entries': len(self.store),
+            'hit_ratio': (self._counters['hits'] + self._counters['coalesced']) / total if total else 0.0,
+        }
@@ -0,0 +1,99 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class ResultStore:
+    """
+    In-process key/value store with per-entry TTL and a size cap
+
+    Expired entries are dropped lazily on access and on every insert. When
+    the store is full the entry closest to expiry is evicted first.
+    """
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 1024):
+        """
+        Initialize the result store
+
+        Args:
+            ttl (float): Default time to live in seconds
+            max_entries (int): Maximum number of entries held
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Any, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value
+
+        Args:
+            key (Any): Lookup key
+            value (Any): Value to store
+            ttl (float): Time to live in seconds, math.inf never expires
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = math.inf if ttl == math.inf else time.monotonic() + ttl
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (expires_at, value)
+            self._purge()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """
+        Return a stored value unless it has expired
+
+        Args:
+            key (Any): Lookup key
+            default (Any): Returned when the key is missing or expired
+
+        Returns:
+            The stored value or `default`
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return default
+            self.hits += 1
+            return entry[1]
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Lookup counters and current size
+
+        Returns:
+            Dict of hits, misses and live entries
+        """
+        entries = len(self)
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._purge()
+            return len(self._entries)
+
+    def _purge(self) -> None:
+        now = time.monotonic()
+        for key in [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+
+        while len(self._entries) > self.max_entries:
+            key = min(self._entries, key=lambda k: self._entries[k][0])
+            del self._entries[key]
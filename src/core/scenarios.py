@@ -0,0 +1,218 @@
+import numpy as np
+from typing import Any, Dict, Iterator, Literal, Optional, Sequence, Tuple
+
+from src.core.data_ingestion import DataIngestionService
+from src.core.forecast_engines import AUTO_ARIMA
+from src.core.model_registry import ModelRegistry, get_model_registry
+from src.core.prediction import PredictionService
+from src.core.price_store import PriceStore, get_price_store
+
+BOOTSTRAP = 'bootstrap'
+RESIDUALS = 'residuals'
+
+# Request-level method names
+ScenarioMethod = Literal['bootstrap', 'residuals']
+
+DEFAULT_PATHS = 20000
+MAX_PATHS = 1_000_000
+DEFAULT_CONFIDENCE = (0.95, 0.99)
+DEFAULT_BARRIERS = (-0.10, -0.05, 0.05, 0.10)
+DEFAULT_CHUNK_SIZE = 8192
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def model_residuals(model: Any) -> np.ndarray:
+    """
+    In-sample one-step residuals of a fitted forecaster, in price units
+
+    Args:
+        model: pmdarima ARIMA or forecast_engines.ClosedFormModel
+
+    Returns:
+        np.ndarray: Residuals, without the start-up values of a differenced model
+    """
+    if hasattr(model, 'resid'):
+        # The first d + D * s residuals are the undifferenced start-up values
+        _, seasonal_diff, _, period = getattr(model, 'seasonal_order', None) or (0, 0, 0, 0)
+        return np.asarray(model.resid(), dtype=np.float64)[model.order[1] + seasonal_diff * period:]
+    # Closed-form engines: deviations of the daily changes from their mean
+    changes = np.diff(np.asarray(model.values, dtype=np.float64))
+    return changes - changes.mean()
+
+
+class ScenarioService:
+    def __init__(self, store: Optional[PriceStore] = None, registry: Optional[ModelRegistry] = None):
+        """
+        Initialize the scenario engine
+
+        Args:
+            store (PriceStore): Price store, the shared store by default
+            registry (ModelRegistry): Model registry, the shared registry by default
+        """
+        self.store = store
+        self.registry = registry
+
+    def run(
+        self,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        method: str = BOOTSTRAP,
+        engine: str = AUTO_ARIMA,
+        **options: Any
+    ) -> Dict[str, Any]:
+        """
+        Simulate price paths for a ticker from its history or its fitted model
+
+        Args:
+            ticker (str): Stock ticker symbol
+            start_date (str): History start date
+            end_date (str): History end date
+            method (str): 'bootstrap' resamples the preprocessed daily Returns,
+                'residuals' adds resampled model residuals to the forecast
+            engine (str): Forecasting engine for the residuals method
+            **options: Passed to simulate (horizon, paths, dtype, confidence, barriers, seed, chunk_size)
+
+        Returns:
+            Dict with the risk summary, see simulate
+        """
+        try:
+            data = DataIngestionService.fetch_stock_data(
+                ticker, start_date, end_date, store=self.store or get_price_store()
+            )['preprocessed_data']
+            if method == BOOTSTRAP:
+                return ScenarioService.simulate(data['Close'].iloc[-1], data['Returns'].to_numpy(), **options)
+            if method == RESIDUALS:
+                horizon = options.get('horizon', 7)
+                prediction = PredictionService.forecast_prices(
+                    data['Close'], horizon, ticker=ticker, registry=self.registry or get_model_registry(), engine=engine
+                )
+                return ScenarioService.simulate(
+                    data['Close'].iloc[-1],
+                    model_residuals(prediction['prediction_model']),
+                    method=RESIDUALS,
+                    baseline=np.asarray(prediction['prediction_results']['forecast']),
+                    **options
+                )
+            raise ValueError(f"Unknown scenario method: {method}, expected '{BOOTSTRAP}' or '{RESIDUALS}'")
+        except Exception as e:
+            raise ValueError(f"Scenario error: {str(e)}")
+
+    @staticmethod
+    def simulate(
+        last_price: float,
+        shocks: np.ndarray,
+        horizon: int = 7,
+        paths: int = DEFAULT_PATHS,
+        method: str = BOOTSTRAP,
+        baseline: Optional[np.ndarray] = None,
+        dtype: str = 'float64',
+        confidence: Sequence[float] = DEFAULT_CONFIDENCE,
+        barriers: Sequence[float] = DEFAULT_BARRIERS,
+        seed: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Simulate price paths and summarize their risk
+
+        Paths are drawn `chunk_size` at a time as (paths, horizon) arrays, so
+        memory stays bounded by the chunk whatever the path count; only the
+        terminal prices and the touch counts are kept across chunks.
+
+        Args:
+            last_price (float): Price the paths start from
+            shocks (np.ndarray): Daily returns (bootstrap) or price residuals
+                (residuals) to resample; missing values are ignored
+            horizon (int): Days simulated
+            paths (int): Number of paths
+            method (str): 'bootstrap' compounds the returns from last_price,
+                'residuals' adds cumulated residuals to `baseline`
+            baseline (np.ndarray): Point forecast of `horizon` steps, for residuals
+            dtype (str): 'float32' halves memory and is faster, 'float64' is exact
+            confidence (Sequence[float]): Levels for VaR and CVaR
+            barriers (Sequence[float]): Moves relative to last_price for the
+                probability of touching them within the horizon
+            seed (int): Seed for reproducible paths
+            chunk_size (int): Paths simulated per block
+
+        Returns:
+            Dict with VaR and CVaR as positive loss fractions of last_price,
+            percentiles of the terminal price, probability of touch per barrier
+            and the expected return
+        """
+        shocks = np.asarray(shocks, dtype=np.float64)
+        shocks = shocks[~np.isnan(shocks)]
+        if len(shocks) == 0:
+            raise ValueError("No data to resample")
+        if paths < 1:
+            raise ValueError("At least one path must be simulated")
+        if any(not 0 < level < 1 for level in confidence):
+            raise ValueError("Confidence levels must be between 0 and 1")
+        if method == RESIDUALS and (baseline is None or len(baseline) < horizon):
+            raise ValueError(f"The residuals method needs a forecast of {horizon} steps")
+        if method == BOOTSTRAP:
+            # Compounding in log space turns the path into a cumulative sum
+            shocks = np.log1p(shocks)
+
+        dtype = np.dtype(dtype)
+        rng = np.random.default_rng(seed)
+        terminal = np.empty(paths, dtype=dtype)
+        barriers = np.asarray(barriers, dtype=np.float64)
+        touched = np.zeros(len(barriers), dtype=np.int64)
+
+        for start, block in ScenarioService._paths(rng, shocks.astype(dtype), horizon, paths, chunk_size):
+            if method == BOOTSTRAP:
+                np.exp(block, out=block)
+                block *= dtype.type(last_price)
+            else:
+                block += baseline[:horizon].astype(dtype)
+            terminal[start:start + len(block)] = block[:, -1]
+            touched += ScenarioService._touches(block, last_price, barriers)
+
+        returns = terminal.astype(np.float64) / last_price - 1
+        return {
+            'method': method,
+            'paths': paths,
+            'horizon': horizon,
+            'dtype': dtype.name,
+            'last_price': float(last_price),
+            'expected_return': float(returns.mean()),
+            'var': {str(level): float(-np.quantile(returns, 1 - level)) for level in confidence},
+            'cvar': {str(level): ScenarioService._cvar(returns, level) for level in confidence},
+            'terminal_percentiles': {
+                str(q): float(value) for q, value in zip(PERCENTILES, np.percentile(terminal, PERCENTILES))
+            },
+            'probability_of_touch': {
+                f"{barrier:+.0%}": float(count / paths) for barrier, count in zip(barriers, touched)
+            },
+        }
+
+    @staticmethod
+    def _paths(
+        rng: np.random.Generator,
+        shocks: np.ndarray,
+        horizon: int,
+        paths: int,
+        chunk_size: int
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield (first path, cumulated shocks) blocks of at most chunk_size paths"""
+        for start in range(0, paths, chunk_size):
+            count = min(chunk_size, paths - start)
+            block = shocks[rng.integers(0, len(shocks), size=(count, horizon), dtype=np.int32)]
+            yield start, np.cumsum(block, axis=1, out=block)
+
+    @staticmethod
+    def _touches(block: np.ndarray, last_price: float, barriers: np.ndarray) -> np.ndarray:
+        if not len(barriers):
+            return np.zeros(0, dtype=np.int64)
+        levels = last_price * (1 + barriers)
+        high, low = block.max(axis=1), block.min(axis=1)
+        return np.array([
+            np.count_nonzero(high >= level) if barrier > 0 else np.count_nonzero(low <= level)
+            for barrier, level in zip(barriers, levels)
+        ], dtype=np.int64)
+
+    @staticmethod
+    def _cvar(returns: np.ndarray, level: float) -> float:
+        threshold = np.quantile(returns, 1 - level)
+        return float(-returns[returns <= threshold].mean())
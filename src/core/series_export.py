@@ -0,0 +1,243 @@
+import importlib.util
+import io
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Literal, Optional, Sequence, Tuple
+
+from src.core.data_ingestion import DataIngestionService
+from src.core.feature_engine import ALL_FEATURES, FeatureEngine, FeaturePanel
+from src.core.forecast_engines import AUTO_ARIMA, forecast_many
+from src.core.model_registry import ModelRegistry, get_model_registry
+from src.core.prediction import PredictionService
+from src.core.price_store import PriceStore, get_price_store
+
+ARROW = 'arrow'
+PARQUET = 'parquet'
+JSON = 'json'
+
+MEDIA_TYPES = {
+    ARROW: 'application/vnd.apache.arrow.stream',
+    PARQUET: 'application/vnd.apache.parquet',
+    JSON: 'application/json',
+}
+
+# Request-level format names, kept in sync with MEDIA_TYPES
+SeriesFormat = Literal['arrow', 'parquet', 'json']
+
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume')
+FORECAST_COLUMNS = ('Forecast', 'Forecast_Lower', 'Forecast_Upper')
+SERIES_COLUMNS = PRICE_COLUMNS + ALL_FEATURES + FORECAST_COLUMNS
+
+# Request-level column names, kept in sync with SERIES_COLUMNS
+SeriesColumn = Literal[
+    'Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume',
+    'Returns', 'MA_20', 'MA_50', 'Returns_Volatility', 'RSI', 'Rolling_Mean', 'Rolling_Std',
+    'Forecast', 'Forecast_Lower', 'Forecast_Upper'
+]
+
+# Extra calendar days fetched before start_date so the longest window (MA_50)
+# is complete on the first exported row
+WARMUP_DAYS = 100
+
+
+class FormatUnavailableError(RuntimeError):
+    """Raised when a columnar format is requested without pyarrow installed"""
+
+
+def arrow_available() -> bool:
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def negotiate_format(requested: Optional[str] = None, accept: Optional[str] = None) -> str:
+    """
+    Pick the response format from an explicit choice or the Accept header
+
+    An explicit Arrow or Parquet request fails without pyarrow; through the
+    Accept header they are only preferred when pyarrow is installed, and
+    JSON is the fallback.
+
+    Args:
+        requested (str): Format named by the client, one of MEDIA_TYPES
+        accept (str): Accept header value
+
+    Returns:
+        str: Format to serialize with
+    """
+    if requested:
+        if requested != JSON and not arrow_available():
+            raise FormatUnavailableError(f"{requested} output needs pyarrow, install it or request json")
+        return requested
+    if accept and arrow_available():
+        for media_range in accept.split(','):
+            media_type = media_range.split(';')[0].strip()
+            for name, candidate in MEDIA_TYPES.items():
+                if media_type == candidate:
+                    return name
+    return JSON
+
+
+class SeriesExportService:
+    def __init__(self, store: Optional[PriceStore] = None, registry: Optional[ModelRegistry] = None):
+        """
+        Initialize the series exporter
+
+        Args:
+            store (PriceStore): Price store, the shared store by default
+            registry (ModelRegistry): Model registry, the shared registry by default
+        """
+        self.store = store or get_price_store()
+        self.registry = registry or get_model_registry()
+
+    def build_frame(
+        self,
+        tickers: Sequence[str],
+        start_date: str,
+        end_date: str,
+        columns: Optional[Iterable[str]] = None,
+        periods: int = 7,
+        engine: str = AUTO_ARIMA
+    ) -> pd.DataFrame:
+        """
+        Lay out prices, features and forecasts of several tickers as one long table
+
+        Features are computed by the FeatureEngine, once for every group of
+        tickers trading on the same calendar, over a window that starts
+        WARMUP_DAYS early, so they are complete from start_date. Forecasts
+        use the same preprocessed series as /analyze and follow the history
+        as rows dated on the next business days. Only the requested columns
+        are computed.
+
+        Args:
+            tickers (Sequence[str]): Stock ticker symbols
+            start_date (str): First date to include
+            end_date (str): First date to exclude
+            columns (Iterable[str]): Columns to export, see SERIES_COLUMNS; all by default
+            periods (int): Number of periods to forecast
+            engine (str): Forecasting engine
+
+        Returns:
+            pd.DataFrame: Date, Ticker and the requested columns, sorted by ticker then date
+        """
+        try:
+            columns = self.resolve_columns(columns)
+            tickers = list(dict.fromkeys(tickers))
+            fetch_start = (pd.Timestamp(start_date) - pd.Timedelta(days=WARMUP_DAYS)).strftime('%Y-%m-%d')
+            start = pd.Timestamp(start_date)
+
+            raw = self.store.get_many(tickers, fetch_start, end_date)
+            empty = [ticker for ticker in tickers if raw[ticker].empty]
+            if empty:
+                raise ValueError(f"No data found for {empty} in the given date range")
+
+            features = [col for col in columns if col in ALL_FEATURES]
+            panels = self._feature_panels(raw, tickers, features) if features else {}
+
+            parts = []
+            for ticker in tickers:
+                history = raw[ticker].loc[raw[ticker].index >= start]
+                part = {'Date': history.index.to_numpy(), 'Ticker': ticker}
+                for col in columns:
+                    if col in PRICE_COLUMNS:
+                        part[col] = history[col].to_numpy(dtype=np.float64)
+                if features:
+                    panel = panels[ticker]
+                    rows = panel.index.get_indexer(history.index)
+                    col_index = panel.tickers.get_loc(ticker)
+                    for name in features:
+                        part[name] = panel.features[name][rows, col_index]
+                parts.append(pd.DataFrame(part))
+
+            frame = pd.concat(parts, ignore_index=True)
+            if any(col in FORECAST_COLUMNS for col in columns):
+                frame = pd.concat([frame, self._forecast_rows(raw, start, tickers, periods, engine)], ignore_index=True)
+            frame = frame.sort_values(['Ticker', 'Date'], kind='stable', ignore_index=True)
+
+            return frame[['Date', 'Ticker'] + columns]
+        except Exception as e:
+            raise ValueError(f"Series export error: {str(e)}")
+
+    @staticmethod
+    def resolve_columns(columns: Optional[Iterable[str]] = None) -> List[str]:
+        """Validate a column projection, all columns when None or empty"""
+        requested = list(dict.fromkeys(columns or SERIES_COLUMNS))
+        unknown = set(requested) - set(SERIES_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown series columns: {sorted(unknown)}, expected some of {list(SERIES_COLUMNS)}")
+        return requested
+
+    @staticmethod
+    def _feature_panels(raw: Dict[str, pd.DataFrame], tickers: List[str], features: List[str]) -> Dict[str, FeaturePanel]:
+        # One panel over the union of all dates would leave gaps in the
+        # windows of tickers missing some of them (e.g. stocks mixed with a
+        # ticker trading on weekends), so each calendar gets its own panel
+        calendars: Dict[bytes, List[str]] = {}
+        for ticker in tickers:
+            calendars.setdefault(raw[ticker].index.asi8.tobytes(), []).append(ticker)
+
+        panels = {}
+        for group in calendars.values():
+            panel = FeatureEngine.compute({ticker: raw[ticker] for ticker in group}, features=features, dtype=np.float64)
+            panels.update(dict.fromkeys(group, panel))
+        return panels
+
+    def _forecast_rows(
+        self,
+        raw: Dict[str, pd.DataFrame],
+        start: pd.Timestamp,
+        tickers: List[str],
+        periods: int,
+        engine: str
+    ) -> pd.DataFrame:
+        series = {
+            ticker: DataIngestionService._preprocess_data(raw[ticker].loc[raw[ticker].index >= start])['Close']
+            for ticker in tickers
+        }
+        if engine == AUTO_ARIMA:
+            forecasts = {}
+            for ticker, close in series.items():
+                result = PredictionService.forecast_prices(close, periods, ticker=ticker, registry=self.registry)['prediction_results']
+                forecasts[ticker] = (np.asarray(result['forecast']), np.asarray(result['confidence_interval']))
+        else:
+            forecasts = forecast_many(series, engine, periods)
+
+        parts = []
+        for ticker in tickers:
+            forecast, conf_int = forecasts[ticker]
+            dates = pd.bdate_range(raw[ticker].index[-1] + pd.offsets.BDay(), periods=periods)
+            parts.append(pd.DataFrame({
+                'Date': dates.to_numpy(), 'Ticker': ticker,
+                'Forecast': forecast, 'Forecast_Lower': conf_int[:, 0], 'Forecast_Upper': conf_int[:, 1],
+            }))
+        return pd.concat(parts, ignore_index=True)
+
+    @staticmethod
+    def serialize(frame: pd.DataFrame, fmt: str) -> Tuple[bytes, str]:
+        """
+        Encode a table as an Arrow IPC stream, a Parquet file or JSON
+
+        Args:
+            frame (pd.DataFrame): Table from build_frame
+            fmt (str): One of MEDIA_TYPES
+
+        Returns:
+            Tuple of the encoded bytes and their media type
+        """
+        if fmt == JSON:
+            # {"columns": [...], "data": [[...], ...]}; missing values become null
+            return frame.to_json(orient='split', date_format='iso', index=False).encode(), MEDIA_TYPES[JSON]
+        if fmt not in MEDIA_TYPES:
+            raise ValueError(f"Unknown series format: {fmt}, expected one of {list(MEDIA_TYPES)}")
+        if not arrow_available():
+            raise FormatUnavailableError(f"{fmt} output needs pyarrow, install it or request json")
+
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        sink = io.BytesIO()
+        if fmt == ARROW:
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+        else:
+            import pyarrow.parquet as pq
+            pq.write_table(table, sink)
+        return sink.getvalue(), MEDIA_TYPES[fmt]
@@ -0,0 +1,484 @@
+"""
+Scheduled pre-market cache warming for a watchlist
+
+The first analysis of the day for a ticker pays for the download, the
+Auto ARIMA search, the LLM call and the charts. WarmupScheduler runs the
+analysis for a configured watchlist at set market times (weekdays, New York
+time), highest priority first, with at most `concurrency` runs in flight and
+their starts spaced `stagger` seconds apart so warming never takes all the
+CPU.
+
+Only the configured windows are warmed: each WarmWindow is one lookback
+ending today, one engine and one stage set. The response cache, the model
+registry and the LLM cache are keyed on the exact request or series, so
+they only serve requests for those same windows; any other start date,
+engine or stage set is a cold analysis apart from the downloaded prices.
+List every window clients ask for (see parse_windows). It runs inside the
+API (WARMUP_TICKERS, see configured_scheduler) and fills the response cache
+too, or as a separate worker filling the shared price store, model
+registry and LLM cache:
+
+    python -m src.core.warmup --tickers AAPL:10,MSFT:5,GOOG --lookback-days 365,730 --nice 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, time as dtime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.core.forecast_engines import AUTO_ARIMA
+from src.core.response_cache import MARKET_TZ
+from src.utils import metrics
+
+DEFAULT_TIMES = '08:30'
+DEFAULT_LOOKBACK_DAYS = 365
+
+WARMUP_TICKERS = metrics.registry.counter(
+    'warmup_tickers_total', 'Watchlist tickers warmed', ('outcome',)
+)
+WARMUP_SECONDS = metrics.registry.histogram(
+    'warmup_ticker_seconds', 'Duration of one watchlist ticker warm-up'
+)
+
+
+@dataclass(frozen=True, slots=True)
+class WatchItem:
+    """Watchlist entry, higher priorities are warmed first"""
+    ticker: str
+    priority: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class WarmWindow:
+    """One request shape to warm: [today - lookback_days, today), an engine and a stage set"""
+    lookback_days: int = DEFAULT_LOOKBACK_DAYS
+    engine: str = AUTO_ARIMA
+    stages: Optional[Tuple[str, ...]] = None
+
+    def dates(self, today: Optional[datetime] = None) -> Tuple[str, str]:
+        """(start_date, end_date) as YYYY-MM-DD, matching /analyze's default end date of today"""
+        today = today or datetime.now()
+        start = today - timedelta(days=self.lookback_days)
+        return start.strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d')
+
+
+def parse_watchlist(spec: str) -> List[WatchItem]:
+    """
+    Parse a comma-separated watchlist of TICKER or TICKER:PRIORITY entries
+
+    Args:
+        spec (str): e.g. 'AAPL:10,MSFT:5,GOOG'
+
+    Returns:
+        List of WatchItem in warming order, highest priority first, ties in listed order
+    """
+    items = []
+    for entry in spec.split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        ticker, _, priority = entry.partition(':')
+        try:
+            items.append(WatchItem(ticker.strip().upper(), int(priority) if priority else 0))
+        except ValueError:
+            raise ValueError(f"Invalid watchlist entry: {entry}, expected TICKER or TICKER:PRIORITY")
+    return sorted(items, key=lambda item: -item.priority)
+
+
+def parse_times(spec: str) -> Tuple[dtime, ...]:
+    """
+    Parse comma-separated HH:MM run times, in market time
+
+    Args:
+        spec (str): e.g. '08:30,12:00'
+
+    Returns:
+        Sorted tuple of times
+    """
+    try:
+        return tuple(sorted(dtime.fromisoformat(value.strip()) for value in spec.split(',') if value.strip()))
+    except ValueError as e:
+        raise ValueError(f"Invalid warm-up times: {spec}, expected HH:MM[,HH:MM...] ({str(e)})")
+
+
+def parse_stages(spec: str) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated stage list, None (the default stages) when empty
+
+    Args:
+        spec (str): e.g. 'forecast,charts'
+
+    Returns:
+        Tuple of stage names, or None
+    """
+    return tuple(stage.strip() for stage in spec.split(',') if stage.strip()) or None
+
+
+def parse_windows(lookbacks: str, engines: str = AUTO_ARIMA, stages: str = '') -> List[WarmWindow]:
+    """
+    Every combination of lookbacks, engines and stage sets
+
+    Args:
+        lookbacks (str): Comma-separated lookbacks in days, e.g. '365,730'
+        engines (str): Comma-separated engines, e.g. 'auto_arima,holt'
+        stages (str): Semicolon-separated stage sets, e.g. 'forecast,charts;forecast';
+            an empty set means the default stages
+
+    Returns:
+        List of WarmWindow, lookbacks first, then engines, then stage sets
+    """
+    try:
+        days = [int(value) for value in lookbacks.split(',') if value.strip()] or [DEFAULT_LOOKBACK_DAYS]
+    except ValueError:
+        raise ValueError(f"Invalid warm-up lookbacks: {lookbacks}, expected DAYS[,DAYS...]")
+    names = [engine.strip() for engine in engines.split(',') if engine.strip()] or [AUTO_ARIMA]
+    stage_sets = list(dict.fromkeys(parse_stages(spec) for spec in stages.split(';'))) or [None]
+    return [
+        WarmWindow(lookback, engine, stage_set)
+        for lookback in days for engine in names for stage_set in stage_sets
+    ]
+
+
+def next_run(times: Sequence[dtime], now: Optional[datetime] = None) -> datetime:
+    """
+    Next weekday run time after `now`
+
+    Args:
+        times (Sequence[dtime]): Run times in market time
+        now (datetime): Current time, for testing
+
+    Returns:
+        datetime: Aware datetime in the market timezone
+    """
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    day = now.date()
+    while True:
+        if day.weekday() < 5:
+            for at in times:
+                when = datetime.combine(day, at, tzinfo=MARKET_TZ)
+                if when > now:
+                    return when
+        day += timedelta(days=1)
+
+
+class WarmupScheduler:
+    """
+    Runs a watchlist through an analysis runner at set times and keeps the last run's status
+
+    `runner(ticker, start_date, end_date, engine=..., stages=...)` is a
+    coroutine function like the JobManager's. A ticker's windows run one
+    after the other in its slot, so later ones reuse its downloaded prices;
+    a dict the runner returns (e.g. the cache status and stage timings) is
+    merged into that window's status.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[..., Awaitable[Any]],
+        watchlist: Iterable[WatchItem],
+        times: Sequence[dtime] = parse_times(DEFAULT_TIMES),
+        concurrency: int = 1,
+        stagger: float = 1.0,
+        lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+        engine: str = AUTO_ARIMA,
+        stages: Optional[Tuple[str, ...]] = None,
+        status_path: Optional[str] = None,
+        windows: Optional[Sequence[WarmWindow]] = None
+    ):
+        """
+        Initialize the scheduler
+
+        Args:
+            runner (Callable): Coroutine function running one analysis
+            watchlist (Iterable[WatchItem]): Tickers to warm, run by descending priority
+            times (Sequence[dtime]): Weekday run times in market time
+            concurrency (int): Analyses run at once
+            stagger (float): Minimum seconds between two analysis starts
+            lookback_days (int): History warmed, start_date is this many days before today
+            engine (str): Forecasting engine, as requests will ask for it
+            stages (Tuple[str, ...]): Stages, as requests will ask for them; None for the default
+            status_path (str): JSON file the last run's status is written to, for other processes
+            windows (Sequence[WarmWindow]): Request shapes to warm, replacing the single
+                window given by lookback_days, engine and stages
+        """
+        self.runner = runner
+        self.watchlist = sorted(watchlist, key=lambda item: -item.priority)
+        self.times = tuple(times)
+        self.concurrency = max(1, concurrency)
+        self.stagger = stagger
+        self.windows = tuple(windows or (WarmWindow(lookback_days, engine, stages),))
+        self.status_path = status_path
+
+        self.last_run: Optional[Dict[str, Any]] = None
+        self.next_run_at: Optional[datetime] = None
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+
+    def window(self, today: Optional[datetime] = None) -> Tuple[str, str]:
+        """
+        (start_date, end_date) of the first configured window
+
+        Args:
+            today (datetime): Current day, for testing
+
+        Returns:
+            Tuple of YYYY-MM-DD dates
+        """
+        return self.windows[0].dates(today)
+
+    async def run_once(self, trigger: str = 'manual') -> Dict[str, Any]:
+        """
+        Warm the whole watchlist now
+
+        A run requested while another is in progress is skipped.
+
+        Args:
+            trigger (str): What started the run, reported in the status
+
+        Returns:
+            Dict with the run's status, see status()
+        """
+        if self._running:
+            return self.last_run
+        self._running = True
+        try:
+            today = datetime.now()
+            run = {
+                'trigger': trigger,
+                'end_date': today.strftime('%Y-%m-%d'),
+                'started_at': time.time(),
+                'finished_at': None,
+                'seconds': None,
+                'tickers': {item.ticker: {'priority': item.priority, 'status': 'pending'} for item in self.watchlist},
+            }
+            self.last_run = run
+            began = time.perf_counter()
+            windows = [(window, *window.dates(today)) for window in self.windows]
+
+            # Launch in priority order; the semaphore caps runs in flight and
+            # the pause spaces their starts out
+            slots = asyncio.Semaphore(self.concurrency)
+            tasks = []
+            for index, item in enumerate(self.watchlist):
+                if index and self.stagger:
+                    await asyncio.sleep(self.stagger)
+                await slots.acquire()
+                tasks.append(asyncio.create_task(self._warm(item, windows, run, slots)))
+            await asyncio.gather(*tasks)
+
+            run['finished_at'] = time.time()
+            run['seconds'] = round(time.perf_counter() - began, 3)
+            return run
+        finally:
+            self._running = False
+            self._save()
+
+    async def _warm(
+        self,
+        item: WatchItem,
+        windows: List[Tuple[WarmWindow, str, str]],
+        run: Dict[str, Any],
+        slots: asyncio.Semaphore
+    ) -> None:
+        entry = run['tickers'][item.ticker]
+        entry['status'] = 'running'
+        entry['windows'] = []
+        began = time.perf_counter()
+        try:
+            for window, start_date, end_date in windows:
+                result = {'start_date': start_date, 'engine': window.engine, 'stages': self._stage_list(window)}
+                entry['windows'].append(result)
+                try:
+                    details = await self.runner(
+                        item.ticker, start_date, end_date, engine=window.engine, stages=window.stages
+                    )
+                    result.update(details if isinstance(details, dict) else {})
+                    result['status'] = 'ok'
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    result['status'] = 'failed'
+                    result['error'] = str(e)
+        finally:
+            slots.release()
+
+        failed = [result for result in entry['windows'] if result['status'] == 'failed']
+        entry['status'] = 'ok' if not failed else 'failed' if len(failed) == len(windows) else 'partial'
+        if failed:
+            entry['error'] = failed[0]['error']
+        elapsed = time.perf_counter() - began
+        entry['seconds'] = round(elapsed, 3)
+        WARMUP_TICKERS.inc(outcome=entry['status'])
+        WARMUP_SECONDS.observe(elapsed)
+
+    @staticmethod
+    def _stage_list(window: WarmWindow) -> Optional[List[str]]:
+        return list(window.stages) if window.stages else None
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Configuration, next run and the last run's per-ticker status and timings
+
+        Returns:
+            Dict for the status endpoint
+        """
+        return {
+            'watchlist': [{'ticker': item.ticker, 'priority': item.priority} for item in self.watchlist],
+            'times': [at.strftime('%H:%M') for at in self.times],
+            'timezone': str(MARKET_TZ),
+            'concurrency': self.concurrency,
+            'stagger': self.stagger,
+            'windows': [
+                {'lookback_days': window.lookback_days, 'engine': window.engine, 'stages': self._stage_list(window)}
+                for window in self.windows
+            ],
+            'running': self._running,
+            'next_run': self.next_run_at.isoformat() if self.next_run_at else None,
+            'last_run': self.last_run,
+        }
+
+    def start(self, run_now: bool = False) -> None:
+        """
+        Start the schedule on the running event loop
+
+        Args:
+            run_now (bool): Also warm once immediately
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop(run_now))
+
+    async def stop(self) -> None:
+        """Cancel the schedule and any run in progress"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.next_run_at = None
+
+    async def _loop(self, run_now: bool) -> None:
+        if run_now:
+            await self.run_once('startup')
+        while True:
+            self.next_run_at = next_run(self.times)
+            await asyncio.sleep(max(0.0, (self.next_run_at - datetime.now(MARKET_TZ)).total_seconds()))
+            await self.run_once('schedule')
+
+    def _save(self) -> None:
+        if not self.status_path:
+            return
+        tmp = f"{self.status_path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.status(), f)
+        os.replace(tmp, self.status_path)
+
+
+def read_status(path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Last status written by a warm-up worker in another process
+
+    Args:
+        path (str): Status file, WARMUP_STATUS_PATH when None
+
+    Returns:
+        The status dict, or None when there is none
+    """
+    path = path or os.getenv('WARMUP_STATUS_PATH')
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def configured_scheduler(runner: Callable[..., Awaitable[Any]]) -> Optional[WarmupScheduler]:
+    """
+    Scheduler configured by the WARMUP_* environment variables
+
+    WARMUP_TICKERS is the watchlist (TICKER[:PRIORITY],...); WARMUP_TIMES,
+    WARMUP_CONCURRENCY (1), WARMUP_STAGGER (seconds, 1) and WARMUP_STATUS_PATH
+    tune it. The windows warmed are every combination of WARMUP_LOOKBACK_DAYS
+    (DAYS,... 365), WARMUP_ENGINES (ENGINE,... auto_arima) and WARMUP_STAGES
+    (STAGE,...;STAGE,... the default stages), see parse_windows.
+
+    Args:
+        runner (Callable): Coroutine function running one analysis
+
+    Returns:
+        WarmupScheduler, or None when no watchlist is configured
+    """
+    watchlist = parse_watchlist(os.getenv('WARMUP_TICKERS', ''))
+    if not watchlist:
+        return None
+    return WarmupScheduler(
+        runner,
+        watchlist,
+        times=parse_times(os.getenv('WARMUP_TIMES', DEFAULT_TIMES)),
+        concurrency=int(os.getenv('WARMUP_CONCURRENCY', 1)),
+        stagger=float(os.getenv('WARMUP_STAGGER', 1.0)),
+        status_path=os.getenv('WARMUP_STATUS_PATH') or None,
+        windows=parse_windows(
+            os.getenv('WARMUP_LOOKBACK_DAYS', str(DEFAULT_LOOKBACK_DAYS)),
+            os.getenv('WARMUP_ENGINES', AUTO_ARIMA),
+            os.getenv('WARMUP_STAGES', ''),
+        ),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', default=os.getenv('WARMUP_TICKERS', ''), help='TICKER[:PRIORITY],...')
+    parser.add_argument('--times', default=os.getenv('WARMUP_TIMES', DEFAULT_TIMES), help='HH:MM,... market time')
+    parser.add_argument('--concurrency', type=int, default=int(os.getenv('WARMUP_CONCURRENCY', 1)))
+    parser.add_argument('--stagger', type=float, default=float(os.getenv('WARMUP_STAGGER', 1.0)))
+    parser.add_argument('--lookback-days', default=os.getenv('WARMUP_LOOKBACK_DAYS', str(DEFAULT_LOOKBACK_DAYS)), help='DAYS,...')
+    parser.add_argument('--stages', default=os.getenv('WARMUP_STAGES', ''), help='stage,...;stage,... as requests ask for them')
+    parser.add_argument('--engines', default=os.getenv('WARMUP_ENGINES', AUTO_ARIMA), help='engine,...')
+    parser.add_argument('--status-path', default=os.getenv('WARMUP_STATUS_PATH'))
+    parser.add_argument('--nice', type=int, default=0, help='lower the worker\'s CPU priority by this much')
+    parser.add_argument('--once', action='store_true', help='warm once now and exit')
+    args = parser.parse_args()
+
+    watchlist = parse_watchlist(args.tickers)
+    if not watchlist:
+        parser.error('no tickers to warm, pass --tickers or set WARMUP_TICKERS')
+    if args.nice:
+        os.nice(args.nice)
+
+    from src.core.executors import shutdown_executors
+    from src.core.financial_analysis import FinancialAnalysisSystem
+
+    system = FinancialAnalysisSystem()
+
+    async def runner(ticker, start_date, end_date, engine=AUTO_ARIMA, stages=None):
+        state = await system.arun_analysis(ticker, start_date, end_date, engine, stages)
+        return {'stage_timings': state.stage_timings}
+
+    scheduler = WarmupScheduler(
+        runner,
+        watchlist,
+        times=parse_times(args.times),
+        concurrency=args.concurrency,
+        stagger=args.stagger,
+        status_path=args.status_path,
+        windows=parse_windows(args.lookback_days, args.engines, args.stages),
+    )
+
+    async def serve():
+        if args.once:
+            print(json.dumps(await scheduler.run_once('cli'), indent=2))
+            return
+        scheduler.start()
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_executors()
+
+
+if __name__ == '__main__':
+    main()
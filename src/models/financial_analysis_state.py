@@ -1,18 +1,95 @@
-from typing import List, Dict, Any
-from typing_extensions import TypedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 
-class FinancialAnalysisState(TypedDict):
+
+@dataclass(slots=True)
+class PriceFrame:
+    """
+    Price bars held in one float64 buffer
+
+    Columns, tails and the DataFrame returned by to_frame() are views over
+    the same buffer, so stages share the bars without copying them.
+    """
+    index: np.ndarray
+    columns: Tuple[str, ...]
+    values: np.ndarray
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> 'PriceFrame':
+        """
+        Wrap a numeric DataFrame, copying only if it is not one float64 block already
+
+        Args:
+            frame (pd.DataFrame): Bars indexed by date
+
+        Returns:
+            PriceFrame
+        """
+        return cls(
+            index=frame.index.to_numpy(dtype='datetime64[ns]'),
+            columns=tuple(str(col) for col in frame.columns),
+            values=frame.to_numpy(dtype=np.float64),
+        )
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, self.columns.index(name)]
+
+    def tail(self, rows: int) -> 'PriceFrame':
+        return PriceFrame(self.index[-rows:], self.columns, self.values[-rows:])
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame over the shared buffer; writing to it writes to this PriceFrame"""
+        return pd.DataFrame(
+            self.values,
+            index=pd.DatetimeIndex(self.index, name='Date'),
+            columns=list(self.columns),
+            copy=False
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.index.nbytes
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+@dataclass(slots=True)
+class FinancialAnalysisState:
     """
     State management for the financial analysis workflow
+
+    Holds the preprocessed bars and the forecast as arrays; the raw download
+    and the fitted model are not kept, the price store and model registry
+    already hold them.
     """
     ticker: str
-    start_date: str
-    end_date: str
-    raw_data: pd.DataFrame
-    preprocessed_data: pd.DataFrame
-    prediction_model: Any
-    prediction_results: Dict[str, Any]
-    market_insights: str
-    visualization_paths: List[str]
-    analyst_feedback: str
\ No newline at end of file
+    start_date: str = ''
+    end_date: str = ''
+    prices: Optional[PriceFrame] = None
+    forecast: Optional[np.ndarray] = None
+    conf_int: Optional[np.ndarray] = None
+    model_cache: Optional[str] = None
+    market_insights: Optional[str] = None
+    visualization_paths: Optional[List[str]] = None
+    scenarios: Optional[Dict[str, Any]] = None
+    stage_timings: Optional[Dict[str, Optional[float]]] = None
+    analyst_feedback: str = ''
+
+    @property
+    def prediction_results(self) -> Optional[Dict[str, list]]:
+        """Forecast and confidence intervals as JSON-ready lists"""
+        if self.forecast is None:
+            return None
+        return {
+            'forecast': self.forecast.tolist(),
+            'confidence_interval': self.conf_int.tolist() if self.conf_int is not None else [],
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate bytes held by the arrays of this state"""
+        arrays = (self.forecast, self.conf_int)
+        return (self.prices.nbytes if self.prices is not None else 0) + sum(a.nbytes for a in arrays if a is not None)
@@ -0,0 +1,69 @@
+import asyncio
+import time
+from typing import AsyncIterator
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count using the ~4 characters per token rule of thumb
+
+    Args:
+        text (str): Prompt or completion text
+
+    Returns:
+        int: Estimated number of tokens
+    """
+    return (len(text) + 3) // 4
+
+
+class FakeLLM:
+    """
+    Offline stand-in for ChatGroq used by tests and benchmarks
+
+    Returns a canned response after an optional simulated latency and counts
+    how many prompts it received and roughly how many tokens they held.
+    Streaming yields the response word by word, spreading the latency
+    across the chunks.
+    """
+
+    model_name = 'fake'
+
+    def __init__(self, response: str = "Market insight unavailable offline.", latency: float = 0.0):
+        """
+        Initialize the fake LLM
+
+        Args:
+            response (str): Content returned for every prompt
+            latency (float): Seconds to sleep per call to mimic a remote model
+        """
+        self.response = response
+        self.latency = latency
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.streamed_chunks = 0
+
+    def invoke(self, prompt: str) -> AIMessage:
+        self._record(prompt)
+        if self.latency:
+            time.sleep(self.latency)
+        return AIMessage(content=self.response)
+
+    async def ainvoke(self, prompt: str) -> AIMessage:
+        self._record(prompt)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return AIMessage(content=self.response)
+
+    async def astream(self, prompt: str) -> AsyncIterator[AIMessageChunk]:
+        self._record(prompt)
+        words = self.response.split(' ')
+        for i, word in enumerate(words):
+            if self.latency:
+                await asyncio.sleep(self.latency / len(words))
+            self.streamed_chunks += 1
+            yield AIMessageChunk(content=word if i == 0 else ' ' + word)
+
+    def _record(self, prompt: str) -> None:
+        self.calls += 1
+        self.prompt_tokens += estimate_tokens(prompt)
@@ -1,50 +1,245 @@
+import atexit
+import copy
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
+import queue
+import threading
+from typing import Dict, Optional
 
-def setup_logger(name: str = 'financial_analysis', log_level: int = logging.INFO):
+from src.utils import metrics
+
+DROP = 'drop'
+BLOCK = 'block'
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Queue handler that never grows its queue past a fixed size
+
+    When the queue is full, records are either dropped and counted (the
+    default, so logging can never stall a request) or the caller blocks
+    until the listener catches up.
+    """
+
+    def __init__(self, log_queue: queue.Queue, policy: str = DROP):
+        if policy not in (DROP, BLOCK):
+            raise ValueError(f"Unknown log queue policy: {policy}, expected '{DROP}' or '{BLOCK}'")
+        super().__init__(log_queue)
+        self.policy = policy
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments now but keep the traceback apart from the
+        # message, so the listener's formatters can still place it
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.policy == BLOCK:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LazyRotatingFileHandler(RotatingFileHandler):
+    """Rotating file handler that creates its directory and file on the first record"""
+
+    def __init__(self, filename: str, **kwargs):
+        super().__init__(filename, delay=True, **kwargs)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class BoundedQueueListener(QueueListener):
+    """Queue listener that can be stopped while its queue is full"""
+
+    def enqueue_sentinel(self) -> None:
+        # Wait for the listener thread to make room instead of raising queue.Full
+        self.queue.put(self._sentinel)
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including `extra` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'location': f"{record.filename}:{record.lineno}",
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key not in entry:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a fixed fraction of low-level records
+
+    Records at or below `level` pass at `rate` (evenly spaced rather than
+    random, so the output is reproducible); higher levels always pass.
+    """
+
+    def __init__(self, rate: float, level: int = logging.DEBUG):
+        super().__init__()
+        self.rate = rate
+        self.level = level
+        self._credit = 0.0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.level:
+            return True
+        with self._lock:
+            self._credit += self.rate
+            if self._credit >= 1.0:
+                self._credit -= 1.0
+                return True
+            return False
+
+
+# Queue listener per configured logger name
+_listeners: Dict[str, BoundedQueueListener] = {}
+_handlers: Dict[str, BoundedQueueHandler] = {}
+_setup_lock = threading.Lock()
+
+
+def setup_logger(
+    name: str = 'financial_analysis',
+    log_level: int = logging.INFO,
+    json_format: Optional[bool] = None,
+    queue_size: Optional[int] = None,
+    policy: Optional[str] = None,
+    debug_sample_rate: Optional[float] = None,
+    log_dir: Optional[str] = None
+):
     """
     Set up a logger with file and console output
-    
+
+    Records are put on a bounded in-memory queue and written to the console
+    and the rotating log file by a background listener thread, so logging
+    from the request path never waits on disk or terminal I/O. Calling this
+    again for the same name replaces the previous configuration instead of
+    adding handlers. Options left as None are read from the LOG_FORMAT
+    ('text' or 'json'), LOG_QUEUE_SIZE, LOG_QUEUE_POLICY ('drop' or 'block'),
+    LOG_DEBUG_SAMPLE_RATE and LOG_DIR environment variables.
+
     Args:
         name (str): Logger name
         log_level (int): Logging level
-    
+        json_format (bool): Write one JSON object per record instead of text
+        queue_size (int): Records buffered before the policy applies
+        policy (str): 'drop' to discard records when the queue is full, 'block' to wait
+        debug_sample_rate (float): Fraction of DEBUG records kept
+        log_dir (str): Directory of the rotating log file
+
     Returns:
         logging.Logger: Configured logger
     """
-    # Ensure logs directory exists
-    os.makedirs('logs', exist_ok=True)
-    
-    # Create logger
-    logger = logging.getLogger(name)
-    logger.setLevel(log_level)
-    
+    json_format = os.getenv('LOG_FORMAT', 'text') == 'json' if json_format is None else json_format
+    queue_size = int(os.getenv('LOG_QUEUE_SIZE', 10000)) if queue_size is None else queue_size
+    policy = os.getenv('LOG_QUEUE_POLICY', DROP) if policy is None else policy
+    if debug_sample_rate is None:
+        debug_sample_rate = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', 1.0))
+    log_dir = os.getenv('LOG_DIR', 'logs') if log_dir is None else log_dir
+
     # Create console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(log_level)
-    
-    # Create file handler
-    file_handler = RotatingFileHandler(
-        f'logs/{name}.log', 
+
+    # Create file handler, the log directory and file appear with the first record
+    file_handler = LazyRotatingFileHandler(
+        os.path.join(log_dir, f'{name}.log'),
         maxBytes=10*1024*1024,  # 10MB
         backupCount=5
     )
     file_handler.setLevel(log_level)
-    
+
     # Create formatters
-    console_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s')
-    
+    if json_format:
+        console_formatter = file_formatter = JsonFormatter()
+    else:
+        console_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s')
+
     # Add formatters to handlers
     console_handler.setFormatter(console_formatter)
     file_handler.setFormatter(file_formatter)
-    
-    # Add handlers to logger
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    
+
+    # Only the queue handler runs on the caller's thread
+    queue_handler = BoundedQueueHandler(queue.Queue(maxsize=queue_size), policy)
+    if debug_sample_rate < 1.0:
+        queue_handler.addFilter(SamplingFilter(debug_sample_rate))
+    listener = BoundedQueueListener(queue_handler.queue, console_handler, file_handler, respect_handler_level=True)
+
+    # Create logger
+    logger = logging.getLogger(name)
+    logger.setLevel(log_level)
+
+    with _setup_lock:
+        _stop(name, logger)
+        logger.addHandler(queue_handler)
+        _handlers[name] = queue_handler
+        _listeners[name] = listener
+        listener.start()
+
     return logger
 
+
+def shutdown_logging(name: Optional[str] = None) -> None:
+    """
+    Write out queued records and stop the listener threads
+
+    Args:
+        name (str): Logger to shut down, all configured loggers when None
+    """
+    with _setup_lock:
+        for configured in ([name] if name is not None else list(_listeners)):
+            _stop(configured, logging.getLogger(configured))
+
+
+def _stop(name: str, logger: logging.Logger) -> None:
+    listener = _listeners.pop(name, None)
+    handler = _handlers.pop(name, None)
+    if handler is not None:
+        logger.removeHandler(handler)
+    if listener is not None:
+        # Drains the queue before returning
+        listener.stop()
+        for target in listener.handlers:
+            target.close()
+
+
+def _dropped_records():
+    with _setup_lock:
+        samples = [({'logger': name}, handler.dropped) for name, handler in _handlers.items()]
+    return [('log_records_dropped_total', 'counter', 'Log records dropped because the log queue was full', samples)]
+
+
+atexit.register(shutdown_logging)
+metrics.registry.register_collector('logging', _dropped_records)
+
 # Global logger instance
-logger = setup_logger()
\ No newline at end of file
+logger = setup_logger()
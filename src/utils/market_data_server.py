@@ -0,0 +1,174 @@
+"""
+Local stand-in for a remote market data service
+
+Serves SyntheticProvider bars over HTTP in the format HTTPProvider reads,
+with a simulated round trip, a server-side request rate limit answering 429
+with Retry-After, and an optional share of random 503 failures. It counts
+requests, tickers served and TCP connections, so connection pooling,
+request coalescing and throttling can be load-tested offline:
+
+    python -m src.utils.market_data_server --port 8900 --latency 0.2 --rate 5
+    MARKET_DATA_PROVIDER=http MARKET_DATA_URL=http://127.0.0.1:8900 uvicorn main:app
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from src.core.providers import SyntheticProvider
+
+
+class MarketDataServer:
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: float = 0.0,
+        rate: Optional[float] = None,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the server, port 0 picks a free port
+
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind
+            latency (float): Seconds each request takes
+            rate (float): Requests per second served before answering 429, unlimited when None
+            failure_rate (float): Share of requests answered with 503
+            seed (int): Seed for the failures
+        """
+        self.latency = latency
+        self.rate = rate
+        self.failure_rate = failure_rate
+        self.provider = SyntheticProvider()
+        self.stats: Dict[str, int] = {'requests': 0, 'tickers': 0, 'connections': 0, 'throttled': 0, 'failed': 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MarketDataServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='market-data-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'MarketDataServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _admit(self) -> Optional[int]:
+        """Count a request and return the status to fail it with, if any"""
+        with self._lock:
+            self.stats['requests'] += 1
+            if self.rate is not None:
+                now = time.monotonic()
+                if now - self._window_start >= 1.0:
+                    self._window_start, self._window_count = now, 0
+                self._window_count += 1
+                if self._window_count > self.rate:
+                    self.stats['throttled'] += 1
+                    return 429
+            if self.failure_rate and self._rng.random() < self.failure_rate:
+                self.stats['failed'] += 1
+                return 503
+        return None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so pooled clients reuse their connections
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.stats['connections'] += 1
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path != '/history':
+                    return self._send(404, {'detail': 'Not found'})
+
+                if server.latency:
+                    time.sleep(server.latency)
+                status = server._admit()
+                if status is not None:
+                    return self._send(status, {'detail': 'Throttled' if status == 429 else 'Unavailable'})
+
+                query = parse_qs(url.query)
+                try:
+                    tickers = [t for t in query['tickers'][0].split(',') if t]
+                    start, end = query['start'][0], query['end'][0]
+                except (KeyError, IndexError):
+                    return self._send(400, {'detail': 'tickers, start and end are required'})
+
+                frames = server.provider.download_many(tickers, start, end)
+                with server._lock:
+                    server.stats['tickers'] += len(tickers)
+                body = {
+                    ticker: json.loads(frame.to_json(orient='split', date_format='iso'))
+                    for ticker, frame in frames.items()
+                }
+                self._send(200, body)
+
+            def _send(self, status, body):
+                content = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                if status == 429:
+                    self.send_header('Retry-After', '1')
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--rate', type=float, default=None)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = MarketDataServer(args.host, args.port, args.latency, args.rate, args.failure_rate)
+    print(f"Serving synthetic bars on {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+        print(json.dumps(server.stats))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,326 @@
+"""
+In-process metrics in the Prometheus text exposition format
+
+Metrics live in a registry in this process and are rendered on demand by
+the /metrics endpoint, so nothing is pushed over the network. Components
+that already keep their own counters (the model registry, caches) are read
+at scrape time through collectors instead of being counted twice.
+"""
+import bisect
+import contextvars
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from a cached lookup to a cold Auto ARIMA search
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# A collector returns (name, type, help, [(labels, value), ...]) families
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    pairs = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonically increasing value per label set"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class Histogram:
+    """Bucketed observations per label set, with their count and sum"""
+
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: counts per bucket (the last one is +Inf) and the sum
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def count(self, **labels: str) -> int:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            return int(sum(state[:-1])) if state else 0
+
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            values = [(key, list(state)) for key, state in self._values.items()]
+        for key, state in values:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), state[:-1]):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, 'le': _format_value(bound)}, cumulative
+            yield f"{self.name}_count", labels, cumulative
+            yield f"{self.name}_sum", labels, state[-1]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """Initialize an empty metrics registry"""
+        self._metrics: Dict[str, object] = {}
+        self._collectors: Dict[str, Callable[[], Iterable[Family]]] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """
+        Return the counter called `name`, creating it on first use
+
+        Args:
+            name (str): Metric name, ending in _total by convention
+            documentation (str): HELP text
+            labelnames (Sequence[str]): Label names every increment must set
+
+        Returns:
+            Counter
+        """
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """
+        Return the histogram called `name`, creating it on first use
+
+        Args:
+            name (str): Metric name
+            documentation (str): HELP text
+            labelnames (Sequence[str]): Label names every observation must set
+            buckets (Sequence[float]): Upper bounds of the buckets
+
+        Returns:
+            Histogram
+        """
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def register_collector(self, name: str, collector: Callable[[], Iterable[Family]]) -> None:
+        """
+        Add a callback read on every scrape, replacing one of the same name
+
+        Args:
+            name (str): Collector name
+            collector (Callable): Returns (name, type, help, samples) families
+        """
+        with self._lock:
+            self._collectors[name] = collector
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format
+
+        A failing collector is skipped so one broken component does not
+        take the whole scrape down.
+
+        Returns:
+            str: Exposition text
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception:
+                continue
+            for name, kind, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return '\n'.join(lines) + '\n'
+
+    def _get_or_create(self, cls, name, documentation, labelnames, *args):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, *args)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
+
+
+# Shared process-wide registry rendered by /metrics
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    'analysis_stage_duration_seconds', 'Latency of analysis pipeline stages', ('stage',)
+)
+INPUT_ROWS = registry.histogram(
+    'analysis_input_rows', 'Preprocessed price rows fed to the forecast',
+    buckets=(50, 100, 250, 500, 1000, 2500, 5000, 10000)
+)
+ARIMA_SEARCH_FITS = registry.histogram(
+    'arima_search_fits', 'Candidate models fitted by one Auto ARIMA order search',
+    buckets=(1, 2, 4, 6, 8, 10, 15, 20, 30, 50)
+)
+HTTP_SECONDS = registry.histogram(
+    'http_request_duration_seconds', 'Latency of HTTP requests', ('method', 'route', 'status')
+)
+
+# Stage durations of the request being served, for its Server-Timing header
+_request_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    'request_timings', default=None
+)
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """
+    Record a pipeline stage duration
+
+    Args:
+        stage (str): Stage name
+        seconds (float): Stage duration
+    """
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+def observe_search(model) -> None:
+    """
+    Record how many candidates the order search behind `model` fitted
+
+    Args:
+        model: Model returned by PredictionService.fit_model
+    """
+    fits = getattr(model, 'search_fits_', None)
+    if fits is not None:
+        ARIMA_SEARCH_FITS.observe(fits)
+
+
+def server_timing(timings: Dict[str, float], total: float) -> str:
+    """
+    Format stage durations as a Server-Timing header value
+
+    Args:
+        timings (Dict[str, float]): Seconds per stage
+        total (float): Seconds spent on the whole request
+
+    Returns:
+        str: Header value with durations in milliseconds
+    """
+    entries = [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in timings.items()]
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ', '.join(entries)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency and adding a Server-Timing header
+
+    The header lists the pipeline stages that ran while the request was
+    served. Streaming responses send their headers before the stream ends,
+    so only the stages finished by then are listed.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        timings: Dict[str, float] = {}
+        token = _request_timings.set(timings)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                header = server_timing(timings, time.perf_counter() - started)
+                message = {**message, 'headers': list(message.get('headers', [])) + [
+                    (b'server-timing', header.encode('latin-1'))
+                ]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+            route = scope.get('route')
+            HTTP_SECONDS.observe(
+                time.perf_counter() - started,
+                method=scope['method'],
+                route=getattr(route, 'path', 'unmatched'),
+                status=status
+            )
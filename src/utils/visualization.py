@@ -1,76 +1,158 @@
-import matplotlib.pyplot as plt
+import hashlib
+import io
+import os
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
+
+from src.core.result_store import ResultStore
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+CHART_MEDIA_TYPES = {'png': 'image/png', 'svg': 'image/svg+xml'}
 
 class VisualizationService:
+    def __init__(self, store: Optional[ResultStore] = None, fmt: str = 'png', url_prefix: str = '/charts'):
+        """
+        Initialize the visualization service
+
+        Charts are drawn on standalone Agg figures, so renders from worker
+        threads do not share any pyplot state, and are kept in memory under a
+        content hash of their inputs instead of being written to disk.
+
+        Args:
+            store (ResultStore): Rendered charts by chart ID, the shared chart store by default
+            fmt (str): Image format, 'png' or 'svg'
+            url_prefix (str): Path the charts are served under
+        """
+        if fmt not in CHART_MEDIA_TYPES:
+            raise ValueError(f"Unsupported chart format: {fmt}")
+
+        self.store = store if store is not None else get_chart_store()
+        self.fmt = fmt
+        self.url_prefix = url_prefix
+
     def create_visualizations(
-        self, 
-        preprocessed_data: pd.DataFrame, 
+        self,
+        preprocessed_data: pd.DataFrame,
         prediction_results: Dict[str, Any],
         ticker: str
     ) -> List[str]:
         """
         Create visualizations for market analysis
-        
+
+        Charts whose inputs were rendered before are served from the chart
+        store without drawing them again.
+
         Args:
             preprocessed_data (pd.DataFrame): Preprocessed stock data
             prediction_results (Dict): Prediction results
             ticker (str): Stock ticker symbol
-        
+
         Returns:
-            List of visualization file paths
+            List of chart URLs
         """
+        close = preprocessed_data['Close']
+        forecast = np.asarray(prediction_results['forecast'], dtype=np.float64)
+        conf_int = np.asarray(prediction_results['confidence_interval'], dtype=np.float64).reshape(-1, 2)
+        digest = self._digest(ticker, close, forecast, conf_int)
+
+        # Forecast dates are shared by both charts
+        forecast_index = pd.date_range(start=close.index[-1], periods=len(forecast) + 1, freq='D')[1:]
+
         visualization_paths = []
-        
-        # Price trend visualization
-        plt.figure(figsize=(12, 6))
-        plt.plot(preprocessed_data['Close'], label='Historical Price')
-        plt.plot(
-            pd.date_range(
-                start=preprocessed_data.index[-1], 
-                periods=8, 
-                freq='D'
-            )[1:], 
-            prediction_results['forecast'], 
-            color='red', 
-            label='Predicted Price'
-        )
-        plt.title(f"{ticker} Price Trend and Forecast")
-        plt.xlabel("Date")
-        plt.ylabel("Price")
-        plt.legend()
-        plt.tight_layout()
-        
-        # Save price trend plot
-        price_trend_path = f"{ticker}_price_trend.png"
-        plt.savefig(price_trend_path)
-        plt.close()
-        visualization_paths.append(price_trend_path)
-        
-        # Confidence interval visualization
-        plt.figure(figsize=(12, 6))
-        conf_int = prediction_results['confidence_interval']
-        plt.fill_between(
-            pd.date_range(
-                start=preprocessed_data.index[-1], 
-                periods=8, 
-                freq='D'
-            )[1:], 
-            [ci[0] for ci in conf_int],
-            [ci[1] for ci in conf_int],
-            alpha=0.3, 
-            label='Confidence Interval'
+        for kind, render in (
+            ('price_trend', self._render_price_trend),
+            ('confidence_interval', self._render_confidence_interval),
+        ):
+            chart_id = f"{ticker}_{kind}_{digest}.{self.fmt}"
+            if self.store.get(chart_id) is None:
+                figure = render(ticker, close, forecast_index, forecast, conf_int)
+                self.store.put(chart_id, (self._encode(figure), CHART_MEDIA_TYPES[self.fmt]))
+            visualization_paths.append(f"{self.url_prefix}/{chart_id}")
+
+        return visualization_paths
+
+    def get_chart(self, chart_id: str) -> Optional[Tuple[bytes, str]]:
+        """
+        Look up a rendered chart
+
+        Args:
+            chart_id (str): Chart ID from a URL returned by create_visualizations
+
+        Returns:
+            Tuple of the image bytes and media type, or None if unknown or expired
+        """
+        return self.store.get(chart_id)
+
+    def _digest(self, ticker: str, close: pd.Series, forecast: np.ndarray, conf_int: np.ndarray) -> str:
+        digest = hashlib.sha256(f"{ticker}|{self.fmt}".encode())
+        digest.update(np.ascontiguousarray(close.to_numpy(dtype=np.float64)).tobytes())
+        if isinstance(close.index, pd.DatetimeIndex):
+            digest.update(np.ascontiguousarray(close.index.asi8).tobytes())
+        digest.update(forecast.tobytes())
+        digest.update(conf_int.tobytes())
+        return digest.hexdigest()[:24]
+
+    def _encode(self, figure: 'Figure') -> bytes:
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format=self.fmt)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _new_figure() -> 'Figure':
+        # matplotlib is only loaded once a chart is actually drawn
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        figure = Figure(figsize=(12, 6))
+        FigureCanvasAgg(figure)
+        return figure
+
+    @staticmethod
+    def _render_price_trend(ticker, close, forecast_index, forecast, conf_int) -> 'Figure':
+        figure = VisualizationService._new_figure()
+        ax = figure.subplots()
+        ax.plot(close, label='Historical Price')
+        ax.plot(forecast_index, forecast, color='red', label='Predicted Price')
+        ax.set_title(f"{ticker} Price Trend and Forecast")
+        ax.set_xlabel("Date")
+        ax.set_ylabel("Price")
+        ax.legend()
+        figure.tight_layout()
+        return figure
+
+    @staticmethod
+    def _render_confidence_interval(ticker, close, forecast_index, forecast, conf_int) -> 'Figure':
+        figure = VisualizationService._new_figure()
+        ax = figure.subplots()
+        ax.fill_between(forecast_index, conf_int[:, 0], conf_int[:, 1], alpha=0.3, label='Confidence Interval')
+        ax.set_title(f"{ticker} Forecast Confidence Interval")
+        ax.set_xlabel("Date")
+        ax.set_ylabel("Price")
+        ax.legend()
+        figure.tight_layout()
+        return figure
+
+
+_default_store: Optional[ResultStore] = None
+
+
+def get_chart_store() -> ResultStore:
+    """
+    Shared process-wide store of rendered charts
+
+    Capacity and lifetime can be tuned with the CHART_CACHE_SIZE and
+    CHART_TTL (seconds) environment variables.
+
+    Returns:
+        ResultStore: Lazily created default chart store
+    """
+    global _default_store
+    if _default_store is None:
+        _default_store = ResultStore(
+            ttl=float(os.getenv('CHART_TTL', 24 * 3600)),
+            max_entries=int(os.getenv('CHART_CACHE_SIZE', 512))
         )
-        plt.title(f"{ticker} Forecast Confidence Interval")
-        plt.xlabel("Date")
-        plt.ylabel("Price")
-        plt.legend()
-        plt.tight_layout()
-        
-        # Save confidence interval plot
-        confidence_path = f"{ticker}_confidence_interval.png"
-        plt.savefig(confidence_path)
-        plt.close()
-        visualization_paths.append(confidence_path)
-        
-        return visualization_paths
\ No newline at end of file
+    return _default_store
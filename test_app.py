@@ -1,5 +1,10 @@
+import shutil
+import tempfile
 from fastapi.testclient import TestClient
+import numpy as np
+import main
 from main import app
+from src.models.financial_analysis_state import FinancialAnalysisState, PriceFrame
 
 client = TestClient(app)
 
@@ -14,3 +19,315 @@ def test_health_check():
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
+
+
+def test_analysis_job_lifecycle(monkeypatch):
+    async def fake_runner(ticker, start_date, end_date, engine, stages):
+        return FinancialAnalysisState(ticker=ticker, forecast=np.array([1.0]), market_insights="ok", visualization_paths=[])
+
+    monkeypatch.setattr(main.job_manager, "runner", fake_runner)
+    payload = {"ticker": "AAPL", "start_date": "2023-01-01", "end_date": "2024-01-01"}
+
+    with TestClient(app) as job_client:
+        response = job_client.post("/jobs", json=payload)
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        with job_client.stream("GET", f"/jobs/{job_id}/events") as stream:
+            events = [line for line in stream.iter_lines() if line.startswith("event:")]
+        assert events[-1] == "event: succeeded"
+
+        job = job_client.get(f"/jobs/{job_id}").json()
+        assert job["status"] == "succeeded"
+        assert job["result"]["market_insights"] == "ok"
+
+    assert client.get("/jobs/unknown").status_code == 404
+
+
+def test_analyze_response_cache(monkeypatch):
+    runs = []
+
+    class FakeSystem:
+        async def arun_analysis(self, ticker, start_date, end_date, engine, stages):
+            runs.append(ticker)
+            return FinancialAnalysisState(ticker=ticker, market_insights="ok", visualization_paths=[])
+
+    monkeypatch.setattr(main, "analysis_system", FakeSystem())
+    payload = {"ticker": "CACHE", "start_date": "2023-01-01", "end_date": "2024-01-01"}
+
+    assert client.post("/analyze", json=payload).headers["X-Cache"] == "MISS"
+    assert client.post("/analyze", json=payload).headers["X-Cache"] == "HIT"
+    assert runs == ["CACHE"]
+    assert client.get("/cache/stats").json()["hits"] >= 1
+
+
+def test_cached_response_rerenders_expired_charts(monkeypatch):
+    from src.core.result_store import ResultStore
+    from src.utils.visualization import VisualizationService
+
+    runs = []
+    charts = VisualizationService(store=ResultStore())
+
+    class FakeSystem:
+        visualization_service = charts
+
+        async def arun_analysis(self, ticker, start_date, end_date, engine, stages):
+            runs.append(ticker)
+            charts.store.put("CHARTS_price_trend.png", (b"png", "image/png"))
+            return FinancialAnalysisState(ticker=ticker, visualization_paths=["/charts/CHARTS_price_trend.png"])
+
+    monkeypatch.setattr(main, "analysis_system", FakeSystem())
+    payload = {"ticker": "CHARTS", "start_date": "2023-01-01", "end_date": "2024-01-01"}
+
+    assert client.post("/analyze", json=payload).headers["X-Cache"] == "MISS"
+    assert client.post("/analyze", json=payload).headers["X-Cache"] == "HIT"
+
+    # The chart store dropped the chart while the response stayed cached
+    charts.store.pop("CHARTS_price_trend.png")
+    response = client.post("/analyze", json=payload)
+    assert response.headers["X-Cache"] == "MISS"
+    assert runs == ["CHARTS", "CHARTS"]
+    assert client.get(response.json()["visualization_paths"][0]).status_code == 200
+
+
+def test_insight_stream_sends_forecast_first(monkeypatch):
+    import pandas as pd
+    from src.core.insights import MarketInsightsService
+    from src.core.llm_cache import LLMCache
+    from src.utils.fake_llm import FakeLLM
+
+    class FakeSystem:
+        insights_service = MarketInsightsService(llm=FakeLLM(response="Up we go."), cache=LLMCache(":memory:"))
+
+        async def aprepare_forecast(self, ticker, start_date, end_date):
+            frame = pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.date_range("2023-01-02", periods=2))
+            return FinancialAnalysisState(
+                ticker=ticker, prices=PriceFrame.from_frame(frame),
+                forecast=np.array([3.0]), conf_int=np.array([[2.0, 4.0]]),
+            )
+
+    monkeypatch.setattr(main, "analysis_system", FakeSystem())
+
+    with client.stream("GET", "/analyze/AAPL/insights/stream", params={"start_date": "2023-01-01"}) as stream:
+        events = [line for line in stream.iter_lines() if line.startswith("event:")]
+
+    assert events[0] == "event: forecast"
+    assert events[1:-1] == ["event: token"] * 3
+    assert events[-1] == "event: done"
+
+
+def test_analyze_engine_is_validated_and_cached_separately(monkeypatch):
+    engines = []
+
+    class FakeSystem:
+        async def arun_analysis(self, ticker, start_date, end_date, engine, stages):
+            engines.append(engine)
+            return FinancialAnalysisState(ticker=ticker, market_insights="ok", visualization_paths=[])
+
+    monkeypatch.setattr(main, "analysis_system", FakeSystem())
+    payload = {"ticker": "ENGINE", "start_date": "2023-01-01", "end_date": "2024-01-01"}
+
+    assert client.post("/analyze", json=payload).status_code == 200
+    assert client.post("/analyze", json={**payload, "engine": "holt"}).headers["X-Cache"] == "MISS"
+    assert client.post("/analyze", json={**payload, "engine": "prophet"}).status_code == 422
+    assert engines == ["auto_arima", "holt"]
+
+
+def test_backtest_endpoint(monkeypatch):
+    from src.core.backtesting import BacktestService
+    from src.core.price_store import PriceStore
+    from src.core.providers import SyntheticProvider
+
+    root = tempfile.mkdtemp()
+    monkeypatch.setattr(main, "backtest_service", BacktestService(store=PriceStore(root, provider=SyntheticProvider())))
+    payload = {
+        "tickers": ["AAA"], "start_date": "2022-01-01", "end_date": "2024-01-01",
+        "engine": "drift", "max_origins": 5, "max_workers": 1,
+    }
+
+    response = client.post("/backtest", json=payload)
+    assert response.status_code == 200
+    assert response.json()["results"]["AAA"]["origins"] == 5
+    assert response.json()["tasks"] == {"computed": 1, "resumed": 0}
+    shutil.rmtree(root, ignore_errors=True)
+
+
+def test_charts_endpoint():
+    import pandas as pd
+    from src.utils.visualization import VisualizationService
+
+    data = pd.DataFrame({"Close": [1.0, 2.0, 3.0]}, index=pd.date_range("2023-01-02", periods=3))
+    paths = VisualizationService().create_visualizations(
+        data, {"forecast": [3.5, 4.0], "confidence_interval": [[3.0, 4.0], [3.2, 4.8]]}, "CHART"
+    )
+
+    response = client.get(paths[0])
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    assert response.content.startswith(b"\x89PNG")
+    assert client.get("/charts/missing.png").status_code == 404
+
+
+def test_analyze_stages(monkeypatch):
+    from src.core.financial_analysis import FinancialAnalysisSystem
+    from src.core.price_store import PriceStore
+    from src.core.providers import SyntheticProvider
+
+    class NoLLM:
+        def __getattr__(self, name):
+            raise AssertionError("insights stage should not run")
+
+    root = tempfile.mkdtemp()
+    system = FinancialAnalysisSystem(store=PriceStore(root, provider=SyntheticProvider()), insights_service=NoLLM())
+    monkeypatch.setattr(main, "analysis_system", system)
+    payload = {
+        "ticker": "STAGES", "start_date": "2023-01-01", "end_date": "2024-01-01",
+        "engine": "drift", "stages": ["forecast"],
+    }
+
+    response = client.post("/analyze", json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"ticker", "prediction_results", "stage_timings"}
+    assert body["stage_timings"]["insights"] is None and body["stage_timings"]["charts"] is None
+    assert body["stage_timings"]["forecast"] >= 0
+    assert system._visualization_service is None
+
+    assert client.post("/analyze", json={**payload, "stages": ["sentiment"]}).status_code == 422
+    shutil.rmtree(root, ignore_errors=True)
+
+
+def test_metrics_and_server_timing(monkeypatch):
+    from src.core.financial_analysis import FinancialAnalysisSystem
+    from src.core.price_store import PriceStore
+    from src.core.providers import SyntheticProvider
+
+    root = tempfile.mkdtemp()
+    system = FinancialAnalysisSystem(store=PriceStore(root, provider=SyntheticProvider()))
+    monkeypatch.setattr(main, "analysis_system", system)
+    payload = {
+        "ticker": "METRICS", "start_date": "2023-01-01", "end_date": "2024-01-01",
+        "engine": "drift", "stages": ["forecast"],
+    }
+
+    response = client.post("/analyze", json=payload)
+    assert response.status_code == 200
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("data;dur=") and "forecast;dur=" in timing and "total;dur=" in timing
+
+    scrape = client.get("/metrics")
+    assert scrape.status_code == 200
+    assert scrape.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'analysis_stage_duration_seconds_count{stage="forecast"}' in scrape.text
+    assert 'http_request_duration_seconds_count{method="POST",route="/analyze",status="200"}' in scrape.text
+    assert 'cache_misses_total{cache="analysis"}' in scrape.text
+    shutil.rmtree(root, ignore_errors=True)
+
+
+def test_series_export(monkeypatch):
+    from src.core.model_registry import ModelRegistry
+    from src.core.price_store import PriceStore
+    from src.core.providers import SyntheticProvider
+    from src.core.series_export import SeriesExportService
+
+    root = tempfile.mkdtemp()
+    monkeypatch.setattr(main, "series_service", SeriesExportService(PriceStore(root, provider=SyntheticProvider()), ModelRegistry()))
+    params = {"start_date": "2023-01-01", "end_date": "2024-01-01", "columns": ["Close", "RSI"], "engine": "drift"}
+
+    response = client.get("/series/AAA", params=params)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["columns"] == ["Date", "Ticker", "Close", "RSI"]
+
+    response = client.post("/series/batch", json={**params, "tickers": ["AAA", "BBB"], "columns": ["Forecast"]})
+    assert response.status_code == 200
+    assert {row[1] for row in response.json()["data"]} == {"AAA", "BBB"}
+
+    monkeypatch.setattr("src.core.series_export.arrow_available", lambda: False)
+    assert client.get("/series/AAA", params={**params, "format": "parquet"}).status_code == 406
+    assert client.get("/series/AAA", params={**params, "columns": ["Sentiment"]}).status_code == 422
+    shutil.rmtree(root, ignore_errors=True)
+
+
+def test_scenarios(monkeypatch):
+    from src.core.financial_analysis import FinancialAnalysisSystem
+    from src.core.model_registry import ModelRegistry
+    from src.core.price_store import PriceStore
+    from src.core.providers import SyntheticProvider
+    from src.core.scenarios import ScenarioService
+
+    root = tempfile.mkdtemp()
+    store = PriceStore(root, provider=SyntheticProvider())
+    monkeypatch.setattr(main, "scenario_service", ScenarioService(store, ModelRegistry()))
+    monkeypatch.setattr(main, "analysis_system", FinancialAnalysisSystem(store=store))
+    payload = {"ticker": "RISK", "start_date": "2023-01-01", "end_date": "2024-01-01"}
+
+    response = client.post("/scenarios", json={**payload, "paths": 2000, "dtype": "float32", "seed": 1})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["paths"] == 2000 and body["dtype"] == "float32"
+    assert body["cvar"]["0.95"] >= body["var"]["0.95"]
+    assert client.post("/scenarios", json={**payload, "paths": 10**7}).status_code == 422
+
+    response = client.post("/analyze", json={**payload, "engine": "drift", "stages": ["forecast", "scenarios"]})
+    assert response.status_code == 200
+    assert set(response.json()["scenarios"]["var"]) == {"0.95", "0.99"}
+    assert response.json()["stage_timings"]["scenarios"] >= 0
+    shutil.rmtree(root, ignore_errors=True)
+
+
+def test_warmup_status(monkeypatch):
+    import asyncio
+    from src.core.warmup import WarmupScheduler, parse_watchlist
+
+    runs = []
+
+    class FakeSystem:
+        async def arun_analysis(self, ticker, start_date, end_date, engine, stages):
+            runs.append(ticker)
+            return FinancialAnalysisState(ticker=ticker, market_insights="ok", visualization_paths=[])
+
+    monkeypatch.setattr(main, "analysis_system", FakeSystem())
+    monkeypatch.setattr(main, "warmup_scheduler", None)
+    monkeypatch.delenv("WARMUP_STATUS_PATH", raising=False)
+    assert client.get("/warmup/status").status_code == 404
+
+    scheduler = WarmupScheduler(main.warm_analysis, parse_watchlist("WARMB,WARMA:5"), stagger=0, lookback_days=30)
+    monkeypatch.setattr(main, "warmup_scheduler", scheduler)
+    asyncio.run(scheduler.run_once())
+    assert runs == ["WARMA", "WARMB"]
+
+    # Morning traffic for the warmed window is served from the cache
+    start_date, _ = scheduler.window()
+    response = client.post("/analyze", json={"ticker": "WARMA", "start_date": start_date})
+    assert response.headers["X-Cache"] == "HIT"
+    assert runs == ["WARMA", "WARMB"]
+
+    status = client.get("/warmup/status").json()
+    assert [item["ticker"] for item in status["watchlist"]] == ["WARMA", "WARMB"]
+    assert status["last_run"]["tickers"]["WARMA"]["status"] == "ok"
+    assert status["last_run"]["tickers"]["WARMA"]["windows"][0]["cache"] == "MISS"
+
+
+def test_portfolio(monkeypatch):
+    from src.core.portfolio import PortfolioService
+    from src.core.price_store import PriceStore
+    from src.core.providers import SyntheticProvider
+
+    root = tempfile.mkdtemp()
+    monkeypatch.setattr(main, "portfolio_service", PortfolioService(PriceStore(root, provider=SyntheticProvider())))
+    payload = {"tickers": ["AAPL", "MSFT", "GOOG"], "start_date": "2023-01-01", "end_date": "2024-01-01"}
+
+    response = client.post("/portfolio", json={**payload, "benchmark": "SPY", "weights": {"AAPL": 2, "MSFT": 1, "GOOG": 1}})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["beta_to"] == "SPY" and set(body["beta"]) == {"AAPL", "MSFT", "GOOG"}
+    assert body["weights"]["AAPL"] == 0.5
+    assert len(body["correlation"]) == 3 and body["correlation"][0][0] == 1.0
+    assert len(body["rolling_correlation"]["values"]["AAPL"]) == len(body["rolling_correlation"]["dates"])
+
+    compact = client.post("/portfolio", json={**payload, "include_matrix": False}).json()
+    assert "correlation" not in compact and len(compact["top_pairs"]) == 3
+    assert client.post("/portfolio", json={**payload, "tickers": ["AAPL"]}).status_code == 422
+    assert client.post("/portfolio", json={**payload, "weights": {"TSLA": 1}}).status_code == 500
+    shutil.rmtree(root, ignore_errors=True)
@@ -0,0 +1,80 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from src.core.backtesting import BacktestService, evaluate_origins, summarize
+from src.core.price_store import PriceStore
+from src.core.providers import SyntheticProvider
+
+class PartialProvider(SyntheticProvider):
+    """Synthetic provider that knows nothing about tickers starting with BAD"""
+
+    def download_many(self, tickers, start_date, end_date):
+        frames = super().download_many(tickers, start_date, end_date)
+        return {ticker: df for ticker, df in frames.items() if not ticker.startswith('BAD')}
+
+class TestBacktesting(unittest.TestCase):
+    def setUp(self):
+        """Create an offline price store and a checkpoint location"""
+        self.root = tempfile.mkdtemp()
+        self.service = BacktestService(store=PriceStore(os.path.join(self.root, 'prices'), provider=PartialProvider()))
+        self.checkpoint = os.path.join(self.root, 'backtest.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def run_backtest(self, **kwargs):
+        params = dict(horizon=5, step=10, min_train=200, engine='arima_ls', block_size=3, max_workers=1)
+        params.update(kwargs)
+        return self.service.run(['AAA', 'BBB'], '2022-01-01', '2024-01-01', **params)
+
+    def test_metrics_and_resume(self):
+        """Test walk-forward metrics and resuming from a checkpoint"""
+        first = self.run_backtest(checkpoint=self.checkpoint)
+        self.assertEqual(first['errors'], {})
+        self.assertEqual(first['tasks']['resumed'], 0)
+        self.assertGreater(first['results']['AAA']['origins'], 20)
+        self.assertLess(first['results']['AAA']['mape'], 10)
+        self.assertTrue(0 <= first['overall']['coverage'] <= 1)
+        self.assertEqual(len(first['overall']['mae_by_horizon']), 5)
+
+        # Simulate a crash after the first block
+        with open(self.checkpoint) as f:
+            saved = json.load(f)
+        saved['blocks'] = dict(list(saved['blocks'].items())[:1])
+        with open(self.checkpoint, 'w') as f:
+            json.dump(saved, f)
+
+        resumed = self.run_backtest(checkpoint=self.checkpoint)
+        self.assertEqual(resumed['tasks'], {'computed': first['tasks']['computed'] - 1, 'resumed': 1})
+        self.assertEqual(resumed['results'], first['results'])
+
+        with self.assertRaises(ValueError):
+            self.run_backtest(checkpoint=self.checkpoint, horizon=3)
+
+    def test_errors_are_per_ticker(self):
+        """Test a ticker without data does not fail the others"""
+        report = self.service.run(['AAA', 'BAD'], '2023-06-01', '2024-01-01', min_train=100, engine='drift', max_workers=1)
+        self.assertIn('AAA', report['results'])
+        self.assertIn('BAD', report['errors'])
+
+        report = self.service.run(['AAA'], '2023-06-01', '2024-01-01', min_train=250, engine='drift', max_workers=1)
+        self.assertIn('Need at least', report['errors']['AAA'])
+
+        report = self.service.run(['AAA', 'BAD TICKER'], '2023-06-01', '2024-01-01', min_train=100, engine='drift', max_workers=1)
+        self.assertIn('AAA', report['results'])
+        self.assertEqual(list(report['errors']), ['BAD TICKER'])
+        self.assertIn('Invalid ticker', report['errors']['BAD TICKER'])
+
+    def test_order_reuse(self):
+        """Test auto_arima searches once per block and refits the order in between"""
+        close = SyntheticProvider().download('AAA', '2023-01-01', '2023-12-31')['Close']
+        records = evaluate_origins(close, [150, 155, 160], horizon=3, search_every=10)
+
+        self.assertEqual(len({tuple(r['order']) for r in records}), 1)
+        self.assertEqual([r['origin'] for r in records], [close.index[o - 1].strftime('%Y-%m-%d') for o in (150, 155, 160)])
+        self.assertEqual(summarize(records)['origins'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
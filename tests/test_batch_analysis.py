@@ -0,0 +1,127 @@
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import pmdarima as pm
+from src.core import batch_analysis
+from src.core.batch_analysis import BatchAnalysisService
+from src.core.data_ingestion import DataIngestionService
+from src.core.insights import MarketInsightsService
+from src.core.llm_cache import LLMCache
+from src.core.model_registry import ModelRegistry
+from src.core.price_store import PriceStore
+from src.core.providers import SyntheticProvider
+from src.utils.fake_llm import FakeLLM
+
+class PartialProvider(SyntheticProvider):
+    """Synthetic provider that knows nothing about tickers starting with BAD"""
+
+    def download_many(self, tickers, start_date, end_date):
+        frames = super().download_many(tickers, start_date, end_date)
+        return {ticker: df for ticker, df in frames.items() if not ticker.startswith('BAD')}
+
+class NoCharts:
+    def create_visualizations(self, preprocessed_data, prediction_results, ticker):
+        return []
+
+class TestBatchAnalysisService(unittest.TestCase):
+    def setUp(self):
+        """Build an offline batch pipeline with a pre-warmed registry"""
+        self.root = tempfile.mkdtemp()
+        self.provider = PartialProvider()
+        self.store = PriceStore(self.root, provider=self.provider)
+        self.registry = ModelRegistry()
+        self.llm = FakeLLM(response='Steady uptrend.')
+        self.service = BatchAnalysisService(
+            store=self.store,
+            registry=self.registry,
+            insights_service=MarketInsightsService(llm=self.llm, cache=LLMCache(':memory:')),
+            visualization_service=NoCharts()
+        )
+
+        # Pre-fit cheap models so the test does not depend on auto_arima speed
+        for ticker in ('AAA', 'BBB'):
+            close = DataIngestionService._preprocess_data(
+                SyntheticProvider().download(ticker, '2023-01-01', '2023-12-31')
+            )['Close']
+            self.registry.put(ticker, close, pm.ARIMA(order=(1, 1, 0), suppress_warnings=True).fit(close))
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_run_batch(self):
+        """Test one bulk download and per-ticker results"""
+        batch = self.service.run_batch(['AAA', 'BBB', 'AAA'], '2023-01-01', '2023-12-31')
+
+        self.assertEqual(self.provider.calls, [(['AAA', 'BBB'], '2023-01-01', '2023-12-31')])
+        self.assertEqual(set(batch['results']), {'AAA', 'BBB'})
+        self.assertEqual(batch['errors'], {})
+        self.assertEqual(len(batch['results']['AAA'].forecast), 7)
+        self.assertEqual(batch['results']['BBB'].market_insights, 'Steady uptrend.')
+        self.assertEqual(self.llm.calls, 2)
+
+    def test_errors_are_per_ticker(self):
+        """Test a failing ticker does not fail the rest of the batch"""
+        batch = self.service.run_batch(['AAA', 'BADX'], '2023-01-01', '2023-12-31')
+
+        self.assertIn('AAA', batch['results'])
+        self.assertIn('BADX', batch['errors'])
+        self.assertIn('No data found', batch['errors']['BADX'])
+
+    def test_invalid_tickers_do_not_fail_the_batch(self):
+        """Test malformed symbols are reported alone and the valid tickers still run"""
+        batch = self.service.run_batch(['AAA', 'BAD TICKER', 'BBB', '..'], '2023-01-01', '2023-12-31')
+
+        self.assertEqual(set(batch['results']), {'AAA', 'BBB'})
+        self.assertEqual(set(batch['errors']), {'BAD TICKER', '..'})
+        self.assertIn('Invalid ticker', batch['errors']['BAD TICKER'])
+        self.assertEqual(self.provider.calls, [(['AAA', 'BBB'], '2023-01-01', '2023-12-31')])
+
+    def test_fits_are_capped_by_max_workers(self):
+        """Test searches and refits all go to the process pool, never more than max_workers at once"""
+        active, peak, calls = [0], [0], []
+        lock = threading.Lock()
+
+        def tracked(name, fn):
+            def run(*args):
+                with lock:
+                    calls.append(name)
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.05)
+                try:
+                    return fn(*args)
+                finally:
+                    with lock:
+                        active[0] -= 1
+            return run
+
+        cheap_fit = lambda close: pm.ARIMA(order=(1, 1, 0), suppress_warnings=True).fit(close)
+        with mock.patch.object(batch_analysis, 'MAX_BATCH_WORKERS', 4), \
+                mock.patch.object(batch_analysis, 'get_cpu_executor', return_value=ThreadPoolExecutor(4)), \
+                mock.patch.object(batch_analysis, 'extend_model', tracked('refit', batch_analysis.extend_model)), \
+                mock.patch.object(batch_analysis.PredictionService, 'fit_model', tracked('search', cheap_fit)):
+            batch = self.service.run_batch(
+                ['AAA', 'BBB', 'CCC', 'DDD'], '2023-01-01', '2024-03-01', max_workers=2, stages=['forecast']
+            )
+
+        self.assertEqual(batch['errors'], {})
+        self.assertEqual(sorted(calls), ['refit', 'refit', 'search', 'search'])
+        self.assertEqual(peak[0], 2)
+        self.assertEqual(self.registry.stats()['refits'], 2)
+
+    def test_closed_form_engine(self):
+        """Test a fast engine forecasts every ticker without touching the registry"""
+        batch = self.service.run_batch(['AAA', 'CCC'], '2023-01-01', '2023-12-31', engine='drift', stages=['forecast'])
+
+        self.assertEqual(set(batch['results']), {'AAA', 'CCC'})
+        self.assertIsNone(batch['results']['AAA'].market_insights)
+        self.assertEqual(self.llm.calls, 0)
+        self.assertEqual(len(batch['results']['CCC'].conf_int), 7)
+        self.assertEqual(self.registry.stats()['misses'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
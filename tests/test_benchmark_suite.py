@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+import unittest
+from benchmarks.suite import FIXTURE, STAGES, FixtureProvider, IntradayProvider, compare, run_pass
+from src.core.providers import SyntheticProvider
+
+def report(wall_s, alloc_peak_mb=1.0):
+    stages = {'forecast': {'wall_s': wall_s, 'rss_peak_mb': 100.0, 'alloc_peak_mb': alloc_peak_mb, 'alloc_retained_mb': 0.1}}
+    return {'cases': [{'case': '1y/x1', 'dataset': '1y', 'tickers': 1, 'engine': 'drift', 'stages': stages}]}
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_compare_flags_regressions_over_threshold(self):
+        """Test slower or bigger stages are reported and noise is ignored"""
+        baseline = report(0.100)
+        self.assertEqual(compare(baseline, report(0.120), threshold=0.25), [])
+        self.assertEqual(len(compare(baseline, report(0.200), threshold=0.25)), 1)
+        self.assertEqual(compare(report(0.001), report(0.004), threshold=0.25, min_delta=0.005), [])
+        self.assertIn('peak allocations', compare(baseline, report(0.100, alloc_peak_mb=10.0))[0])
+
+    def test_pass_measures_every_stage(self):
+        """Test one traced pass records wall time and allocations per stage"""
+        measured = run_pass('1y', 2, 'drift', None, trace=True)
+        self.assertEqual(tuple(measured), STAGES)
+        for stage in STAGES:
+            self.assertGreater(measured[stage]['wall_s'], 0)
+            self.assertGreater(measured[stage]['alloc_peak_mb'], 0)
+
+    def test_intraday_and_fixture_providers(self):
+        """Test intraday sessions and fixture files produce OHLCV bars"""
+        bars = IntradayProvider().download('AAPL', '2024-01-02', '2024-01-03')
+        self.assertEqual(len(bars), 78)
+        self.assertEqual(str(bars.index[0].time()), '09:30:00')
+
+        root = tempfile.mkdtemp()
+        try:
+            SyntheticProvider().download('FIX', '2023-01-01', '2023-06-01').to_csv(os.path.join(root, 'FIX.csv'))
+            measured = run_pass(FIXTURE, 1, 'drift', root, trace=False)
+            self.assertEqual(FixtureProvider(root).tickers(), ['FIX'])
+            self.assertGreater(measured['forecast']['wall_s'], 0)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.core.data_ingestion import DataIngestionService
+from src.core.feature_engine import FeatureEngine, INGESTION_FEATURES
+from src.core.preprocessing import PreprocessingService
+from src.core.providers import SyntheticProvider
+
+class TestFeatureEngine(unittest.TestCase):
+    def setUp(self):
+        """Create per-ticker price histories of different lengths"""
+        provider = SyntheticProvider()
+        self.frames = {
+            'AAA': provider.download('AAA', '2022-01-01', '2023-12-31'),
+            'BBB': provider.download('BBB', '2022-01-01', '2023-12-31'),
+            'CCC': provider.download('CCC', '2023-03-01', '2023-12-31'),
+        }
+
+    def assertFramesClose(self, expected, actual, rtol=1e-5):
+        self.assertTrue(expected.index.equals(actual.index))
+        for col in expected.columns:
+            np.testing.assert_allclose(actual[col], expected[col], rtol=rtol, err_msg=col)
+
+    def test_matches_engineer_financial_features(self):
+        """Test every ticker gets the per-ticker features, including a shorter history"""
+        panel = FeatureEngine.compute(self.frames, chunk_size=2)
+
+        self.assertEqual(panel.frame('RSI').dtypes.unique().tolist(), [np.float32])
+        for ticker, frame in self.frames.items():
+            expected = PreprocessingService.engineer_financial_features(frame[['Close']])
+            self.assertFramesClose(expected, panel.ticker(ticker))
+
+    def test_matches_ingestion_preprocessing(self):
+        """Test the ingestion feature set in float64"""
+        panel = FeatureEngine.compute(self.frames, INGESTION_FEATURES, dtype=np.float64)
+
+        expected = DataIngestionService._preprocess_data(self.frames['AAA'].copy())
+        self.assertFramesClose(expected[['Close', *INGESTION_FEATURES]], panel.ticker('AAA'), rtol=1e-9)
+
+    def test_stacked_input_and_normalize(self):
+        """Test a (date, ticker) stacked panel and min-max scaling over valid rows"""
+        stacked = pd.concat(self.frames, names=['Ticker', 'Date']).swaplevel().sort_index()
+        panel = FeatureEngine.compute(stacked).normalize(['Close', 'RSI'])
+
+        expected = PreprocessingService.normalize_data(
+            PreprocessingService.engineer_financial_features(self.frames['CCC'][['Close']])
+        )
+        actual = panel.ticker('CCC')
+        for col in ('Close_normalized', 'RSI_normalized'):
+            np.testing.assert_allclose(actual[col], expected[col], atol=1e-5)
+
+    def test_unknown_feature(self):
+        """Test unknown feature names are rejected"""
+        with self.assertRaises(ValueError):
+            FeatureEngine.compute(self.frames, ['MACD'])
+
+if __name__ == '__main__':
+    unittest.main()
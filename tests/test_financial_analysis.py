@@ -0,0 +1,69 @@
+import asyncio
+import shutil
+import tempfile
+import unittest
+import pmdarima as pm
+from src.core.data_ingestion import DataIngestionService
+from src.core.financial_analysis import FinancialAnalysisSystem, resolve_stages
+from src.core.insights import MarketInsightsService
+from src.core.llm_cache import LLMCache
+from src.core.model_registry import ModelRegistry
+from src.core.price_store import PriceStore
+from src.core.providers import SyntheticProvider
+from src.utils.fake_llm import FakeLLM
+
+class NoCharts:
+    def create_visualizations(self, preprocessed_data, prediction_results, ticker):
+        return [f"{ticker}.png"]
+
+class TestFinancialAnalysisSystem(unittest.TestCase):
+    def setUp(self):
+        """Build an offline analysis system with a pre-warmed registry"""
+        self.root = tempfile.mkdtemp()
+        self.registry = ModelRegistry()
+        self.system = FinancialAnalysisSystem(
+            store=PriceStore(self.root, provider=SyntheticProvider()),
+            registry=self.registry,
+            insights_service=MarketInsightsService(llm=FakeLLM(response='Sideways.'), cache=LLMCache(':memory:')),
+            visualization_service=NoCharts()
+        )
+
+        close = DataIngestionService._preprocess_data(
+            SyntheticProvider().download('AAPL', '2023-01-01', '2023-12-31')
+        )['Close']
+        self.registry.put('AAPL', close, pm.ARIMA(order=(1, 1, 0), suppress_warnings=True).fit(close))
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_arun_analysis_matches_run_analysis(self):
+        """Test the async pipeline returns the same results as the sync one"""
+        expected = self.system.run_analysis('AAPL', '2023-01-01', '2023-12-31')
+        result = asyncio.run(self.system.arun_analysis('AAPL', '2023-01-01', '2023-12-31'))
+
+        self.assertEqual(result.prediction_results, expected.prediction_results)
+        self.assertEqual(result.market_insights, 'Sideways.')
+        self.assertEqual(result.visualization_paths, ['AAPL.png'])
+        self.assertEqual(result.model_cache, 'hit')
+
+    def test_stages(self):
+        """Test skipped stages leave no output, are timed as None and build no services"""
+        system = FinancialAnalysisSystem(store=self.system.store, registry=self.registry)
+        result = system.run_analysis('AAPL', '2023-01-01', '2023-12-31', stages=['forecast'])
+
+        self.assertIsNone(result.market_insights)
+        self.assertIsNone(result.visualization_paths)
+        self.assertIsNone(result.stage_timings['insights'])
+        self.assertGreaterEqual(result.stage_timings['forecast'], 0)
+        self.assertIsNone(system._insights_service)
+        self.assertIsNone(system._visualization_service)
+
+        self.assertEqual(resolve_stages(['charts']), ('forecast', 'charts'))
+        self.assertEqual(resolve_stages(), ('forecast', 'insights', 'charts'))
+        self.assertIsNone(result.scenarios)
+        self.assertIsNone(result.stage_timings['scenarios'])
+        with self.assertRaises(ValueError):
+            resolve_stages(['sentiment'])
+
+if __name__ == '__main__':
+    unittest.main()
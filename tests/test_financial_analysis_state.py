@@ -0,0 +1,49 @@
+import unittest
+import numpy as np
+from src.core.data_ingestion import DataIngestionService
+from src.core.providers import SyntheticProvider
+from src.models.financial_analysis_state import FinancialAnalysisState, PriceFrame
+
+class TestPriceFrame(unittest.TestCase):
+    def setUp(self):
+        self.frame = DataIngestionService._preprocess_data(
+            SyntheticProvider().download('AAPL', '2023-01-01', '2023-12-31')
+        )
+
+    def test_preprocessing_uses_one_buffer(self):
+        """Test the preprocessed columns are views over one float64 block"""
+        values = self.frame.to_numpy()
+        self.assertEqual(values.dtype, np.float64)
+        self.assertTrue(np.shares_memory(values, self.frame['Close'].to_numpy()))
+        self.assertTrue(np.shares_memory(values, self.frame['Rolling_Std'].to_numpy()))
+        self.assertFalse(self.frame.isnull().any().any())
+
+    def test_views_share_memory(self):
+        """Test from_frame, column, tail and to_frame do not copy the bars"""
+        prices = PriceFrame.from_frame(self.frame)
+        self.assertTrue(np.shares_memory(prices.values, self.frame.to_numpy()))
+        self.assertTrue(np.shares_memory(prices.column('Close'), prices.values))
+        self.assertTrue(np.shares_memory(prices.tail(10).values, prices.values))
+        self.assertTrue(np.shares_memory(prices.to_frame()['Close'].to_numpy(), prices.values))
+
+        np.testing.assert_array_equal(prices.column('Close'), self.frame['Close'].to_numpy())
+        self.assertEqual(len(prices.tail(10)), 10)
+        self.assertTrue(prices.to_frame().equals(self.frame))
+
+    def test_state(self):
+        """Test the state is slotted and reports its forecast as lists"""
+        state = FinancialAnalysisState(
+            ticker='AAPL',
+            prices=PriceFrame.from_frame(self.frame),
+            forecast=np.array([1.0, 2.0]),
+            conf_int=np.array([[0.5, 1.5], [1.5, 2.5]])
+        )
+        self.assertFalse(hasattr(state, '__dict__'))
+        self.assertEqual(state.prediction_results, {
+            'forecast': [1.0, 2.0], 'confidence_interval': [[0.5, 1.5], [1.5, 2.5]]
+        })
+        self.assertEqual(state.nbytes, state.prices.nbytes + 48)
+        self.assertIsNone(FinancialAnalysisState(ticker='AAPL').prediction_results)
+
+if __name__ == '__main__':
+    unittest.main()
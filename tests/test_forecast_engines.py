@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+import pandas as pd
+import pmdarima as pm
+from src.core.forecast_engines import ENGINES, ENGINE_NAMES, EngineName, forecast_many, get_engine
+from src.core.prediction import PredictionService
+
+class TestForecastEngines(unittest.TestCase):
+    def setUp(self):
+        """Create a random walk with drift and AR(1) increments"""
+        rng = np.random.default_rng(7)
+        steps = np.zeros(600)
+        for t in range(1, len(steps)):
+            steps[t] = 0.05 + 0.4 * steps[t - 1] + rng.normal()
+        dates = pd.date_range('2022-01-03', periods=len(steps), freq='B')
+        self.series = pd.Series(100 + np.cumsum(steps), index=dates)
+
+    def test_result_structure(self):
+        """Test every engine returns the auto_arima result layout"""
+        for engine in ENGINES:
+            result = PredictionService.forecast_prices(self.series, periods=5, engine=engine)
+            forecast = result['prediction_results']['forecast']
+            conf_int = np.array(result['prediction_results']['confidence_interval'])
+
+            self.assertEqual(len(forecast), 5, engine)
+            self.assertEqual(conf_int.shape, (5, 2), engine)
+            self.assertTrue(np.all(conf_int[:, 0] < forecast) and np.all(forecast < conf_int[:, 1]), engine)
+            self.assertTrue(np.all(np.diff(conf_int[:, 1] - conf_int[:, 0]) > 0), engine)
+            self.assertEqual(result['model_cache'], 'disabled')
+
+    def test_drift_on_a_line(self):
+        """Test drift extrapolates a straight line exactly"""
+        line = np.arange(50, dtype=float)[None, :] * 2 + 10
+        forecast, _ = get_engine('drift').forecast_many(line, 3)
+        np.testing.assert_allclose(forecast[0], [110, 112, 114])
+
+    def test_least_squares_matches_arima(self):
+        """Test the least squares ARIMA(1,1,0) agrees with pmdarima's fit"""
+        expected = pm.ARIMA(order=(1, 1, 0)).fit(self.series).predict(n_periods=5)
+        forecast, _ = type(get_engine('arima_ls'))(p=1).forecast_many(self.series.to_numpy()[None, :], 5)
+        np.testing.assert_allclose(forecast[0], expected, rtol=1e-3)
+
+    def test_forecast_many_matches_single(self):
+        """Test batched forecasts equal per-series forecasts, across mixed lengths"""
+        series = {'A': self.series, 'B': self.series * 1.5, 'C': self.series.iloc[:300]}
+        batched = forecast_many(series, 'holt', periods=4)
+        for ticker, values in series.items():
+            single = PredictionService.forecast_prices(values, periods=4, engine='holt')['prediction_results']
+            np.testing.assert_allclose(batched[ticker][0], single['forecast'])
+            np.testing.assert_allclose(batched[ticker][1], single['confidence_interval'])
+
+    def test_short_series_are_rejected(self):
+        """Test every engine raises instead of returning NaN or infinite forecasts"""
+        for engine, shortest in (('drift', 3), ('holt', 4), ('arima_ls', 7)):
+            for length in range(1, shortest):
+                with self.assertRaises(ValueError, msg=f"{engine} {length}"):
+                    PredictionService.forecast_prices(self.series.iloc[:length], engine=engine)
+            result = PredictionService.forecast_prices(self.series.iloc[:shortest], engine=engine)
+            self.assertTrue(np.isfinite(result['prediction_results']['confidence_interval']).all(), engine)
+
+    def test_engine_names(self):
+        """Test unknown engines are rejected and request names stay in sync"""
+        self.assertEqual(set(EngineName.__args__), set(ENGINE_NAMES))
+        with self.assertRaises(ValueError):
+            PredictionService.forecast_prices(self.series, engine='prophet')
+
+if __name__ == '__main__':
+    unittest.main()
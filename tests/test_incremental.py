@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.core.data_ingestion import DataIngestionService
+from src.core.incremental import IncrementalIndicators, RSI_WILDER
+from src.core.preprocessing import PreprocessingService
+from src.core.providers import SyntheticProvider
+
+class TestIncrementalIndicators(unittest.TestCase):
+    def setUp(self):
+        """Create a price history split into a seed part and live bars"""
+        self.history = SyntheticProvider().download('AAPL', '2020-01-01', '2023-12-31')
+        self.seed_bars = 300
+
+    def stream(self, **kwargs):
+        state = IncrementalIndicators.from_frame(self.history.iloc[:self.seed_bars], **kwargs)
+        rows = [state.update(bar) for _, bar in self.history.iloc[self.seed_bars:].iterrows()]
+        return pd.DataFrame(rows, index=self.history.index[self.seed_bars:])
+
+    def test_matches_batch_features(self):
+        """Test streamed bars equal engineer_financial_features and ingestion preprocessing"""
+        streamed = self.stream()
+
+        expected = PreprocessingService.engineer_financial_features(self.history[['Close']]).iloc[-len(streamed):]
+        for col in expected.columns:
+            np.testing.assert_allclose(streamed[col], expected[col], rtol=1e-9, err_msg=col)
+
+        ingestion = DataIngestionService._preprocess_data(self.history.copy()).iloc[-len(streamed):]
+        for col in ('Rolling_Mean', 'Rolling_Std'):
+            np.testing.assert_allclose(streamed[col], ingestion[col], rtol=1e-9, err_msg=col)
+
+    def test_wilder_rsi(self):
+        """Test Wilder RSI equals exponential smoothing of the batch gains and losses"""
+        streamed = self.stream(rsi_method=RSI_WILDER)
+
+        delta = self.history['Close'].diff()
+        smooth = dict(alpha=1 / 14, adjust=False, min_periods=14)
+        gain = delta.where(delta > 0, 0).ewm(**smooth).mean()
+        loss = (-delta.where(delta < 0, 0)).ewm(**smooth).mean()
+        expected = (100 - 100 / (1 + gain / loss)).iloc[self.seed_bars:]
+        np.testing.assert_allclose(streamed['RSI'], expected, rtol=1e-9)
+
+    def test_warm_up(self):
+        """Test indicators become ready once the longest window is filled"""
+        state = IncrementalIndicators()
+        for value in self.history['Close'].iloc[:49]:
+            state.update(value)
+        self.assertFalse(state.ready)
+        self.assertTrue(np.isnan(state.values()['MA_50']))
+
+        state.update({'Close': self.history['Close'].iloc[49]})
+        self.assertTrue(state.ready)
+
+    def test_numpy_scalars(self):
+        """Test NumPy scalars of any width are accepted as close prices"""
+        closes = self.history['Close'].iloc[:60]
+        expected = IncrementalIndicators()
+        streamed = IncrementalIndicators()
+        for value in closes:
+            expected.update(float(np.float32(value)))
+            streamed.update(np.float32(value))
+
+        self.assertEqual(streamed.values(), expected.values())
+        streamed.update(np.int64(100))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import asyncio
+import unittest
+from src.core.data_ingestion import DataIngestionService
+from src.core.insights import MarketInsightsService
+from src.core.llm_cache import LLMCache
+from src.core.providers import SyntheticProvider
+from src.utils.fake_llm import FakeLLM
+
+class TestInsightStreaming(unittest.TestCase):
+    def setUp(self):
+        """Create recent data and a streaming fake LLM"""
+        raw = SyntheticProvider().download('AAPL', '2023-01-01', '2023-12-31')
+        self.recent = DataIngestionService._preprocess_data(raw).tail(10)
+        self.llm = FakeLLM(response='Prices trend upward with moderate risk.')
+        self.service = MarketInsightsService(llm=self.llm, cache=LLMCache(':memory:'))
+
+    def collect(self, limit=None):
+        async def scenario():
+            chunks = []
+            stream = self.service.astream_insights(self.recent, [1.0, 2.0])
+            async for chunk in stream:
+                chunks.append(chunk)
+                if limit and len(chunks) == limit:
+                    await stream.aclose()
+                    break
+            return chunks
+
+        return asyncio.run(scenario())
+
+    def test_stream_then_cache(self):
+        """Test a completed stream is cached and replayed as one chunk"""
+        chunks = self.collect()
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(''.join(chunks), self.llm.response)
+
+        self.assertEqual(self.collect(), [self.llm.response])
+        self.assertEqual(self.llm.calls, 1)
+
+    def test_abandoned_stream_stops_llm(self):
+        """Test closing the stream early stops upstream tokens and caches nothing"""
+        self.collect(limit=2)
+        self.assertEqual(self.llm.streamed_chunks, 2)
+        self.assertEqual(self.service.cache.stats()['entries'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
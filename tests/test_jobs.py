@@ -0,0 +1,85 @@
+import asyncio
+import math
+import time
+import unittest
+from src.core.jobs import JobManager, QueueFullError, FAILED, SUCCEEDED
+from src.core.result_store import ResultStore
+
+class TestJobManager(unittest.TestCase):
+    def setUp(self):
+        """Create a runner that blocks until released"""
+        self.runs = []
+
+    async def runner(self, ticker, start_date, end_date, engine='auto_arima'):
+        self.runs.append(ticker if engine == 'auto_arima' else f'{ticker}:{engine}')
+        await self.release.wait()
+        if ticker == 'FAIL':
+            raise ValueError('boom')
+        return {'ticker': ticker, 'market_insights': 'ok'}
+
+    def test_coalescing_and_completion(self):
+        """Test identical in-flight requests share one job"""
+        async def scenario():
+            self.release = asyncio.Event()
+            manager = JobManager(self.runner, workers=1, max_queue=4)
+
+            first, created = manager.submit('AAPL', '2023-01-01', '2024-01-01')
+            second, coalesced_created = manager.submit('AAPL', '2023-01-01', '2024-01-01')
+            self.assertTrue(created)
+            self.assertFalse(coalesced_created)
+            self.assertIs(first, second)
+
+            # Runner options are part of the job identity
+            fast, fast_created = manager.submit('AAPL', '2023-01-01', '2024-01-01', engine='holt')
+            self.assertTrue(fast_created)
+
+            self.release.set()
+            while not (first.done and fast.done):
+                await (fast if first.done else first).wait_for_change(timeout=1)
+
+            self.assertEqual(first.status, SUCCEEDED)
+            self.assertIs(manager.get(first.job_id), first)
+            self.assertEqual(self.runs, ['AAPL', 'AAPL:holt'])
+
+            failed, _ = manager.submit('FAIL', '2023-01-01', '2024-01-01')
+            while not failed.done:
+                await failed.wait_for_change(timeout=1)
+            self.assertEqual(failed.status, FAILED)
+            self.assertEqual(failed.error, 'boom')
+            await manager.stop()
+
+        asyncio.run(scenario())
+
+    def test_queue_depth_limit(self):
+        """Test submissions beyond the queue depth are rejected"""
+        async def scenario():
+            self.release = asyncio.Event()
+            manager = JobManager(self.runner, workers=1, max_queue=1)
+
+            manager.submit('A', '2023-01-01', '2024-01-01')
+            await asyncio.sleep(0)  # let the worker pick up the first job
+            manager.submit('B', '2023-01-01', '2024-01-01')
+            with self.assertRaises(QueueFullError):
+                manager.submit('C', '2023-01-01', '2024-01-01')
+            await manager.stop()
+
+        asyncio.run(scenario())
+
+class TestResultStore(unittest.TestCase):
+    def test_ttl_and_capacity(self):
+        """Test expired entries vanish and the soonest-expiring entry is evicted"""
+        store = ResultStore(ttl=60, max_entries=2)
+        store.put('expired', 1, ttl=0.01)
+        store.put('forever', 2, ttl=math.inf)
+        time.sleep(0.02)
+
+        self.assertIsNone(store.get('expired'))
+        store.put('a', 3)
+        store.put('b', 4)
+
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.get('forever'), 2)
+        self.assertIsNone(store.get('a'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import time
+import unittest
+from src.core.data_ingestion import DataIngestionService
+from src.core.insights import MarketInsightsService, compact_frame
+from src.core.llm_cache import LLMCache
+from src.core.providers import SyntheticProvider
+from src.utils.fake_llm import FakeLLM
+
+class TestLLMCache(unittest.TestCase):
+    def setUp(self):
+        """Build recent data the way run_analysis does"""
+        raw = SyntheticProvider().download('AAPL', '2023-01-01', '2023-12-31')
+        self.recent = DataIngestionService._preprocess_data(raw).tail(10)
+        self.predictions = [190.123456, 191.5, 192.25]
+
+    def test_key_ignores_whitespace(self):
+        """Test prompts differing only in whitespace share a key"""
+        self.assertEqual(
+            LLMCache.make_key('m', 0.3, 'a  b\n\n  c'),
+            LLMCache.make_key('m', 0.3, 'a b\nc ')
+        )
+        self.assertNotEqual(LLMCache.make_key('m', 0.3, 'a'), LLMCache.make_key('m', 0.5, 'a'))
+
+    def test_ttl_and_max_entries(self):
+        """Test expired and least recently read entries are dropped"""
+        cache = LLMCache(':memory:', ttl=0.05, max_entries=2)
+        cache.put('a', 'A')
+        time.sleep(0.06)
+        self.assertIsNone(cache.get('a'))
+
+        cache.ttl = 60
+        for key in ('b', 'c', 'd'):
+            cache.put(key, key.upper())
+        self.assertEqual(cache.stats()['entries'], 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('d'), 'D')
+
+    def test_generate_insights_hits_cache(self):
+        """Test a repeated prompt is answered without calling the LLM"""
+        llm = FakeLLM(response='Bullish.')
+        service = MarketInsightsService(llm=llm, cache=LLMCache(':memory:'))
+
+        first = service.generate_insights(self.recent, self.predictions)
+        second = service.generate_insights(self.recent, self.predictions)
+
+        self.assertEqual(first, second)
+        self.assertEqual(llm.calls, 1)
+        self.assertEqual(service.cache.stats()['hits'], 1)
+
+    def test_compact_prompt_uses_fewer_tokens(self):
+        """Test the compact serializer shrinks the prompt and drops redundant columns"""
+        compact_llm, legacy_llm = FakeLLM(), FakeLLM()
+        MarketInsightsService(llm=compact_llm, cache=LLMCache(':memory:')).generate_insights(
+            self.recent, self.predictions
+        )
+        MarketInsightsService(llm=legacy_llm, cache=LLMCache(':memory:'), compact=False).generate_insights(
+            self.recent, self.predictions
+        )
+
+        self.assertLess(compact_llm.prompt_tokens, legacy_llm.prompt_tokens * 0.75)
+        header = compact_frame(self.recent).splitlines()[0]
+        self.assertNotIn('Adj Close', header)
+        self.assertTrue(header.startswith('Date,Open'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import logging
+import os
+import queue
+import shutil
+import tempfile
+import unittest
+from src.utils.logger import (
+    BLOCK, DROP, BoundedQueueHandler, BoundedQueueListener, setup_logger, shutdown_logging
+)
+
+class TestLogger(unittest.TestCase):
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.log_dir, ignore_errors=True)
+
+    def read_log(self, name):
+        with open(os.path.join(self.log_dir, f'{name}.log')) as f:
+            return f.read().splitlines()
+
+    def test_setup_is_idempotent(self):
+        """Test configuring a logger twice leaves a single handler"""
+        setup_logger('test_idempotent', log_dir=self.log_dir)
+        logger = setup_logger('test_idempotent', log_dir=self.log_dir)
+        self.assertEqual(len(logger.handlers), 1)
+        self.assertIsInstance(logger.handlers[0], BoundedQueueHandler)
+
+        logger.info('once')
+        shutdown_logging('test_idempotent')
+        self.assertEqual(len(self.read_log('test_idempotent')), 1)
+        self.assertEqual(logger.handlers, [])
+
+    def test_log_directory_created_on_first_record(self):
+        """Test setting a logger up writes nothing until it logs"""
+        log_dir = os.path.join(self.log_dir, 'nested')
+        logger = setup_logger('test_lazy', log_dir=log_dir)
+        self.assertFalse(os.path.exists(log_dir))
+
+        logger.info('first')
+        shutdown_logging('test_lazy')
+        self.assertTrue(os.path.exists(os.path.join(log_dir, 'test_lazy.log')))
+
+    def test_json_output_with_extra_fields(self):
+        """Test JSON records carry extra fields and the traceback separately"""
+        logger = setup_logger('test_json', json_format=True, log_dir=self.log_dir)
+        logger.info('analysed %s', 'AAPL', extra={'ticker': 'AAPL'})
+        try:
+            raise ValueError('bad')
+        except ValueError:
+            logger.exception('failed')
+        shutdown_logging('test_json')
+
+        info, error = [json.loads(line) for line in self.read_log('test_json')]
+        self.assertEqual(info['message'], 'analysed AAPL')
+        self.assertEqual(info['ticker'], 'AAPL')
+        self.assertEqual(error['message'], 'failed')
+        self.assertIn('ValueError: bad', error['exception'])
+
+    def test_debug_sampling(self):
+        """Test only the sampled fraction of debug records is written"""
+        logger = setup_logger('test_sampling', logging.DEBUG, debug_sample_rate=0.25, log_dir=self.log_dir)
+        for i in range(100):
+            logger.debug('tick %d', i)
+        logger.warning('always kept')
+        shutdown_logging('test_sampling')
+
+        lines = self.read_log('test_sampling')
+        self.assertEqual(len(lines), 26)
+        self.assertIn('always kept', lines[-1])
+
+    def test_full_queue_policies(self):
+        """Test a full queue drops records or makes the caller wait"""
+        handler = BoundedQueueHandler(queue.Queue(maxsize=2), DROP)
+        record = logging.LogRecord('test', logging.INFO, __file__, 1, 'msg', None, None)
+        for _ in range(5):
+            handler.handle(record)
+        self.assertEqual(handler.dropped, 3)
+
+        # Stopping drains the queue even though it is full
+        sink = logging.Handler()
+        sink.emit = lambda record: None
+        listener = BoundedQueueListener(handler.queue, sink)
+        listener.start()
+        listener.stop()
+        self.assertTrue(handler.queue.empty())
+
+        with self.assertRaises(ValueError):
+            BoundedQueueHandler(queue.Queue(), 'spill')
+        self.assertEqual(BoundedQueueHandler(queue.Queue(), BLOCK).policy, BLOCK)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import asyncio
+import unittest
+from src.core.prediction import PredictionService
+from src.core.providers import SyntheticProvider
+from src.core.result_store import ResultStore
+from src.utils import metrics
+from src.utils.metrics import MetricsMiddleware, MetricsRegistry
+
+class TestMetrics(unittest.TestCase):
+    def test_counter_and_histogram_render(self):
+        """Test the exposition text of counters and cumulative histogram buckets"""
+        registry = MetricsRegistry()
+        counter = registry.counter('jobs_total', 'Jobs run', ('status',))
+        counter.inc(status='ok')
+        counter.inc(2, status='ok')
+        histogram = registry.histogram('latency_seconds', 'Latency', buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value)
+
+        text = registry.render()
+        self.assertIn('# TYPE jobs_total counter', text)
+        self.assertIn('jobs_total{status="ok"} 3', text)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{le="1"} 2', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn('latency_seconds_count 3', text)
+        self.assertIn('latency_seconds_sum 5.55', text)
+
+    def test_registry_rejects_conflicting_metrics(self):
+        """Test a metric name cannot be reused with another type or labels"""
+        registry = MetricsRegistry()
+        self.assertIs(registry.counter('a_total', 'A'), registry.counter('a_total', 'A'))
+        with self.assertRaises(ValueError):
+            registry.histogram('a_total', 'A')
+        with self.assertRaises(ValueError):
+            registry.counter('a_total', 'A', ('cache',))
+
+    def test_collectors_and_label_escaping(self):
+        """Test collectors are read at render time and failing ones are skipped"""
+        registry = MetricsRegistry()
+        hits = {'n': 1}
+        registry.register_collector('ok', lambda: [('hits_total', 'counter', 'Hits', [({'cache': 'a"b'}, hits['n'])])])
+        registry.register_collector('broken', lambda: 1 / 0)
+
+        hits['n'] = 4
+        self.assertIn('hits_total{cache="a\\"b"} 4', registry.render())
+
+    def test_middleware_adds_server_timing(self):
+        """Test stages observed while serving a request appear in its Server-Timing header"""
+        async def app(scope, receive, send):
+            metrics.observe_stage('data', 0.0125)
+            await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+            await send({'type': 'http.response.body', 'body': b''})
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'type': 'http', 'method': 'GET', 'path': '/'}
+        asyncio.run(MetricsMiddleware(app)(scope, None, send))
+
+        headers = dict(sent[0]['headers'])
+        self.assertTrue(headers[b'server-timing'].startswith(b'data;dur=12.50, total;dur='))
+        self.assertGreaterEqual(metrics.HTTP_SECONDS.count(method='GET', route='unmatched', status=200), 1)
+
+    def test_fit_model_records_search_size(self):
+        """Test the order search reports how many candidates it fitted"""
+        raw = SyntheticProvider().download('AAPL', '2023-01-01', '2023-12-31')
+        model = PredictionService.fit_model(raw['Close'].reset_index(drop=True))
+        self.assertGreaterEqual(model.search_fits_, 1)
+
+        before = metrics.ARIMA_SEARCH_FITS.count()
+        PredictionService._build_result(model, 'miss', 3)
+        PredictionService._build_result(model, 'hit', 3)
+        self.assertEqual(metrics.ARIMA_SEARCH_FITS.count(), before + 1)
+
+    def test_result_store_stats(self):
+        """Test the result store counts hits and misses"""
+        store = ResultStore()
+        store.put('a', 1)
+        store.get('a')
+        store.get('b')
+        self.assertEqual(store.stats(), {'hits': 1, 'misses': 1, 'entries': 1})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import asyncio
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import numpy as np
+import pandas as pd
+import pmdarima as pm
+from src.core.model_registry import ModelRegistry, extend_model
+from src.core.prediction import PredictionService
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        """Create a sample series and a counting fit function"""
+        np.random.seed(42)
+        dates = pd.date_range(start='2023-01-01', periods=200, freq='D')
+        self.series = pd.Series(100 + np.cumsum(np.random.normal(0, 1, len(dates))), index=dates)
+        self.fits = 0
+
+    def fit(self, data):
+        self.fits += 1
+        return pm.ARIMA(order=(1, 1, 0), suppress_warnings=True).fit(data)
+
+    def test_exact_hit(self):
+        """Test the same series is served without refitting"""
+        registry = ModelRegistry()
+        first, status = registry.get_or_fit('AAPL', self.series, self.fit)
+        self.assertEqual(status, 'miss')
+
+        second, status = registry.get_or_fit('AAPL', self.series.copy(), self.fit)
+        self.assertEqual(status, 'hit')
+        self.assertIs(first, second)
+        self.assertEqual(self.fits, 1)
+
+    def test_update_and_refit_reuse_order(self):
+        """Test new bars are absorbed by update() or an order-preserving refit"""
+        registry = ModelRegistry(max_update_bars=5)
+        registry.get_or_fit('AAPL', self.series.iloc[:150], self.fit)
+
+        model, status = registry.get_or_fit('AAPL', self.series.iloc[:153], self.fit)
+        self.assertEqual(status, 'update')
+        self.assertEqual(model.order, (1, 1, 0))
+
+        model, status = registry.get_or_fit('AAPL', self.series, self.fit)
+        self.assertEqual(status, 'refit')
+        self.assertEqual(model.order, (1, 1, 0))
+
+        self.assertEqual(self.fits, 1)
+        stats = registry.stats()
+        self.assertEqual((stats['misses'], stats['updates'], stats['refits']), (1, 1, 1))
+        self.assertEqual(stats['entries'], 1)
+
+    def test_update_leaves_served_model_untouched(self):
+        """Test absorbing new bars does not mutate a model an earlier hit handed out"""
+        registry = ModelRegistry(max_update_bars=5)
+        served, _ = registry.get_or_fit('AAPL', self.series.iloc[:150], self.fit)
+        before = served.predict(n_periods=3)
+
+        updated, status = registry.get_or_fit('AAPL', self.series.iloc[:153], self.fit)
+
+        self.assertEqual(status, 'update')
+        self.assertIsNot(updated, served)
+        np.testing.assert_allclose(served.predict(n_periods=3), before)
+        self.assertEqual(registry.stats()['entries'], 1)
+
+    def test_lru_eviction(self):
+        """Test the least recently used model is evicted past max_entries"""
+        registry = ModelRegistry(max_entries=1)
+        registry.get_or_fit('AAPL', self.series, self.fit)
+        registry.get_or_fit('MSFT', self.series, self.fit)
+
+        self.assertEqual(registry.stats()['evictions'], 1)
+        _, status = registry.lookup('AAPL', self.series)
+        self.assertEqual(status, 'miss')
+
+    def test_persistence(self):
+        """Test a new registry loads models persisted by a previous one"""
+        persist_dir = tempfile.mkdtemp()
+        try:
+            ModelRegistry(persist_dir=persist_dir).get_or_fit('AAPL', self.series, self.fit)
+            _, status = ModelRegistry(persist_dir=persist_dir).get_or_fit('AAPL', self.series, self.fit)
+
+            self.assertEqual(status, 'hit')
+            self.assertEqual(self.fits, 1)
+        finally:
+            shutil.rmtree(persist_dir, ignore_errors=True)
+
+    def test_forecast_prices_with_registry(self):
+        """Test repeated forecasts for a ticker hit the registry"""
+        registry = ModelRegistry()
+        registry.put('AAPL', self.series, self.fit(self.series))
+
+        result = PredictionService.forecast_prices(self.series, ticker='AAPL', registry=registry)
+
+        self.assertEqual(result['model_cache'], 'hit')
+        self.assertEqual(len(result['prediction_results']['forecast']), 7)
+
+    def test_async_refit_runs_in_process_pool(self):
+        """Test the async path looks up on the I/O pool and refits on the CPU pool"""
+        registry = ModelRegistry(max_update_bars=5)
+        registry.put('AAPL', self.series.iloc[:150], self.fit(self.series.iloc[:150]))
+        cpu, io = mock.Mock(wraps=ThreadPoolExecutor(1)), mock.Mock(wraps=ThreadPoolExecutor(1))
+
+        with mock.patch('src.core.prediction.get_cpu_executor', return_value=cpu), \
+                mock.patch('src.core.prediction.get_io_executor', return_value=io):
+            result = asyncio.run(PredictionService.aforecast_prices(self.series, ticker='AAPL', registry=registry))
+
+        self.assertEqual(result['model_cache'], 'refit')
+        self.assertEqual([call.args[0] for call in cpu.submit.call_args_list], [extend_model])
+        self.assertNotIn(extend_model, [call.args[0] for call in io.submit.call_args_list])
+        self.assertEqual(registry.lookup('AAPL', self.series)[1], 'hit')
+        self.assertEqual(registry.stats()['refits'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.core.data_ingestion import DataIngestionService
+from src.core.order_search import SearchSpace, detect_period, plan_search
+from src.core.prediction import PredictionService
+from src.core.providers import SyntheticProvider
+
+class TestOrderSearch(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.walk = DataIngestionService._preprocess_data(
+            SyntheticProvider().download('AAPL', '2022-01-01', '2024-01-01')
+        )['Close']
+
+    def test_random_walk_is_not_seasonal(self):
+        """Test a random walk gets d=1, no seasonal term and small p/q bounds"""
+        space = plan_search(self.walk)
+
+        self.assertEqual(space, SearchSpace(d=1, max_p=1, max_q=1))
+        self.assertFalse(space.auto_arima_kwargs()['seasonal'])
+        self.assertNotIn('m', space.auto_arima_kwargs())
+
+    def test_weekly_cycle_is_detected(self):
+        """Test a 5-day cycle is found and only its period is searched"""
+        cycle = 5 * np.sin(2 * np.pi * np.arange(500) / 5)
+        series = 100 + np.cumsum(self.rng.normal(0, 1, 500)) + cycle
+
+        self.assertEqual(detect_period(np.diff(series)), 5)
+        self.assertEqual(detect_period(self.rng.normal(size=500)), None)
+        kwargs = plan_search(series).auto_arima_kwargs()
+        self.assertTrue(kwargs['seasonal'])
+        self.assertEqual(kwargs['m'], 5)
+
+    def test_ar_bounds(self):
+        """Test the PACF bounds p for a stationary AR(2) series"""
+        values = np.zeros(600)
+        for i in range(2, 600):
+            values[i] = 0.6 * values[i - 1] - 0.3 * values[i - 2] + self.rng.normal()
+        space = plan_search(values + 50)
+
+        self.assertEqual(space.d, 0)
+        self.assertEqual(space.max_p, 2)
+
+    def test_parallel_search_uses_grid(self):
+        """Test more than one job switches the search from stepwise to the grid"""
+        space = SearchSpace(d=1, max_p=2, max_q=1)
+        self.assertTrue(space.auto_arima_kwargs()['stepwise'])
+        self.assertEqual(space.auto_arima_kwargs(n_jobs=4)['stepwise'], False)
+        self.assertEqual(space.auto_arima_kwargs(n_jobs=4)['n_jobs'], 4)
+
+    def test_fit_model_stays_in_space(self):
+        """Test the fitted order respects the planned space"""
+        model = PredictionService.fit_model(pd.Series(self.walk.to_numpy()[:250]))
+
+        self.assertEqual(model.order[1], model.search_space_.d)
+        self.assertLessEqual(model.order[0], model.search_space_.max_p)
+        self.assertLessEqual(model.order[2], model.search_space_.max_q)
+        self.assertEqual(model.seasonal_order[3], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from src.core.data_ingestion import DataIngestionService
+from src.core.portfolio import PortfolioService, RunningCovariance
+from src.core.price_store import PriceStore
+from src.core.providers import SyntheticProvider
+
+TICKERS = ['AAPL', 'MSFT', 'GOOG', 'AMZN', 'TSLA']
+
+class TestRunningCovariance(unittest.TestCase):
+    def test_blocks_and_bars_match_one_pass(self):
+        """Test merging blocks and single bars gives numpy's covariance"""
+        rng = np.random.default_rng(0)
+        returns = rng.normal(0.001, 0.02, size=(300, 6))
+
+        state = RunningCovariance(6)
+        state.update(returns[:100]).update(returns[100:250])
+        for bar in returns[250:]:
+            state.update(bar)
+
+        np.testing.assert_allclose(state.covariance(), np.cov(returns.T))
+        np.testing.assert_allclose(state.correlation(), np.corrcoef(returns.T))
+        np.testing.assert_allclose(state.mean, returns.mean(axis=0))
+
+class TestPortfolioService(unittest.TestCase):
+    def setUp(self):
+        """Create a service over an empty store backed by the offline provider"""
+        self.root = tempfile.mkdtemp()
+        self.store = PriceStore(self.root, provider=SyntheticProvider())
+        # Small blocks so every blocked path runs more than once
+        self.service = PortfolioService(self.store, fetch_batch=2, chunk_size=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def frame(self, tickers, end_date='2024-01-01'):
+        dates, returns = self.service.returns_matrix(tickers, '2022-01-01', end_date)
+        return pd.DataFrame(returns, index=dates, columns=tickers)
+
+    def test_returns_match_preprocessing(self):
+        """Test aligned returns are the preprocessed Returns column of each ticker"""
+        frame = self.frame(TICKERS)
+        preprocessed = DataIngestionService._preprocess_data(self.store.get('MSFT', '2022-01-01', '2024-01-01'))
+
+        np.testing.assert_allclose(frame['MSFT'].reindex(preprocessed.index), preprocessed['Returns'])
+        self.assertFalse(np.isnan(frame.to_numpy()).any())
+
+    def test_statistics_match_pandas(self):
+        """Test covariance, correlation, beta, volatility and rolling correlation against pandas"""
+        result = self.service.analyze(TICKERS, '2022-01-01', '2024-01-01', benchmark='SPY', window=20, top_pairs=3)
+        frame = self.frame(TICKERS + ['SPY'])
+        returns = frame[TICKERS]
+
+        np.testing.assert_allclose(np.array(result['covariance']) / 252, returns.cov())
+        np.testing.assert_allclose(result['correlation'], returns.corr())
+        self.assertAlmostEqual(result['beta']['AAPL'], frame['AAPL'].cov(frame['SPY']) / frame['SPY'].var())
+        weights = np.full(5, 0.2)
+        self.assertAlmostEqual(result['portfolio']['volatility'], np.sqrt(weights @ returns.cov() @ weights * 252))
+        self.assertAlmostEqual(sum(result['risk_contribution'].values()), 1.0)
+
+        rolling = returns.rolling(20).corr(frame['SPY'])
+        np.testing.assert_allclose(result['rolling_correlation']['values']['GOOG'], rolling['GOOG'].iloc[19:])
+
+        upper = returns.corr().to_numpy()[np.triu_indices(5, 1)]
+        np.testing.assert_allclose([pair['correlation'] for pair in result['top_pairs']], np.sort(upper)[::-1][:3])
+
+    def test_beta_to_portfolio(self):
+        """Test without a benchmark the weighted betas to the portfolio sum to one"""
+        result = self.service.analyze(TICKERS, '2022-01-01', '2024-01-01', weights={'AAPL': 3, 'MSFT': 1})
+
+        self.assertEqual(result['beta_to'], 'portfolio')
+        self.assertEqual(result['weights']['GOOG'], 0.0)
+        beta = sum(result['weights'][t] * result['beta'][t] for t in TICKERS)
+        self.assertAlmostEqual(beta, 1.0)
+
+    def test_later_end_date_updates_incrementally(self):
+        """Test a later request merges only the new bars and matches a full recompute"""
+        self.service.analyze(TICKERS, '2022-01-01', '2024-01-01')
+        with mock.patch.object(RunningCovariance, 'update', autospec=True, side_effect=RunningCovariance.update) as update:
+            result = self.service.analyze(TICKERS, '2022-01-01', '2024-02-01')
+
+        returns = self.frame(TICKERS, '2024-02-01')
+        added = int((returns.index >= '2024-01-01').sum())
+        self.assertEqual(sum(len(call.args[1]) for call in update.call_args_list), added)
+        np.testing.assert_allclose(np.array(result['covariance']) / 252, returns.cov())
+
+    def test_changed_history_is_recomputed(self):
+        """Test a kept state is only extended when its dates are still the prefix"""
+        rng = np.random.default_rng(1)
+        dates = pd.bdate_range('2023-01-02', periods=120)
+        returns = rng.normal(0.0, 0.02, size=(120, 3))
+        self.service._running_covariance(['A', 'B', 'C'], '2023-01-01', dates[:100], returns[:100], 'float64')
+
+        # A bar inside the kept range disappeared, e.g. one ticker's gap was revised
+        changed = np.delete(np.arange(120), 10)
+        state = self.service._running_covariance(['A', 'B', 'C'], '2023-01-01', dates[changed], returns[changed], 'float64')
+
+        np.testing.assert_allclose(state.covariance(), np.cov(returns[changed].T))
+
+    def test_large_states_are_not_kept(self):
+        """Test baskets beyond the state memory budget are recomputed rather than kept"""
+        service = PortfolioService(self.store, max_states=4, max_state_bytes=4 * 8 * 5 * 5)
+        service.analyze(TICKERS, '2022-01-01', '2024-01-01')
+        service.analyze(TICKERS + ['IBM'], '2022-01-01', '2024-01-01')
+
+        self.assertEqual(len(service.states), 1)
+
+    def test_large_basket_is_compact(self):
+        """Test big baskets skip the full matrices unless asked and float32 stays close"""
+        tickers = [f"T{i:03d}" for i in range(120)]
+        service = PortfolioService(self.store)
+        result = service.analyze(tickers, '2023-01-01', '2024-01-01', dtype='float32', top_pairs=5)
+        exact = service.analyze(tickers, '2023-01-01', '2024-01-01', include_matrix=True)
+
+        self.assertNotIn('correlation', result)
+        self.assertEqual(len(result['rolling_correlation']['latest']), 120)
+        self.assertEqual(len(exact['correlation']), 120)
+        self.assertAlmostEqual(result['portfolio']['volatility'], exact['portfolio']['volatility'], places=5)
+        self.assertEqual(result['top_pairs'][0]['pair'], exact['top_pairs'][0]['pair'])
+
+    def test_errors(self):
+        """Test invalid baskets are reported"""
+        with self.assertRaises(ValueError):
+            self.service.analyze(['AAPL'], '2022-01-01', '2024-01-01')
+        with self.assertRaises(ValueError):
+            self.service.analyze(TICKERS, '2022-01-01', '2024-01-01', weights={'IBM': 1})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from src.core.preload import configured_stages, preload
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestPreload(unittest.TestCase):
+    def test_import_is_lazy(self):
+        """Test importing the API loads no stage dependency and writes no log directory"""
+        with tempfile.TemporaryDirectory() as cwd:
+            out = subprocess.run(
+                [sys.executable, '-c', "import sys, main; print(sorted(m for m in "
+                 "('pmdarima', 'langchain_groq', 'matplotlib', 'scipy.stats', 'statsmodels') if m in sys.modules))"],
+                cwd=cwd, env={**os.environ, 'PYTHONPATH': ROOT}, capture_output=True, text=True, check=True
+            ).stdout
+            self.assertEqual(out.strip().splitlines()[-1], '[]')
+            self.assertFalse(os.path.exists(os.path.join(cwd, 'logs')))
+
+    def test_configured_stages(self):
+        """Test ANALYSIS_PRELOAD selects stages and their dependencies"""
+        with mock.patch.dict(os.environ, {'ANALYSIS_PRELOAD': ''}):
+            self.assertIsNone(configured_stages())
+        with mock.patch.dict(os.environ, {'ANALYSIS_PRELOAD': 'all'}):
+            self.assertEqual(configured_stages(), ('forecast', 'insights', 'charts', 'scenarios'))
+        with mock.patch.dict(os.environ, {'ANALYSIS_PRELOAD': 'charts'}):
+            self.assertEqual(configured_stages(), ('forecast', 'charts'))
+
+    def test_preload_imports_stage_modules(self):
+        """Test preloading a stage imports its modules"""
+        timings = preload(['charts'])
+        self.assertEqual(set(timings), {'forecast', 'charts'})
+        self.assertIn('pmdarima', sys.modules)
+        self.assertIn('matplotlib.figure', sys.modules)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,5 +20,15 @@ class TestPreprocessing(unittest.TestCase):
         self.assertIn('Returns', processed_data.columns)
         self.assertFalse(processed_data['Returns'].isnull().any())
 
+    def test_normalize_data(self):
+        """Test min-max scaling keeps the original columns and scales numeric ones"""
+        data = self.sample_data.assign(Ticker='AAA')
+        normalized = PreprocessingService.normalize_data(data)
+
+        self.assertEqual(list(normalized.columns), ['Close', 'Ticker', 'Close_normalized'])
+        self.assertEqual(normalized['Close_normalized'].iloc[0], 0.0)
+        self.assertEqual(normalized['Close_normalized'].iloc[-1], 1.0)
+        self.assertAlmostEqual(normalized['Close_normalized'].iloc[5], 0.5)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,71 @@
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from src.core.data_ingestion import DataIngestionService
+from src.core.price_store import PriceStore
+from src.core.providers import SyntheticProvider
+
+class TestPriceStore(unittest.TestCase):
+    def setUp(self):
+        """Create an empty store backed by the offline provider"""
+        self.root = tempfile.mkdtemp()
+        self.provider = SyntheticProvider()
+        self.store = PriceStore(self.root, provider=self.provider)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_cold_fetch_matches_provider(self):
+        """Test first read returns exactly what the provider serves"""
+        df = self.store.get('AAPL', '2023-01-01', '2023-06-30')
+        expected = SyntheticProvider().download('AAPL', '2023-01-01', '2023-06-30')
+
+        pd.testing.assert_frame_equal(df, expected, check_freq=False)
+        self.assertEqual(len(self.provider.calls), 1)
+
+    def test_warm_read_skips_provider(self):
+        """Test a repeated or narrower request is served from disk"""
+        self.store.get('AAPL', '2023-01-01', '2023-12-31')
+        df = self.store.get('AAPL', '2023-03-01', '2023-04-01')
+
+        self.assertEqual(len(self.provider.calls), 1)
+        self.assertEqual(df.index.min(), pd.Timestamp('2023-03-01'))
+        self.assertLess(df.index.max(), pd.Timestamp('2023-04-01'))
+
+    def test_incremental_head_and_tail(self):
+        """Test only the missing head and tail are downloaded"""
+        self.store.get('MSFT', '2023-03-01', '2023-06-01')
+        df = self.store.get('MSFT', '2023-01-01', '2023-09-01')
+
+        self.assertEqual(self.provider.calls[1:], [
+            (['MSFT'], '2023-01-01', '2023-03-01'),
+            (['MSFT'], '2023-06-01', '2023-09-01'),
+        ])
+        expected = SyntheticProvider().download('MSFT', '2023-01-01', '2023-09-01')
+        pd.testing.assert_frame_equal(df, expected, check_freq=False)
+        self.assertEqual(
+            self.store.coverage('MSFT'),
+            (pd.Timestamp('2023-01-01'), pd.Timestamp('2023-09-01'))
+        )
+
+    def test_rejects_unsafe_tickers(self):
+        """Test path-like tickers are refused before touching the disk"""
+        for ticker in ('.', '..', '../AAPL', 'A/B', ''):
+            with self.assertRaises(ValueError):
+                self.store.get(ticker, '2023-01-01', '2023-02-01')
+        with self.assertRaises(ValueError):
+            self.store.get_many(['AAPL', '..'], '2023-01-01', '2023-02-01')
+
+        self.assertEqual(self.provider.calls, [])
+        self.assertFalse(self.store.get('brk-b', '2023-01-01', '2023-02-01').empty)
+
+    def test_fetch_stock_data_uses_store(self):
+        """Test the ingestion service reads through an injected store"""
+        result = DataIngestionService.fetch_stock_data('AAPL', '2023-01-01', '2023-12-31', store=self.store)
+
+        self.assertFalse(result['raw_data'].empty)
+        self.assertFalse(result['preprocessed_data'].isnull().any().any())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import random
+import threading
+import unittest
+import pandas as pd
+import requests
+from src.core.provider_pool import CoalescingProvider, ThrottledProvider, TokenBucket
+from src.core.providers import HTTPProvider, SyntheticProvider, TransientProviderError
+from src.utils.market_data_server import MarketDataServer
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+class FlakyProvider(SyntheticProvider):
+    """Synthetic provider failing its first `failures` calls"""
+
+    def __init__(self, failures, retry_after=None):
+        super().__init__()
+        self.failures = failures
+        self.retry_after = retry_after
+
+    def download(self, ticker, start_date, end_date):
+        return self.download_many([ticker], start_date, end_date)[ticker]
+
+    def download_many(self, tickers, start_date, end_date):
+        if self.failures:
+            self.failures -= 1
+            self.calls.append((list(tickers), start_date, end_date))
+            raise TransientProviderError("Too many requests", retry_after=self.retry_after)
+        return super().download_many(tickers, start_date, end_date)
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_rate(self):
+        """Test a burst passes at once and later calls are spaced at the rate"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=3, clock=clock, sleep=clock.sleep)
+
+        waits = [bucket.acquire() for _ in range(5)]
+
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(waits[3], 0.5)
+        self.assertAlmostEqual(clock.now, 1.0)
+
+    def test_refills_while_idle(self):
+        """Test tokens come back with time, up to the burst"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, burst=2, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+        bucket.acquire()
+
+        clock.now += 10
+
+        self.assertEqual([bucket.acquire(), bucket.acquire()], [0.0, 0.0])
+        self.assertAlmostEqual(bucket.acquire(), 1.0)
+
+class TestThrottledProvider(unittest.TestCase):
+    def test_retries_transient_errors(self):
+        """Test transient failures are retried with bounded jittered delays"""
+        clock = FakeClock()
+        provider = ThrottledProvider(
+            FlakyProvider(failures=2), retries=3, backoff=0.5, sleep=clock.sleep, rng=random.Random(0)
+        )
+
+        df = provider.download('AAPL', '2023-01-01', '2023-03-01')
+
+        self.assertFalse(df.empty)
+        self.assertEqual(len(clock.slept), 2)
+        self.assertLessEqual(clock.slept[0], 0.5)
+        self.assertLessEqual(clock.slept[1], 1.0)
+
+    def test_honours_retry_after(self):
+        """Test the delay is at least what the source asked for"""
+        clock = FakeClock()
+        provider = ThrottledProvider(FlakyProvider(failures=1, retry_after=2.0), sleep=clock.sleep)
+
+        provider.download('AAPL', '2023-01-01', '2023-03-01')
+
+        self.assertGreaterEqual(clock.slept[0], 2.0)
+
+    def test_gives_up_after_retries(self):
+        """Test the last transient error is raised once retries run out"""
+        clock = FakeClock()
+        inner = FlakyProvider(failures=10)
+        provider = ThrottledProvider(inner, retries=2, sleep=clock.sleep)
+
+        with self.assertRaises(TransientProviderError):
+            provider.download('AAPL', '2023-01-01', '2023-03-01')
+        self.assertEqual(len(inner.calls), 3)
+
+class TestCoalescingProvider(unittest.TestCase):
+    def test_concurrent_downloads_share_one_call(self):
+        """Test concurrent single-ticker downloads become one bulk download"""
+        inner = SyntheticProvider()
+        provider = CoalescingProvider(inner, window=0.2)
+        tickers = ['AAPL', 'MSFT', 'GOOG', 'AMZN']
+        results = {}
+
+        def fetch(ticker):
+            results[ticker] = provider.download(ticker, '2023-01-01', '2023-03-01')
+
+        threads = [threading.Thread(target=fetch, args=(t,)) for t in tickers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(inner.calls), 1)
+        self.assertEqual(sorted(inner.calls[0][0]), sorted(tickers))
+        for ticker in tickers:
+            expected = SyntheticProvider().download(ticker, '2023-01-01', '2023-03-01')
+            pd.testing.assert_frame_equal(results[ticker], expected, check_freq=False)
+
+    def test_errors_reach_every_caller(self):
+        """Test a failed bulk download fails each waiting caller"""
+        provider = CoalescingProvider(FlakyProvider(failures=1), window=0.01)
+
+        with self.assertRaises(TransientProviderError):
+            provider.download('AAPL', '2023-01-01', '2023-03-01')
+
+class TestHTTPProvider(unittest.TestCase):
+    def test_round_trip_and_connection_reuse(self):
+        """Test bars survive the wire and one session keeps one connection"""
+        with MarketDataServer() as server:
+            provider = HTTPProvider(server.url, session=requests.Session())
+            frames = provider.download_many(['AAPL', 'MSFT'], '2023-01-01', '2023-03-01')
+            provider.download('AAPL', '2023-03-01', '2023-04-01')
+
+            self.assertEqual(server.stats['requests'], 2)
+            self.assertEqual(server.stats['connections'], 1)
+
+        expected = SyntheticProvider().download('MSFT', '2023-01-01', '2023-03-01')
+        pd.testing.assert_frame_equal(frames['MSFT'], expected, check_freq=False)
+
+    def test_throttled_responses_are_retried(self):
+        """Test 429 and 503 answers surface as transient errors and are retried"""
+        with MarketDataServer(rate=1) as server:
+            provider = HTTPProvider(server.url, session=requests.Session())
+            provider.download('AAPL', '2023-01-01', '2023-03-01')
+            with self.assertRaises(TransientProviderError) as ctx:
+                provider.download('AAPL', '2023-01-01', '2023-03-01')
+            self.assertEqual(ctx.exception.retry_after, 1.0)
+
+        with MarketDataServer(failure_rate=0.5, seed=1) as server:
+            clock = FakeClock()
+            provider = ThrottledProvider(
+                HTTPProvider(server.url, session=requests.Session()), retries=10, sleep=clock.sleep
+            )
+            for _ in range(5):
+                self.assertFalse(provider.download('AAPL', '2023-01-01', '2023-03-01').empty)
+            self.assertGreater(server.stats['failed'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
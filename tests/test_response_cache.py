@@ -0,0 +1,88 @@
+import asyncio
+import math
+import unittest
+from datetime import datetime
+from src.core.response_cache import AnalysisCache, MARKET_TZ, market_ttl, HIT, MISS, COALESCED
+
+class TestMarketTTL(unittest.TestCase):
+    def test_settled_range_never_expires(self):
+        """Test ranges ending today or earlier are cached forever"""
+        now = datetime(2024, 3, 6, 11, 0, tzinfo=MARKET_TZ)
+        self.assertEqual(market_ttl('2024-03-06', now=now), math.inf)
+        self.assertEqual(market_ttl('2023-01-01', now=now), math.inf)
+
+    def test_live_range_during_market_hours(self):
+        """Test live ranges use the short TTL while the market is open"""
+        now = datetime(2024, 3, 6, 11, 0, tzinfo=MARKET_TZ)
+        self.assertEqual(market_ttl('2024-03-07', open_ttl=30, now=now), 30)
+
+    def test_live_range_after_close_lasts_until_next_open(self):
+        """Test a Friday evening result lives until Monday's open"""
+        now = datetime(2024, 3, 8, 17, 0, tzinfo=MARKET_TZ)
+        expected = (datetime(2024, 3, 11, 9, 30, tzinfo=MARKET_TZ) - now).total_seconds()
+        self.assertEqual(market_ttl('2024-03-09', now=now), expected)
+
+class TestAnalysisCache(unittest.TestCase):
+    def test_coalescing_and_hits(self):
+        """Test concurrent identical requests share one computation"""
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {'ticker': 'AAPL'}
+
+        async def scenario():
+            cache = AnalysisCache()
+            key = ('AAPL', '2023-01-01', '2024-01-01')
+            first, second = await asyncio.gather(
+                cache.get_or_compute(key, compute),
+                cache.get_or_compute(key, compute)
+            )
+            third = await cache.get_or_compute(key, compute)
+            return cache, [first[1], second[1], third[1]]
+
+        cache, statuses = asyncio.run(scenario())
+
+        self.assertEqual(statuses, [MISS, COALESCED, HIT])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats()['entries'], 1)
+
+    def test_failures_are_not_cached(self):
+        """Test an exception reaches every waiter and is retried next time"""
+        async def failing():
+            raise ValueError('boom')
+
+        async def scenario():
+            cache = AnalysisCache()
+            key = ('AAPL', '2023-01-01', '2024-01-01')
+            with self.assertRaises(ValueError):
+                await cache.get_or_compute(key, failing)
+            return cache.stats()
+
+        stats = asyncio.run(scenario())
+        self.assertEqual(stats['entries'], 0)
+
+    def test_invalid_entries_are_recomputed(self):
+        """Test a cached response failing the validity check is computed again"""
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return {'charts': len(calls)}
+
+        async def scenario():
+            cache = AnalysisCache()
+            key = ('AAPL', '2023-01-01', '2024-01-01')
+            await cache.get_or_compute(key, compute)
+            stale = await cache.get_or_compute(key, compute, valid=lambda response: False)
+            fresh = await cache.get_or_compute(key, compute, valid=lambda response: True)
+            return [stale, fresh]
+
+        stale, fresh = asyncio.run(scenario())
+
+        self.assertEqual(stale, ({'charts': 2}, MISS))
+        self.assertEqual(fresh, ({'charts': 2}, HIT))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from src.core.forecast_engines import ClosedFormModel, get_engine
+from src.core.model_registry import ModelRegistry
+from src.core.price_store import PriceStore
+from src.core.providers import SyntheticProvider
+from src.core.scenarios import ScenarioService, model_residuals
+
+class TestScenarioService(unittest.TestCase):
+    def setUp(self):
+        self.returns = np.random.default_rng(0).normal(0.0, 0.02, 500)
+
+    def test_matches_loop(self):
+        """Test the chunked simulation matches a path-by-path loop with the same draws"""
+        horizon, paths = 5, 300
+        result = ScenarioService.simulate(100.0, self.returns, horizon=horizon, paths=paths, seed=7, chunk_size=64)
+
+        rng = np.random.default_rng(7)
+        terminal, touched = [], 0
+        for start in range(0, paths, 64):
+            draws = rng.integers(0, len(self.returns), size=(min(64, paths - start), horizon), dtype=np.int32)
+            for row in draws:
+                prices = 100.0 * np.cumprod(1 + self.returns[row])
+                terminal.append(prices[-1])
+                touched += prices.min() <= 95.0
+
+        returns = np.array(terminal) / 100.0 - 1
+        self.assertAlmostEqual(result['var']['0.95'], -np.quantile(returns, 0.05), places=9)
+        self.assertAlmostEqual(result['probability_of_touch']['-5%'], touched / paths)
+        self.assertAlmostEqual(result['terminal_percentiles']['50'], np.median(terminal), places=6)
+
+    def test_risk_measures(self):
+        """Test CVaR exceeds VaR, deeper levels lose more and float32 agrees with float64"""
+        exact = ScenarioService.simulate(100.0, self.returns, paths=20000, seed=1)
+        fast = ScenarioService.simulate(100.0, self.returns, paths=20000, seed=1, dtype='float32')
+
+        self.assertGreater(exact['cvar']['0.95'], exact['var']['0.95'])
+        self.assertGreater(exact['var']['0.99'], exact['var']['0.95'])
+        self.assertGreater(exact['probability_of_touch']['-5%'], exact['probability_of_touch']['-10%'])
+        self.assertEqual(fast['dtype'], 'float32')
+        self.assertAlmostEqual(fast['var']['0.95'], exact['var']['0.95'], places=5)
+
+    def test_residuals_follow_forecast(self):
+        """Test residual paths are centred on the point forecast"""
+        result = ScenarioService.simulate(
+            100.0, np.array([-1.0, 1.0]), horizon=3, paths=10000, method='residuals',
+            baseline=np.array([110.0, 111.0, 112.0]), seed=0
+        )
+        self.assertAlmostEqual(result['terminal_percentiles']['50'], 112.0, delta=1.0)
+        self.assertEqual(result['probability_of_touch']['+5%'], 1.0)
+
+        model = ClosedFormModel(get_engine('drift'), np.array([1.0, 2.0, 4.0, 5.0]))
+        np.testing.assert_allclose(model_residuals(model), [-1 / 3, 2 / 3, -1 / 3])
+
+    def test_seasonal_residuals_skip_start_up(self):
+        """Test a seasonally differenced model drops its d + D * s start-up residuals"""
+        import pmdarima as pm
+
+        rng = np.random.default_rng(3)
+        prices = 100 + np.tile([0.0, 1.0, 2.0, 1.0, 0.0], 40) + np.cumsum(rng.normal(0, 0.1, 200))
+        model = pm.ARIMA(order=(1, 1, 0), seasonal_order=(1, 1, 0, 5), suppress_warnings=True).fit(prices)
+
+        residuals = model_residuals(model)
+        self.assertEqual(len(residuals), len(prices) - 1 - 5)
+        self.assertLess(np.abs(residuals).max(), 10 * residuals.std())
+
+    def test_paths_must_be_positive(self):
+        """Test an empty simulation is rejected instead of returning NaN statistics"""
+        with self.assertRaises(ValueError):
+            ScenarioService.simulate(100.0, self.returns, paths=0)
+
+    def test_run(self):
+        """Test both methods run end to end from the price store"""
+        root = tempfile.mkdtemp()
+        try:
+            service = ScenarioService(PriceStore(root, provider=SyntheticProvider()), ModelRegistry())
+            bootstrap = service.run('AAA', '2023-01-01', '2024-01-01', paths=1000, seed=0)
+            residuals = service.run('AAA', '2023-01-01', '2024-01-01', method='residuals', engine='drift', paths=1000, seed=0)
+
+            self.assertEqual(bootstrap['method'], 'bootstrap')
+            self.assertEqual(residuals['last_price'], bootstrap['last_price'])
+            with self.assertRaises(ValueError):
+                service.run('AAA', '2023-01-01', '2024-01-01', confidence=[95])
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import io
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from src.core import series_export
+from src.core.data_ingestion import DataIngestionService
+from src.core.feature_engine import FINANCIAL_FEATURES
+from src.core.model_registry import ModelRegistry
+from src.core.prediction import PredictionService
+from src.core.preprocessing import PreprocessingService
+from src.core.price_store import PriceStore
+from src.core.providers import SyntheticProvider
+from src.core.series_export import (
+    FormatUnavailableError, SeriesExportService, arrow_available, negotiate_format
+)
+
+class WeekendProvider(SyntheticProvider):
+    """Synthetic prices where -USD tickers also trade on weekends"""
+
+    def _generate(self, ticker, start_date, end_date):
+        frame = super()._generate(ticker, start_date, end_date)
+        if not ticker.endswith('-USD'):
+            return frame
+        return frame.reindex(pd.date_range(frame.index[0], frame.index[-1], name='Date')).ffill()
+
+class TestSeriesExportService(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.service = SeriesExportService(PriceStore(self.root, provider=SyntheticProvider()), ModelRegistry())
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_features_match_preprocessing(self):
+        """Test exported features equal PreprocessingService on the warm-up window"""
+        frame = self.service.build_frame(['AAA'], '2023-01-01', '2024-01-01', columns=list(FINANCIAL_FEATURES))
+        raw = self.service.store.get('AAA', '2022-09-23', '2024-01-01')
+        expected = PreprocessingService.engineer_financial_features(raw)
+        expected = expected.loc[expected.index >= '2023-01-01']
+
+        self.assertEqual(list(frame.columns), ['Date', 'Ticker'] + list(FINANCIAL_FEATURES))
+        self.assertFalse(frame.isnull().any().any())
+        for name in FINANCIAL_FEATURES:
+            np.testing.assert_allclose(frame[name].to_numpy(), expected[name].to_numpy(), rtol=1e-9)
+
+    def test_mixed_calendars(self):
+        """Test each ticker's features use its own dates when calendars differ"""
+        service = SeriesExportService(PriceStore(self.root, provider=WeekendProvider()), ModelRegistry())
+        frame = service.build_frame(['BTC-USD', 'AAA'], '2023-01-01', '2024-01-01', columns=['Close', 'MA_20', 'RSI'])
+
+        self.assertEqual(list(frame['Ticker'].unique()), ['AAA', 'BTC-USD'])
+        self.assertFalse(frame.isnull().any().any())
+        for ticker in ('AAA', 'BTC-USD'):
+            raw = service.store.get(ticker, '2022-09-23', '2024-01-01')
+            expected = PreprocessingService.engineer_financial_features(raw)
+            expected = expected.loc[expected.index >= '2023-01-01']
+            rows = frame[frame['Ticker'] == ticker]
+            self.assertEqual(len(rows), len(expected))
+            for name in ('MA_20', 'RSI'):
+                np.testing.assert_allclose(rows[name].to_numpy(), expected[name].to_numpy(), rtol=1e-9, err_msg=ticker)
+
+    def test_forecast_rows_follow_history(self):
+        """Test forecasts match /analyze and are dated on the next business days"""
+        frame = self.service.build_frame(['AAA', 'BBB'], '2023-01-01', '2024-01-01', columns=['Close', 'Forecast'], engine='drift')
+        close = DataIngestionService._preprocess_data(self.service.store.get('BBB', '2023-01-01', '2024-01-01'))['Close']
+        expected = PredictionService.forecast_prices(close, engine='drift')['prediction_results']['forecast']
+
+        bbb = frame[frame['Ticker'] == 'BBB']
+        future = bbb[bbb['Forecast'].notna()]
+        self.assertEqual(len(future), 7)
+        self.assertTrue(future['Close'].isna().all())
+        self.assertGreater(future['Date'].min(), bbb.loc[bbb['Close'].notna(), 'Date'].max())
+        np.testing.assert_allclose(future['Forecast'].to_numpy(), expected)
+
+    def test_unknown_column(self):
+        """Test an unknown column is rejected"""
+        with self.assertRaises(ValueError):
+            self.service.build_frame(['AAA'], '2023-01-01', '2024-01-01', columns=['Sentiment'])
+
+    def test_json(self):
+        """Test the JSON fallback encodes dates and missing values"""
+        frame = self.service.build_frame(['AAA'], '2023-01-01', '2024-01-01', columns=['Close', 'Forecast'], engine='drift')
+        content, media_type = SeriesExportService.serialize(frame, 'json')
+        body = json.loads(content)
+
+        self.assertEqual(media_type, 'application/json')
+        self.assertEqual(body['columns'], ['Date', 'Ticker', 'Close', 'Forecast'])
+        self.assertEqual(len(body['data']), len(frame))
+        self.assertIsNone(body['data'][0][3])
+
+    @unittest.skipUnless(arrow_available(), 'pyarrow is not installed')
+    def test_arrow_and_parquet_round_trip(self):
+        """Test Arrow IPC and Parquet output read back to the same table"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        frame = self.service.build_frame(['AAA', 'BBB'], '2023-01-01', '2024-01-01', engine='drift')
+        arrow, _ = SeriesExportService.serialize(frame, 'arrow')
+        parquet, _ = SeriesExportService.serialize(frame, 'parquet')
+
+        self.assertTrue(pa.ipc.open_stream(arrow).read_pandas().equals(frame))
+        self.assertTrue(pq.read_table(io.BytesIO(parquet)).to_pandas().equals(frame))
+
+    def test_negotiate_format(self):
+        """Test explicit formats, Accept header preference and the JSON fallback"""
+        self.assertEqual(negotiate_format('json', None), 'json')
+        self.assertEqual(negotiate_format(None, '*/*'), 'json')
+        with mock.patch.object(series_export, 'arrow_available', return_value=True):
+            self.assertEqual(negotiate_format(None, 'application/vnd.apache.parquet;q=0.9, */*'), 'parquet')
+        with mock.patch.object(series_export, 'arrow_available', return_value=False):
+            self.assertEqual(negotiate_format(None, 'application/vnd.apache.arrow.stream'), 'json')
+            with self.assertRaises(FormatUnavailableError):
+                negotiate_format('arrow', None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from src.core.data_ingestion import DataIngestionService
+from src.core.providers import SyntheticProvider
+from src.core.result_store import ResultStore
+from src.utils.visualization import VisualizationService
+
+class TestVisualizationService(unittest.TestCase):
+    def setUp(self):
+        """Create preprocessed data, a forecast and a private chart store"""
+        self.data = DataIngestionService._preprocess_data(
+            SyntheticProvider().download('AAPL', '2023-01-01', '2023-12-31')
+        )
+        last = self.data['Close'].iloc[-1]
+        self.prediction = {
+            'forecast': [last + i for i in range(7)],
+            'confidence_interval': [[last + i - 2, last + i + 2] for i in range(7)],
+        }
+        self.store = ResultStore()
+        self.service = VisualizationService(store=self.store)
+
+    def test_charts_are_served_from_memory(self):
+        """Test charts are stored as PNG bytes under content-hash URLs"""
+        paths = self.service.create_visualizations(self.data, self.prediction, 'AAPL')
+
+        self.assertEqual(len(paths), 2)
+        self.assertTrue(all(path.startswith('/charts/AAPL_') and path.endswith('.png') for path in paths))
+        content, media_type = self.service.get_chart(paths[0].rsplit('/', 1)[1])
+        self.assertTrue(content.startswith(b'\x89PNG'))
+        self.assertEqual(media_type, 'image/png')
+
+    def test_unchanged_inputs_are_not_rendered_again(self):
+        """Test the content-hash cache and that new inputs get new charts"""
+        first = self.service.create_visualizations(self.data, self.prediction, 'AAPL')
+        with mock.patch.object(VisualizationService, '_encode') as encode:
+            again = self.service.create_visualizations(self.data, self.prediction, 'AAPL')
+        encode.assert_not_called()
+        self.assertEqual(first, again)
+
+        changed = self.service.create_visualizations(self.data.iloc[:-1], self.prediction, 'AAPL')
+        self.assertNotEqual(first, changed)
+
+    def test_concurrent_renders(self):
+        """Test renders from several threads produce independent, identical charts"""
+        services = [VisualizationService(store=ResultStore(), fmt='svg') for _ in range(4)]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            paths = list(pool.map(lambda s: s.create_visualizations(self.data, self.prediction, 'AAPL'), services))
+
+        self.assertEqual(len({tuple(p) for p in paths}), 1)
+        charts = [s.get_chart(paths[0][1].rsplit('/', 1)[1]) for s in services]
+        self.assertTrue(all(chart[1] == 'image/svg+xml' and b'<svg' in chart[0] for chart in charts))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime, time as dtime
+from src.core.response_cache import MARKET_TZ
+from src.core.warmup import (
+    WarmupScheduler, WarmWindow, WatchItem, next_run, parse_times, parse_watchlist, parse_windows, read_status
+)
+
+class TestWarmupConfig(unittest.TestCase):
+    def test_parse_watchlist_orders_by_priority(self):
+        """Test higher priorities come first and ties keep their listed order"""
+        items = parse_watchlist(' msft, AAPL:10 ,GOOG:-1,AMZN ')
+
+        self.assertEqual(items, [WatchItem('AAPL', 10), WatchItem('MSFT'), WatchItem('AMZN'), WatchItem('GOOG', -1)])
+        with self.assertRaises(ValueError):
+            parse_watchlist('AAPL:high')
+
+    def test_parse_times(self):
+        """Test run times are parsed and sorted"""
+        self.assertEqual(parse_times('12:00, 08:30'), (dtime(8, 30), dtime(12, 0)))
+        with self.assertRaises(ValueError):
+            parse_times('8h30')
+
+    def test_parse_windows(self):
+        """Test windows are every combination of lookbacks, engines and stage sets"""
+        windows = parse_windows('365, 730', 'auto_arima', 'forecast,charts;')
+
+        self.assertEqual(windows, [
+            WarmWindow(365, 'auto_arima', ('forecast', 'charts')), WarmWindow(365, 'auto_arima', None),
+            WarmWindow(730, 'auto_arima', ('forecast', 'charts')), WarmWindow(730, 'auto_arima', None),
+        ])
+        self.assertEqual(parse_windows(''), [WarmWindow()])
+        with self.assertRaises(ValueError):
+            parse_windows('1y')
+
+    def test_next_run_skips_weekends(self):
+        """Test the next run is later today, or the next weekday's first run"""
+        times = parse_times('08:30,12:00')
+        thursday = datetime(2024, 1, 4, 9, 0, tzinfo=MARKET_TZ)
+        friday_evening = datetime(2024, 1, 5, 18, 0, tzinfo=MARKET_TZ)
+
+        self.assertEqual(next_run(times, thursday), datetime(2024, 1, 4, 12, 0, tzinfo=MARKET_TZ))
+        self.assertEqual(next_run(times, friday_evening), datetime(2024, 1, 8, 8, 30, tzinfo=MARKET_TZ))
+
+class TestWarmupScheduler(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_run_respects_priority_concurrency_and_stagger(self):
+        """Test runs start by priority, spaced out, never more than the budget at once"""
+        started, active, peak = [], [0], [0]
+
+        async def runner(ticker, start_date, end_date, engine, stages):
+            started.append((ticker, time.perf_counter()))
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.05)
+            active[0] -= 1
+            return {'stage_timings': {'data': 1.0}}
+
+        scheduler = WarmupScheduler(
+            runner, parse_watchlist('C,A:3,B:2,D'), concurrency=2, stagger=0.01, lookback_days=10
+        )
+        run = asyncio.run(scheduler.run_once())
+
+        self.assertEqual([ticker for ticker, _ in started], ['A', 'B', 'C', 'D'])
+        self.assertEqual(peak[0], 2)
+        gaps = [later - earlier for (_, earlier), (_, later) in zip(started, started[1:])]
+        self.assertGreaterEqual(min(gaps), 0.009)
+        self.assertEqual(run['tickers']['A']['windows'][0]['stage_timings'], {'data': 1.0})
+        self.assertIsNotNone(run['seconds'])
+
+    def test_failures_are_reported_not_raised(self):
+        """Test one failing ticker does not stop the others"""
+        async def runner(ticker, start_date, end_date, engine, stages):
+            if ticker == 'BAD':
+                raise ValueError('no data')
+            return None
+
+        scheduler = WarmupScheduler(runner, parse_watchlist('BAD:1,GOOD'), stagger=0)
+        run = asyncio.run(scheduler.run_once())
+
+        bad = run['tickers']['BAD']
+        self.assertEqual((bad['status'], bad['error']), ('failed', 'no data'))
+        self.assertEqual(bad['windows'][0]['status'], 'failed')
+        self.assertEqual(run['tickers']['GOOD']['status'], 'ok')
+
+    def test_every_window_is_warmed(self):
+        """Test each ticker runs every configured window and partial failures are reported"""
+        calls = []
+
+        async def runner(ticker, start_date, end_date, engine, stages):
+            calls.append((ticker, start_date, engine, stages))
+            if engine == 'holt':
+                raise ValueError('unsupported')
+            return {'cache': 'MISS'}
+
+        windows = parse_windows('30,60', 'drift,holt', 'forecast')
+        scheduler = WarmupScheduler(runner, parse_watchlist('AAPL:1,MSFT'), stagger=0, windows=windows)
+        run = asyncio.run(scheduler.run_once())
+
+        self.assertEqual(len(calls), 8)
+        self.assertEqual([ticker for ticker, *_ in calls], ['AAPL'] * 4 + ['MSFT'] * 4)
+        self.assertEqual(calls[0][1:], (WarmWindow(30).dates()[0], 'drift', ('forecast',)))
+        self.assertEqual(run['tickers']['AAPL']['status'], 'partial')
+        self.assertEqual([w['status'] for w in run['tickers']['AAPL']['windows']], ['ok', 'failed', 'ok', 'failed'])
+        self.assertEqual(len(scheduler.status()['windows']), 4)
+
+    def test_status_file_for_other_processes(self):
+        """Test a worker's last run can be read back from its status file"""
+        async def runner(ticker, start_date, end_date, engine, stages):
+            return {'cache': 'MISS'}
+
+        path = os.path.join(self.root, 'warmup.json')
+        scheduler = WarmupScheduler(runner, parse_watchlist('AAPL'), stagger=0, status_path=path)
+        asyncio.run(scheduler.run_once('cli'))
+
+        status = read_status(path)
+        self.assertFalse(status['running'])
+        self.assertEqual(status['last_run']['trigger'], 'cli')
+        self.assertEqual(status['last_run']['tickers']['AAPL']['windows'][0]['cache'], 'MISS')
+        self.assertIsNone(read_status(os.path.join(self.root, 'missing.json')))
+
+if __name__ == '__main__':
+    unittest.main()